@@ -5,7 +5,7 @@ Flask веб-приложение для генерации документов
 import os
 import sys
 from pathlib import Path
-from flask import Flask, render_template, request, send_file, jsonify, flash, redirect, url_for
+from flask import Flask, render_template, request, send_file, jsonify, flash, redirect, url_for, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import json
@@ -166,6 +166,52 @@ def generate_document():
         return jsonify({'error': str(e)}), 500
 
 
+def resolve_template_path(template):
+    """Разрешение пути к шаблону только внутри каталогов шаблонов и загрузок"""
+    if not template:
+        return None
+    
+    template_path = os.path.abspath(template)
+    for allowed_dir in ('templates', app.config['UPLOAD_FOLDER']):
+        allowed_root = os.path.abspath(allowed_dir) + os.sep
+        if template_path.startswith(allowed_root):
+            return template_path
+    return None
+
+
+@app.route('/generate-bundle', methods=['POST'])
+def generate_bundle():
+    """Пакетная генерация документов с потоковой отдачей ZIP архива"""
+    try:
+        if 'config_file' in request.files and request.files['config_file'].filename:
+            config = json.load(request.files['config_file'].stream)
+        else:
+            config = request.get_json(silent=True) or {}
+        
+        documents = config.get('documents', []) if isinstance(config, dict) else None
+        if not documents or not isinstance(documents, list):
+            return jsonify({'error': 'Список документов пуст'}), 400
+        
+        # После начала потоковой отдачи статус ответа уже не изменить,
+        # поэтому описания документов проверяются заранее
+        for index, doc_config in enumerate(documents):
+            try:
+                generator.validate_document(doc_config)
+            except ValueError as e:
+                return jsonify({'error': f'Документ {index + 1}: {e}'}), 400
+            doc_config['template'] = resolve_template_path(doc_config.get('template'))
+        
+        archive_name = f"documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}.zip"
+        return Response(
+            stream_with_context(generator.iter_bundle(documents)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={archive_name}'}
+        )
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/templates')
 def templates_page():
     """Страница со списком доступных шаблонов"""
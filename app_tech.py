@@ -11,9 +11,13 @@ from flask import Flask, render_template, request, send_file, jsonify, flash, re
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import json
+import re
 import uuid
 import tempfile
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 
 # Добавляем корневую директорию в путь
 project_root = Path(__file__).parent
@@ -24,6 +28,11 @@ from doc_generator.code_analyzer import CodeAnalyzer
 from doc_generator.api_doc_generator import APIDocGenerator
 from doc_generator.db_doc_generator import DBDocGenerator
 from doc_generator.markdown_generator import MarkdownGenerator
+from doc_generator.site_generator import SiteGenerator
+from doc_generator.search_index import SearchIndex
+from doc_generator.snapshot import AnalysisSnapshot, diff_snapshots
+from doc_generator.cache import LRUCache
+from doc_generator.zip_bundle import ZipBundleWriter
 from doc_generator.diagram_generator import DiagramGenerator
 
 app = Flask(__name__)
@@ -32,6 +41,13 @@ app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['OUTPUT_FOLDER'] = 'output'
 app.config['TEMP_FOLDER'] = 'temp'
+app.config['CACHE_FOLDER'] = 'cache'
+# Число процессов пула на один запрос и число запросов, одновременно
+# использующих пулы процессов (остальные выполняются последовательно)
+app.config['ANALYSIS_WORKERS'] = min(os.cpu_count() or 1, 4)
+app.config['PARALLEL_REQUESTS'] = 2
+# Срок хранения поисковых индексов для /search (секунды)
+app.config['SEARCH_INDEX_TTL'] = 24 * 60 * 60
 
 # Создаем необходимые директории
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -41,12 +57,21 @@ os.makedirs('static', exist_ok=True)
 os.makedirs('templates', exist_ok=True)
 
 # Инициализация генераторов
+# Генераторы и анализатор не хранят состояние между вызовами,
+# поэтому общие экземпляры безопасно использовать из потоков обработки запросов
 generator = DocumentGenerator(output_dir=app.config['OUTPUT_FOLDER'])
-code_analyzer = CodeAnalyzer()
-api_generator = APIDocGenerator()
+code_analyzer = CodeAnalyzer(cache_dir=app.config['CACHE_FOLDER'])
+api_generator = APIDocGenerator(code_analyzer)
 db_generator = DBDocGenerator()
-markdown_generator = MarkdownGenerator()
-diagram_generator = DiagramGenerator()
+markdown_generator = MarkdownGenerator(cache_dir=app.config['CACHE_FOLDER'])
+site_generator = SiteGenerator(cache_dir=app.config['CACHE_FOLDER'],
+                               markdown_generator=markdown_generator,
+                               max_workers=app.config['ANALYSIS_WORKERS'])
+diagram_generator = DiagramGenerator(cache_dir=app.config['CACHE_FOLDER'])
+# Запросы, выполняемые сейчас в пулах процессов
+parallel_requests = threading.BoundedSemaphore(app.config['PARALLEL_REQUESTS'])
+# Загруженные поисковые индексы по идентификатору
+search_indexes = LRUCache(maxsize=16)
 
 # Разрешенные расширения файлов
 ALLOWED_CODE_EXTENSIONS = {'py', 'js', 'java', 'cpp', 'c', 'h', 'hpp', 'cs', 'go', 'rs', 'php', 'rb', 'ts'}
@@ -58,6 +83,63 @@ def allowed_file(filename, extensions):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in extensions
 
 
+def unique_output_path(output_filename):
+    """Уникальный путь в каталоге вывода, чтобы параллельные запросы не перезаписывали файлы друг друга"""
+    return os.path.join(app.config['OUTPUT_FOLDER'], f"{uuid.uuid4().hex}_{output_filename}")
+
+
+@contextmanager
+def request_workers():
+    """Число процессов для запроса: None (последовательно), если пулы заняты другими запросами"""
+    if not parallel_requests.acquire(blocking=False):
+        yield None
+        return
+    try:
+        yield app.config['ANALYSIS_WORKERS']
+    finally:
+        parallel_requests.release()
+
+
+def remove_temp_path(path):
+    """Удаление временного файла или директории вместе с записями путей в кэше анализа"""
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+    code_analyzer.cache.forget_paths(path)
+
+
+def search_index_expired(index_path):
+    """Истек ли срок хранения сохраненного поискового индекса (отсутствующий считается истекшим)"""
+    try:
+        return os.path.getmtime(index_path) < time.time() - app.config['SEARCH_INDEX_TTL']
+    except OSError:
+        return True
+
+
+def remove_expired_search_indexes():
+    """Удаление поисковых индексов старше SEARCH_INDEX_TTL из каталога вывода"""
+    with os.scandir(app.config['OUTPUT_FOLDER']) as entries:
+        for entry in entries:
+            if not (entry.name.startswith('search_') and entry.name.endswith('.json')):
+                continue
+            if search_index_expired(entry.path):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    # Уже удален параллельным запросом
+                    pass
+
+
+def save_search_index(search_index):
+    """Сохранение поискового индекса в каталог вывода; возвращает идентификатор для /search"""
+    remove_expired_search_indexes()
+    index_id = uuid.uuid4().hex
+    search_index.save(os.path.join(app.config['OUTPUT_FOLDER'], f"search_{index_id}.json"))
+    search_indexes.put(index_id, search_index)
+    return index_id
+
+
 @app.route('/')
 def index():
     """Главная страница"""
@@ -111,26 +193,28 @@ def analyze_code():
         file.save(file_path)
         
         # Анализируем код
-        if filename.endswith('.py'):
-            code_info = code_analyzer.analyze_file(file_path)
-        else:
+        if not filename.endswith('.py'):
+            remove_temp_path(file_path)
             return jsonify({'error': 'Пока поддерживается только Python код'}), 400
+        try:
+            code_info = code_analyzer.analyze_file(file_path)
+        finally:
+            remove_temp_path(file_path)
         
         # Генерируем документацию
         output_format = request.form.get('format', 'markdown')
         
         if output_format == 'markdown':
-            md_content = markdown_generator.generate_code_docs(code_info)
             output_filename = f"docs_{filename.rsplit('.', 1)[0]}.md"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            output_path = unique_output_path(output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+                markdown_generator.write_code_docs(code_info, f)
             
             return send_file(output_path, as_attachment=True, download_name=output_filename)
         
         elif output_format == 'json':
             output_filename = f"docs_{filename.rsplit('.', 1)[0]}.json"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            output_path = unique_output_path(output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(code_info, f, ensure_ascii=False, indent=2)
             
@@ -166,9 +250,13 @@ def analyze_project():
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 zip_ref.extractall(temp_dir)
             
-            # Анализируем проект
+            # Анализируем проект: документация пишется в файл по частям
+            output_filename = f"project_docs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            output_path = unique_output_path(output_filename)
+            search_index = SearchIndex()
             try:
-                md_content = markdown_generator.generate_project_docs(temp_dir)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    markdown_generator.write_project_docs(temp_dir, f, search_index=search_index)
             except Exception as e:
                 return jsonify({'error': f'Ошибка при генерации документации: {str(e)}'}), 500
             
@@ -177,38 +265,29 @@ def analyze_project():
                 analysis = code_analyzer.analyze_directory(temp_dir)
                 diagrams = {}
                 
-                for file_info in analysis.get('files', []):
-                    try:
-                        # Пропускаем файлы с ошибками
-                        if 'error' in file_info:
-                            continue
-                        
-                        # Проверяем наличие классов
-                        if file_info.get('classes') and len(file_info.get('classes', [])) > 0:
-                            try:
-                                class_diagram = diagram_generator.generate_class_diagram_mermaid(file_info)
-                                if class_diagram:
-                                    file_name = file_info.get('file', 'unknown')
-                                    diagrams[file_name] = class_diagram
-                            except Exception as e:
-                                # Пропускаем файлы, для которых не удалось создать диаграмму
-                                print(f"Не удалось создать диаграмму для {file_info.get('file', 'unknown')}: {e}")
-                                continue
-                    except Exception as e:
-                        # Пропускаем проблемные файлы
-                        print(f"Ошибка при обработке файла: {e}")
-                        continue
+                # Диаграммы классов всего проекта: наследование между файлами
+                # сохраняется, большие графы разбиты на части
+                class_graph = analysis.get('class_graph')
+                if class_graph is not None and class_graph.nodes:
+                    class_diagrams = diagram_generator.generate_project_class_diagrams_mermaid(class_graph)
+                    for number, class_diagram in enumerate(class_diagrams, 1):
+                        title = 'Классы' if len(class_diagrams) == 1 else f'Классы (часть {number})'
+                        diagrams[title] = class_diagram
+                
+                module_graph = analysis.get('module_graph')
+                if module_graph is not None and module_graph.sources:
+                    diagrams['Зависимости модулей'] = diagram_generator.generate_module_graph_mermaid(module_graph)
+                
+                call_graph = analysis.get('call_graph')
+                if call_graph is not None and call_graph.nodes:
+                    diagrams['Граф вызовов'] = diagram_generator.generate_call_graph_mermaid(call_graph)
             except Exception as e:
                 # Если не удалось создать диаграммы, продолжаем без них
                 print(f"Ошибка при генерации диаграмм: {e}")
                 diagrams = {}
             
-            # Сохраняем результат
-            output_filename = f"project_docs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+            # Дописываем диаграммы
+            with open(output_path, 'a', encoding='utf-8') as f:
                 if diagrams:
                     f.write("\n\n## Diagrams\n\n")
                     for file_name, diagram in diagrams.items():
@@ -217,12 +296,132 @@ def analyze_project():
                         f.write(diagram)
                         f.write("\n```\n\n")
             
-            return send_file(output_path, as_attachment=True, download_name=output_filename)
+            response = send_file(output_path, as_attachment=True, download_name=output_filename)
+            response.headers['X-Search-Index'] = save_search_index(search_index)
+            return response
         
         finally:
             # Удаляем временную директорию
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            remove_temp_path(temp_dir)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/analyze-project-site', methods=['POST'])
+def analyze_project_site():
+    """Анализ проекта и генерация многостраничного HTML сайта документации (ZIP)"""
+    try:
+        if 'project_zip' not in request.files:
+            return jsonify({'error': 'Архив проекта не загружен'}), 400
+        
+        file = request.files['project_zip']
+        if file.filename == '':
+            return jsonify({'error': 'Архив не выбран'}), 400
+        
+        temp_dir = os.path.join(app.config['TEMP_FOLDER'], str(uuid.uuid4()))
+        project_dir = os.path.join(temp_dir, 'project')
+        site_dir = os.path.join(temp_dir, 'site')
+        os.makedirs(project_dir, exist_ok=True)
+        
+        try:
+            zip_path = os.path.join(temp_dir, 'project.zip')
+            file.save(zip_path)
+            
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(project_dir)
+            
+            try:
+                with request_workers() as workers:
+                    site = site_generator.generate_site(project_dir, site_dir, workers=workers)
+            except Exception as e:
+                return jsonify({'error': f'Ошибка при генерации документации: {str(e)}'}), 500
+            
+            output_filename = f"project_site_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+            output_path = unique_output_path(output_filename)
+            with ZipBundleWriter(output_path) as bundle:
+                for name in sorted(os.listdir(site_dir)):
+                    with open(os.path.join(site_dir, name), 'rb') as f:
+                        bundle.add(name, f.read())
+            
+            response = send_file(output_path, as_attachment=True, download_name=output_filename)
+            response.headers['X-Search-Index'] = save_search_index(
+                SearchIndex.load(site['search_index']))
+            return response
+        
+        finally:
+            remove_temp_path(temp_dir)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/search/<index_id>', methods=['GET'])
+def search_docs(index_id):
+    """Поиск по предварительно построенному индексу документации проекта"""
+    try:
+        # Идентификатор выдается save_search_index; иные значения не допускаются в путь
+        if not re.fullmatch(r'[0-9a-f]{32}', index_id):
+            return jsonify({'error': 'Некорректный идентификатор индекса'}), 400
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Пустой запрос'}), 400
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        
+        index_path = os.path.join(app.config['OUTPUT_FOLDER'], f"search_{index_id}.json")
+        # Индекс, срок хранения которого истек, не выдается и из памяти
+        if search_index_expired(index_path):
+            return jsonify({'error': 'Индекс не найден'}), 404
+        search_index = search_indexes.get(index_id)
+        if search_index is None:
+            search_index = SearchIndex.load(index_path)
+            search_indexes.put(index_id, search_index)
+        
+        return jsonify({'query': query, 'results': search_index.search(query, limit=limit)})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def load_snapshot(upload, temp_dir):
+    """Снимок из загруженного файла: JSON снимка или ZIP архива проекта"""
+    if upload.filename.lower().endswith('.zip'):
+        project_dir = os.path.join(temp_dir, str(uuid.uuid4()))
+        os.makedirs(project_dir, exist_ok=True)
+        with zipfile.ZipFile(upload.stream, 'r') as zip_ref:
+            zip_ref.extractall(project_dir)
+        return AnalysisSnapshot.from_analysis(code_analyzer.analyze_directory(project_dir))
+    return AnalysisSnapshot.from_dict(json.load(upload.stream))
+
+
+@app.route('/snapshot-diff', methods=['POST'])
+def snapshot_diff():
+    """Отчет об изменениях API между двумя версиями проекта"""
+    try:
+        if 'old_file' not in request.files or 'new_file' not in request.files:
+            return jsonify({'error': 'Нужны две версии: old_file и new_file'}), 400
+        
+        output_format = request.form.get('format', 'markdown')
+        temp_dir = os.path.join(app.config['TEMP_FOLDER'], str(uuid.uuid4()))
+        os.makedirs(temp_dir, exist_ok=True)
+        
+        try:
+            old_snapshot = load_snapshot(request.files['old_file'], temp_dir)
+            new_snapshot = load_snapshot(request.files['new_file'], temp_dir)
+            diff = diff_snapshots(old_snapshot, new_snapshot)
+            
+            if output_format == 'json':
+                return jsonify(diff)
+            
+            output_filename = f"api_changes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            output_path = unique_output_path(output_filename)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                markdown_generator.write_snapshot_diff(diff, f)
+            return send_file(output_path, as_attachment=True, download_name=output_filename)
+        
+        finally:
+            remove_temp_path(temp_dir)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -239,22 +438,38 @@ def generate_api_docs():
         if file.filename == '':
             return jsonify({'error': 'Файл не выбран'}), 400
         
-        if not file.filename.endswith('.py'):
-            return jsonify({'error': 'Поддерживаются только Python файлы'}), 400
+        if not file.filename.endswith(('.py', '.zip')):
+            return jsonify({'error': 'Поддерживаются только Python файлы и ZIP архивы проектов'}), 400
         
         # Сохраняем файл
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['TEMP_FOLDER'], f"{uuid.uuid4()}_{filename}")
         file.save(file_path)
         
-        # Генерируем API документацию
-        api_info = api_generator.generate_from_flask_app(file_path)
+        # Генерируем API документацию: для архива - по всем модулям проекта
+        # с префиксами blueprint, зарегистрированных в других модулях
+        if filename.endswith('.zip'):
+            project_dir = os.path.join(app.config['TEMP_FOLDER'], str(uuid.uuid4()))
+            try:
+                with zipfile.ZipFile(file_path, 'r') as zip_ref:
+                    zip_ref.extractall(project_dir)
+                with request_workers() as workers:
+                    api_info = api_generator.generate_from_directory(project_dir, workers=workers)
+            finally:
+                remove_temp_path(file_path)
+                remove_temp_path(project_dir)
+        else:
+            try:
+                api_info = api_generator.generate_from_flask_app(file_path)
+            finally:
+                remove_temp_path(file_path)
+        
         output_format = request.form.get('format', 'markdown')
         
         if output_format == 'markdown':
             md_content = api_generator.generate_markdown(api_info)
             output_filename = f"api_docs_{filename.rsplit('.', 1)[0]}.md"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            output_path = unique_output_path(output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(md_content)
             
@@ -263,7 +478,7 @@ def generate_api_docs():
         elif output_format == 'openapi':
             openapi_spec = api_generator.generate_openapi_spec(api_info)
             output_filename = f"api_spec_{filename.rsplit('.', 1)[0]}.json"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            output_path = unique_output_path(output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(openapi_spec, f, ensure_ascii=False, indent=2)
             
@@ -317,18 +532,36 @@ def generate_db_docs():
         if output_format == 'markdown':
             md_content = db_generator.generate_markdown(db_info)
             output_filename = f"db_docs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            output_path = unique_output_path(output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(md_content)
             
             return send_file(output_path, as_attachment=True, download_name=output_filename)
         
         elif output_format == 'mermaid':
-            mermaid_diagram = db_generator.generate_er_diagram_mermaid(db_info)
-            output_filename = f"db_diagram_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mmd"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(mermaid_diagram)
+            # focus - таблицы через запятую: диаграмма их окрестности в hops связей;
+            # иначе схема больше max_tables таблиц разбивается на несколько диаграмм
+            focus = [name.strip() for name in request.form.get('focus', '').split(',') if name.strip()]
+            max_tables = max(request.form.get('max_tables', 50, type=int), 1)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            
+            if focus:
+                hops = max(request.form.get('hops', 1, type=int), 0)
+                diagrams = [db_generator.generate_er_focus_mermaid(db_info, focus, hops)]
+            else:
+                diagrams = db_generator.generate_er_diagrams_mermaid(db_info, max_tables)
+            
+            if len(diagrams) == 1:
+                output_filename = f"db_diagram_{timestamp}.mmd"
+                output_path = unique_output_path(output_filename)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(diagrams[0])
+            else:
+                output_filename = f"db_diagram_{timestamp}.md"
+                output_path = unique_output_path(output_filename)
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    for index, diagram in enumerate(diagrams, 1):
+                        f.write(f"## Часть {index}\n\n```mermaid\n{diagram}```\n\n")
             
             return send_file(output_path, as_attachment=True, download_name=output_filename)
         
@@ -359,7 +592,10 @@ def generate_diagram():
         file.save(file_path)
         
         # Анализируем код
-        code_info = code_analyzer.analyze_file(file_path)
+        try:
+            code_info = code_analyzer.analyze_file(file_path)
+        finally:
+            remove_temp_path(file_path)
         diagram_type = request.form.get('diagram_type', 'class')
         
         if diagram_type == 'class':
@@ -368,7 +604,7 @@ def generate_diagram():
             return jsonify({'error': 'Неподдерживаемый тип диаграммы'}), 400
         
         output_filename = f"diagram_{filename.rsplit('.', 1)[0]}.mmd"
-        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+        output_path = unique_output_path(output_filename)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(diagram)
         
@@ -0,0 +1,94 @@
+"""
+Сравнение обхода дерева исходников: Path.rglob со stat каждого файла
+(прежний способ в CodeAnalyzer.analyze_directory) и file_walker.iter_source_files
+
+Запуск:
+    python benchmarks/bench_file_walker.py [--project-files N] [--venv-files N] [--repeat N]
+    python benchmarks/bench_file_walker.py --directory path/to/project
+
+Без --directory строится временное дерево: исходники проекта, вложенное
+виртуальное окружение (venv/ и окружение с произвольным именем, найденное
+по pyvenv.cfg), node_modules, .git и __pycache__.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doc_generator.file_walker import iter_source_files  # noqa: E402
+
+
+def rglob_walk(directory: str, extensions: List[str]) -> List[str]:
+    """Прежний обход: все записи дерева, stat для каждой подходящей"""
+    return [str(path) for path in Path(directory).rglob('*')
+            if path.suffix in extensions and path.is_file()]
+
+
+def scandir_walk(directory: str, extensions: List[str]) -> List[str]:
+    """Обход через os.scandir с отсечением игнорируемых директорий"""
+    return list(iter_source_files(directory, extensions))
+
+
+def _write_files(root: Path, count: int, per_dir: int = 50, suffix: str = '.py'):
+    for number in range(count):
+        directory = root / f'd{number // per_dir}'
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f'm{number}{suffix}').write_text('x = 1\n', encoding='utf-8')
+
+
+def build_tree(root: Path, project_files: int, venv_files: int):
+    """Синтетический проект с вендорными директориями"""
+    _write_files(root / 'src', project_files)
+    _write_files(root / 'venv' / 'lib' / 'python3' / 'site-packages', venv_files)
+    custom_env = root / 'tools' / 'env-build'
+    (custom_env).mkdir(parents=True)
+    (custom_env / 'pyvenv.cfg').write_text('home = /usr/bin\n', encoding='utf-8')
+    _write_files(custom_env / 'lib', venv_files // 2)
+    _write_files(root / 'node_modules', venv_files // 2, suffix='.js')
+    _write_files(root / '.git' / 'objects', venv_files // 2, suffix='')
+    _write_files(root / 'src' / '__pycache__', project_files, suffix='.pyc')
+    (root / '.gitignore').write_text('build/\n', encoding='utf-8')
+    _write_files(root / 'build', project_files // 2)
+
+
+def measure(walk: Callable[[str, List[str]], List[str]], directory: str, repeat: int):
+    """Лучшее время из repeat запусков и число найденных файлов"""
+    best = float('inf')
+    files: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        files = walk(directory, ['.py'])
+        best = min(best, time.perf_counter() - start)
+    return best, len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--directory', help='Существующий проект вместо синтетического дерева')
+    parser.add_argument('--project-files', type=int, default=2000)
+    parser.add_argument('--venv-files', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = args.directory
+        if directory is None:
+            directory = temp_dir
+            build_tree(Path(temp_dir), args.project_files, args.venv_files)
+
+        entries = sum(len(dirs) + len(files) for _, dirs, files in os.walk(directory))
+        print(f"Дерево: {directory} ({entries} записей)")
+        for name, walk in (('Path.rglob + is_file', rglob_walk),
+                           ('file_walker.iter_source_files', scandir_walk)):
+            seconds, count = measure(walk, directory, args.repeat)
+            print(f"{name:32} {seconds * 1000:9.1f} мс  файлов: {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Память и размер pickle результатов анализа: модель ModuleInfo (dataclass
+со __slots__ и интернированными именами) против прежних словарей to_dict()
+
+Запуск:
+    python benchmarks/bench_models.py [--modules N] [--functions N]
+"""
+
+import argparse
+import gc
+import pickle
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from doc_generator.code_analyzer import CodeAnalyzer  # noqa: E402
+
+
+def module_source(number: int, functions: int) -> str:
+    """Исходный код синтетического модуля: класс с методами и функции"""
+    lines = [f'"""Модуль {number}"""', 'import os', 'from typing import List', '']
+    lines.append(f'class Service{number}:')
+    lines.append('    """Сервис"""')
+    for index in range(functions // 2):
+        lines.append(f'    def method_{index}(self, value: int, items: List[str] = None) -> int:')
+        lines.append(f'        return helper_{index}(value)')
+    for index in range(functions - functions // 2):
+        lines.append(f'def helper_{index}(value: int) -> int:')
+        lines.append('    """Помощник"""')
+        lines.append('    return os.getpid() + value')
+    return '\n'.join(lines) + '\n'
+
+
+def measure(build: Callable[[], List[Any]]) -> Tuple[int, List[Any]]:
+    """Объем памяти, занятой результатом build(), в байтах"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modules', type=int, default=200)
+    parser.add_argument('--functions', type=int, default=100,
+                        help='Функций и методов в каждом модуле')
+    args = parser.parse_args()
+
+    analyzer = CodeAnalyzer()
+    infos = [analyzer.analyze_source_info(module_source(number, args.functions), f'mod_{number}.py')
+             for number in range(args.modules)]
+    total = args.modules * args.functions
+    print(f"Модулей: {args.modules}, функций и методов: {total}")
+
+    # Обе формы восстанавливаются из pickle под tracemalloc, как при чтении кэша,
+    # чтобы учесть только память самого результата
+    models_payload = pickle.dumps(infos, protocol=pickle.HIGHEST_PROTOCOL)
+    dicts_payload = pickle.dumps([info.to_dict(internal=True) for info in infos],
+                                 protocol=pickle.HIGHEST_PROTOCOL)
+    del infos
+    models_memory, models = measure(lambda: pickle.loads(models_payload))
+    del models
+    dicts_memory, dicts = measure(lambda: pickle.loads(dicts_payload))
+    del dicts
+
+    rows = (
+        ('ModuleInfo', models_memory, len(models_payload)),
+        ('dict (to_dict)', dicts_memory, len(dicts_payload)),
+    )
+    for name, memory, pickled in rows:
+        print(f"{name:16} память: {memory / 2 ** 20:8.2f} МБ "
+              f"({memory / total:6.0f} Б на функцию)  pickle: {pickled / 2 ** 20:8.2f} МБ")
+
+
+if __name__ == '__main__':
+    main()
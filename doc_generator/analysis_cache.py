@@ -0,0 +1,261 @@
+"""
+Постоянный кэш результатов анализа кода (SQLite)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+
+class SQLiteCache:
+    """
+    Основа постоянных кэшей в файле SQLite
+
+    Соединения открываются отдельно в каждом потоке (и заново в процессах
+    пула), версия формата хранится в таблице meta: при ее смене таблицы
+    TABLES пересоздаются.
+    """
+
+    DB_FILENAME = 'cache.sqlite3'
+    # Имя таблицы -> описание столбцов для CREATE TABLE
+    TABLES: Dict[str, str] = {}
+
+    def __init__(self, cache_dir: str, version: str):
+        """
+        Инициализация кэша
+
+        Args:
+            cache_dir: Директория для файла базы данных
+            version: Версия формата хранимых данных
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self.version = version
+        # Соединения SQLite нельзя разделять между потоками
+        self._local = threading.local()
+        self._init_schema()
+
+    def __getstate__(self):
+        # При передаче в процесс пула соединения открываются заново
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Соединение с базой для текущего потока"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _init_schema(self):
+        """Создание таблиц и сброс устаревших записей"""
+        connection = self._connection()
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                for table in self.TABLES:
+                    connection.execute(f'DROP TABLE IF EXISTS {table}')
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (self.version,)
+                )
+
+            for table, columns in self.TABLES.items():
+                connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns})')
+
+    def clear(self):
+        """Удаление всех записей"""
+        connection = self._connection()
+        with connection:
+            for table in self.TABLES:
+                connection.execute(f'DELETE FROM {table}')
+
+
+class AnalysisCache(SQLiteCache):
+    """
+    Кэш результатов CodeAnalyzer.analyze_file на диске
+
+    Результаты хранятся по хэшу содержимого в формате SHA объекта blob git,
+    поэтому файлы рабочей копии и объекты из репозитория (см.
+    CodeAnalyzer.analyze_git_revision) используют общие записи. Для файлов
+    на диске запись сначала ищется по пути, размеру и времени изменения,
+    а если они не совпали - по хэшу содержимого (в том числе от файла с
+    другим путем - например, при повторной загрузке того же архива).
+    При смене версии анализатора или схемы кэша все записи сбрасываются.
+
+    Найденные результаты содержат ключ 'content_hash' с хэшем содержимого.
+    """
+
+    DB_FILENAME = 'analysis_cache.sqlite3'
+    # Версия схемы таблиц и формата хэша содержимого
+    SCHEMA_VERSION = 'blob-sha1'
+    TABLES = {
+        'blobs': 'content_hash TEXT PRIMARY KEY, result TEXT',
+        'files': 'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT'
+    }
+
+    def __init__(self, cache_dir: str, version: str):
+        """
+        Инициализация кэша
+
+        Args:
+            cache_dir: Директория для файла базы данных
+            version: Версия формата результатов анализатора
+        """
+        super().__init__(cache_dir, f'{version}/{self.SCHEMA_VERSION}')
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Хэш содержимого файла (совпадает с 'git hash-object')"""
+        digest = hashlib.sha1(b'blob %d\0' % len(data))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get_by_stat(self, file_path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """
+        Поиск результата по пути, размеру и времени изменения файла
+
+        Args:
+            file_path: Путь к файлу
+            stat: Результат os.stat для файла
+
+        Returns:
+            Результат анализа или None
+        """
+        row = self._connection().execute(
+            'SELECT blobs.result, files.content_hash FROM files '
+            'JOIN blobs ON blobs.content_hash = files.content_hash '
+            'WHERE files.path = ? AND files.size = ? AND files.mtime_ns = ?',
+            (file_path, stat.st_size, stat.st_mtime_ns)
+        ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        result['file'] = file_path
+        result['content_hash'] = row[1]
+        return result
+
+    def get_by_hash(self, file_path: str, stat: os.stat_result,
+                    content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Поиск результата по хэшу содержимого
+
+        Найденная запись привязывается к текущему пути и метаданным файла,
+        чтобы следующий поиск сработал уже по get_by_stat.
+
+        Args:
+            file_path: Путь к файлу
+            stat: Результат os.stat для файла
+            content_hash: Хэш содержимого файла
+
+        Returns:
+            Результат анализа или None
+        """
+        result = self.get_blob(content_hash, file_path)
+        if result is not None:
+            connection = self._connection()
+            with connection:
+                self._put_file(connection, file_path, stat, content_hash)
+        return result
+
+    def get_blob(self, content_hash: str, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Поиск результата по хэшу содержимого (SHA объекта blob git)
+
+        Args:
+            content_hash: Хэш содержимого
+            file_path: Путь, подставляемый в результат
+
+        Returns:
+            Результат анализа или None
+        """
+        row = self._connection().execute(
+            'SELECT result FROM blobs WHERE content_hash = ?', (content_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        result['file'] = file_path
+        result['content_hash'] = content_hash
+        return result
+
+    def put_blob(self, content_hash: str, result: Dict[str, Any]):
+        """
+        Сохранение результата анализа по хэшу содержимого
+
+        Args:
+            content_hash: Хэш содержимого
+            result: Результат анализа
+        """
+        connection = self._connection()
+        with connection:
+            self._put_blob(connection, content_hash, result)
+
+    def put(self, file_path: str, stat: os.stat_result, content_hash: str,
+            result: Dict[str, Any]):
+        """
+        Сохранение результата анализа файла
+
+        Args:
+            file_path: Путь к файлу
+            stat: Результат os.stat для файла
+            content_hash: Хэш содержимого файла
+            result: Результат анализа
+        """
+        connection = self._connection()
+        with connection:
+            self._put_blob(connection, content_hash, result)
+            self._put_file(connection, file_path, stat, content_hash)
+
+    @staticmethod
+    def _put_blob(connection: sqlite3.Connection, content_hash: str, result: Dict[str, Any]):
+        connection.execute(
+            'INSERT OR REPLACE INTO blobs (content_hash, result) VALUES (?, ?)',
+            (content_hash, json.dumps(result, ensure_ascii=False))
+        )
+
+    @staticmethod
+    def _put_file(connection: sqlite3.Connection, file_path: str, stat: os.stat_result,
+                  content_hash: str):
+        connection.execute(
+            'INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)',
+            (file_path, stat.st_size, stat.st_mtime_ns, content_hash)
+        )
+
+    def forget_paths(self, root: str, keep: Iterable[str] = ()):
+        """
+        Удаление привязок путей к содержимому для файлов внутри директории
+
+        Записи blobs остаются: их по-прежнему можно найти по хэшу
+        содержимого. Вызывается после полного обхода директории (с
+        найденными файлами в keep) и при удалении временных директорий,
+        чтобы таблица files не росла за счет путей, которых больше нет.
+
+        Args:
+            root: Путь к директории (или к отдельному файлу)
+            keep: Пути, записи которых нужно сохранить
+        """
+        prefix = os.path.join(root, '')
+        keep = set(keep)
+        connection = self._connection()
+        with connection:
+            rows = connection.execute(
+                'SELECT path FROM files WHERE path = ? OR (path >= ? AND path < ?)',
+                (root, prefix, prefix + '\U0010ffff')
+            ).fetchall()
+            connection.executemany(
+                'DELETE FROM files WHERE path = ?',
+                [(path,) for path, in rows if path not in keep]
+            )
@@ -3,99 +3,207 @@
 """
 
 import json
-import re
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from .code_analyzer import CodeAnalyzer
+from .flask_routes import join_rule, path_parameters
+from .models import ModuleInfo, RouteInfo
+from .symbol_index import SymbolIndex
 
 
 class APIDocGenerator:
     """Генератор документации для API"""
     
-    def __init__(self):
-        """Инициализация генератора"""
-        self.analyzer = CodeAnalyzer()
+    def __init__(self, analyzer: Optional[CodeAnalyzer] = None):
+        """
+        Инициализация генератора
+        
+        Args:
+            analyzer: Анализатор кода (например, с постоянным кэшем; по умолчанию новый)
+        """
+        self.analyzer = analyzer if analyzer is not None else CodeAnalyzer()
     
     def generate_from_flask_app(self, app_file: str) -> Dict[str, Any]:
         """
         Генерация документации из Flask приложения
         
+        Маршруты берутся из результата CodeAnalyzer (декораторы route/get/post...,
+        add_url_rule, blueprint), файл разбирается один раз.
+        
         Args:
             app_file: Путь к файлу с Flask приложением
             
         Returns:
             Словарь с API документацией
         """
-        code_info = self.analyzer.analyze_file(app_file)
-        
-        # Читаем исходный код для поиска маршрутов
-        with open(app_file, 'r', encoding='utf-8') as f:
-            source = f.read()
-        
-        routes = self._extract_flask_routes(source)
+        module_info = self.analyzer.analyze_file_info(app_file)
         
         return {
             'title': 'API Documentation',
             'version': '1.0.0',
             'base_url': '/api',
-            'routes': routes,
-            'info': code_info
+            'routes': self.routes_from_module(module_info),
+            'info': module_info.to_dict()
         }
     
-    def _extract_flask_routes(self, source: str) -> List[Dict[str, Any]]:
-        """Извлечение маршрутов Flask из исходного кода"""
-        routes = []
+    def routes_from_module(self, module_info: ModuleInfo) -> List[Dict[str, Any]]:
+        """
+        Маршруты одного файла с префиксами его blueprint
         
-        # Паттерн для поиска декораторов @app.route
-        route_pattern = r'@app\.route\(["\']([^"\']+)["\'](?:\s*,\s*methods=\[([^\]]+)\])?\)'
+        Префикс берется из url_prefix в register_blueprint того же файла,
+        иначе из url_prefix в Blueprint(...).
         
-        matches = re.finditer(route_pattern, source)
+        Args:
+            module_info: Результат анализа файла
+            
+        Returns:
+            Список {'path', 'methods', 'function', 'description', 'parameters', 'line'}
+        """
+        prefixes = {name: url_prefix for name, url_prefix, _ in module_info.blueprints}
+        for _, blueprint, url_prefix in module_info.blueprint_registrations:
+            if url_prefix is not None and blueprint in prefixes:
+                prefixes[blueprint] = url_prefix
+        return [self._route_entry(route, prefixes.get(route.owner)) for route in module_info.routes]
+    
+    def generate_from_directory(self, directory: str, workers: Optional[int] = None,
+                                exclude: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Генерация документации API всего проекта
         
-        for match in matches:
-            path = match.group(1)
-            methods_str = match.group(2) if match.group(2) else "'GET'"
-            methods = [m.strip().strip("'\"") for m in methods_str.split(',')]
+        Файлы анализируются потоково (в пуле процессов при workers > 1, с
+        постоянным кэшем анализатора, если он задан), в памяти остаются
+        только файлы с маршрутами и blueprint.
+        
+        Args:
+            directory: Корневая директория проекта
+            workers: Число процессов для параллельного анализа
+            exclude: Дополнительные шаблоны исключений в формате .gitignore
             
-            # Ищем функцию после декоратора
-            func_match = re.search(
-                r'def\s+(\w+)\s*\([^)]*\)\s*:',
-                source[match.end():match.end()+500]
-            )
+        Returns:
+            Словарь в формате generate_from_flask_app (без 'info'); у маршрутов
+            есть ключ 'file' - путь файла относительно корня проекта
+        """
+        symbol_index = SymbolIndex()
+        api_files = []
+        for module_info, _ in self.analyzer.analyze_directory_iter(directory, workers=workers,
+                                                                   exclude=exclude, as_models=True):
+            symbol_index.add_file(module_info, directory)
+            if module_info.routes or module_info.blueprints or module_info.blueprint_registrations:
+                api_files.append(module_info)
+        symbol_index.finalize()
+        
+        return {
+            'title': 'API Documentation',
+            'version': '1.0.0',
+            'base_url': '/api',
+            'routes': self.routes_from_project(api_files, symbol_index, directory)
+        }
+    
+    def routes_from_project(self, files: List[ModuleInfo], symbol_index: SymbolIndex,
+                            root: str) -> List[Dict[str, Any]]:
+        """
+        Маршруты нескольких файлов с префиксами blueprint из всего проекта
+        
+        Blueprint, его регистрация в приложении (или в другом blueprint) и
+        маршруты могут находиться в разных модулях: имена связываются через
+        импорты из SymbolIndex. Blueprint, зарегистрированный несколько раз
+        с разными url_prefix, дает маршрут для каждого префикса.
+        
+        Args:
+            files: Результаты анализа файлов с маршрутами и blueprint
+            symbol_index: Индекс символов всего проекта (после finalize())
+            root: Корневая директория проекта
             
-            if func_match:
-                func_name = func_match.group(1)
-                # Извлекаем docstring функции
-                docstring_match = re.search(
-                    r'"""(.*?)"""',
-                    source[match.end():match.end()+1000],
-                    re.DOTALL
-                )
-                
-                docstring = docstring_match.group(1).strip() if docstring_match else ''
-                
-                # Извлекаем параметры из пути
-                path_params = re.findall(r'<(\w+)(?::([^>]+))?>', path)
-                
-                route_info = {
-                    'path': path,
-                    'methods': methods,
-                    'function': func_name,
-                    'description': docstring,
-                    'parameters': [
-                        {
-                            'name': param[0] if len(param) > 0 else 'unknown',
-                            'type': param[1] if len(param) > 1 and param[1] else 'string',
-                            'in': 'path',
-                            'required': True
-                        }
-                        for param in path_params if len(param) > 0
-                    ]
-                }
-                
-                routes.append(route_info)
+        Returns:
+            Список маршрутов в формате routes_from_module с ключом 'file';
+            'function' - полное имя представления
+        """
+        # Полное имя переменной blueprint -> url_prefix из Blueprint(...)
+        blueprints: Dict[str, Optional[str]] = {}
+        for module_info in files:
+            module = symbol_index.module_of(module_info.file) or ''
+            for name, url_prefix, _ in module_info.blueprints:
+                blueprints[f"{module}.{name}" if module else name] = url_prefix
+        
+        # Blueprint -> регистрации (blueprint-владелец или None для приложения, url_prefix)
+        registrations: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}
+        for module_info in files:
+            module = symbol_index.module_of(module_info.file) or ''
+            for owner, blueprint, url_prefix in module_info.blueprint_registrations:
+                key = self._resolve_blueprint(blueprint, module, symbol_index, blueprints)
+                if key is not None:
+                    registrations.setdefault(key, []).append(
+                        (self._resolve_blueprint(owner, module, symbol_index, blueprints), url_prefix))
         
+        prefixes: Dict[str, List[Optional[str]]] = {}
+        routes = []
+        for module_info in files:
+            module = symbol_index.module_of(module_info.file) or ''
+            file_path = os.path.relpath(module_info.file, root).replace(os.sep, '/')
+            for route in module_info.routes:
+                key = self._resolve_blueprint(route.owner, module, symbol_index, blueprints)
+                route_prefixes = ([None] if key is None else
+                                  self._blueprint_prefixes(key, blueprints, registrations, prefixes))
+                for prefix in route_prefixes:
+                    entry = self._route_entry(route, prefix)
+                    if module and route.view:
+                        entry['function'] = f"{module}.{route.view}"
+                    entry['file'] = file_path
+                    routes.append(entry)
         return routes
     
+    @staticmethod
+    def _resolve_blueprint(name: str, module: str, symbol_index: SymbolIndex,
+                           blueprints: Dict[str, Optional[str]]) -> Optional[str]:
+        """Полное имя blueprint по имени в модуле (None, если это не blueprint)"""
+        qualname = symbol_index.qualify(name, module)
+        # Переэкспорт через пакеты: 'from pkg import bp', где в pkg 'from .views import bp'
+        for _ in range(8):
+            if qualname in blueprints:
+                return qualname
+            owner_module, _, attr = qualname.rpartition('.')
+            if owner_module not in symbol_index.modules:
+                return None
+            target = symbol_index.qualify(attr, owner_module)
+            if target == qualname:
+                return None
+            qualname = target
+        return None
+    
+    def _blueprint_prefixes(self, key: str, blueprints: Dict[str, Optional[str]],
+                            registrations: Dict[str, List[Tuple[Optional[str], Optional[str]]]],
+                            memo: Dict[str, List[Optional[str]]],
+                            active: frozenset = frozenset()) -> List[Optional[str]]:
+        """Префиксы маршрутов blueprint с учетом вложенных регистраций"""
+        if key in memo:
+            return memo[key]
+        own_prefix = blueprints[key]
+        result: List[Optional[str]] = []
+        for owner, url_prefix in registrations.get(key) or [(None, own_prefix)]:
+            prefix = url_prefix if url_prefix is not None else own_prefix
+            if owner is not None and owner not in active | {key}:
+                for parent in self._blueprint_prefixes(owner, blueprints, registrations, memo,
+                                                       active | {key}):
+                    result.append(join_rule(parent, prefix or '') or None)
+            else:
+                result.append(prefix)
+        memo[key] = list(dict.fromkeys(result))
+        return memo[key]
+    
+    @staticmethod
+    def _route_entry(route: RouteInfo, prefix: Optional[str]) -> Dict[str, Any]:
+        """Описание маршрута в формате generate_openapi_spec/generate_markdown"""
+        path = join_rule(prefix, route.rule)
+        return {
+            'path': path,
+            'methods': list(route.methods),
+            'function': route.view,
+            'description': route.docstring or '',
+            'parameters': path_parameters(path),
+            'line': route.line
+        }
+    
     def generate_openapi_spec(self, api_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         Генерация OpenAPI спецификации
@@ -0,0 +1,120 @@
+"""
+Потокобезопасный LRU кэш в памяти
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """LRU кэш ограниченного размера, безопасный для использования из нескольких потоков"""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Инициализация кэша
+
+        Args:
+            maxsize: Максимальное число записей
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Получение значения (запись становится самой свежей)"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Сохранение значения с вытеснением самой старой записи"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Получение значения или его вычисление при отсутствии
+
+        Вычисление выполняется вне блокировки: при гонке значение может быть
+        посчитано дважды, но потоки не ждут друг друга.
+        """
+        sentinel = _MISSING
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Очистка кэша"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш строк: LRU в памяти и постоянное хранилище
+
+    Хранилище - объект с методами get(key) и put_many(items), например
+    FragmentCache. Значения крупнее max_item_size хранятся только на
+    диске, чтобы несколько больших записей не вытеснили из памяти все остальные.
+    """
+
+    def __init__(self, maxsize: int = 256, store: Optional[Any] = None,
+                 max_item_size: int = 1024 * 1024):
+        """
+        Инициализация кэша
+
+        Args:
+            maxsize: Максимальное число записей в памяти
+            store: Постоянное хранилище (опционально)
+            max_item_size: Максимальная длина значения, хранимого в памяти
+        """
+        self.memory = LRUCache(maxsize)
+        self.store = store
+        self.max_item_size = max_item_size
+
+    def get_or_create(self, key: str, factory: Callable[[], str]) -> str:
+        """
+        Получение значения из памяти, затем из хранилища, иначе вычисление
+
+        Args:
+            key: Ключ (строка)
+            factory: Функция вычисления значения
+
+        Returns:
+            Значение
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.store.get(key) if self.store is not None else None
+        if value is None:
+            value = factory()
+            if self.store is not None:
+                self.store.put_many([(key, value)])
+        if len(value) <= self.max_item_size:
+            self.memory.put(key, value)
+        return value
+
+
+_MISSING = object()
@@ -0,0 +1,127 @@
+"""
+Граф вызовов проекта
+"""
+
+from typing import List, Any, Optional, Tuple
+
+from .graph_utils import EdgeListGraph, condense
+from .models import record_field
+from .symbol_index import SymbolIndex
+
+
+class CallGraph(EdgeListGraph):
+    """
+    Граф вызовов между функциями и методами проекта
+
+    Вершины - полные имена определений из SymbolIndex, ребра хранятся
+    в виде двух массивов целых чисел (sources[i] -> targets[i]) без повторов.
+    Вызовы функций вне проекта (стандартная библиотека, зависимости) и методов
+    переменных неизвестного типа ('d.get()', 'self.session.get()') не учитываются
+    (см. SymbolIndex.resolve).
+    """
+
+    @classmethod
+    def build(cls, files: List[Any], symbol_index: SymbolIndex) -> 'CallGraph':
+        """
+        Построение графа по результатам анализа файлов
+
+        Args:
+            files: Результаты анализа файлов (словари или ModuleInfo)
+            symbol_index: Индекс символов тех же файлов (после finalize())
+
+        Returns:
+            Граф вызовов
+        """
+        graph = cls()
+        for file_info in files:
+            graph.add_file(file_info, symbol_index)
+        return graph
+
+    def add_file(self, file_info: Any, symbol_index: SymbolIndex):
+        """
+        Добавление вызовов одного файла
+
+        Args:
+            file_info: Результат анализа файла (словарь или ModuleInfo)
+            symbol_index: Индекс символов проекта
+        """
+        file_path, calls = record_field(file_info, 'file'), record_field(file_info, 'calls')
+        module = symbol_index.module_of(file_path)
+        if module is None or not calls:
+            return
+
+        prefix = f"{module}." if module else ''
+        for caller, callees in calls.items():
+            caller_name = prefix + caller
+            if caller_name not in symbol_index.definitions:
+                continue
+            for callee in callees:
+                target = self._resolve_callee(callee, caller_name, module, symbol_index)
+                if target is not None and target != caller_name:
+                    self.add_edge(caller_name, target)
+
+    @staticmethod
+    def _resolve_callee(callee: str, caller: str, module: str,
+                        symbol_index: SymbolIndex) -> Optional[str]:
+        """Разрешение вызываемого имени в полное имя функции или метода"""
+        head, _, attr = callee.partition('.')
+        if head in ('self', 'cls') and attr and '.' not in attr:
+            definition = symbol_index.definitions[caller]
+            if definition['kind'] != 'method':
+                return None
+            return CallGraph._resolve_method(caller.rsplit('.', 1)[0], attr, symbol_index)
+
+        target = symbol_index.resolve(callee, module)
+        definition = symbol_index.definitions.get(target) if target else None
+        if definition is None:
+            return None
+        if definition['kind'] == 'class':
+            # Создание экземпляра - вызов конструктора
+            return CallGraph._resolve_method(target, '__init__', symbol_index)
+        return target
+
+    @staticmethod
+    def _resolve_method(class_name: str, method: str,
+                        symbol_index: SymbolIndex) -> Optional[str]:
+        """Поиск метода в классе и его базовых классах проекта"""
+        pending = [class_name]
+        seen = set()
+        while pending:
+            current = pending.pop(0)
+            if current in seen:
+                continue
+            seen.add(current)
+            candidate = f"{current}.{method}"
+            if candidate in symbol_index.definitions:
+                return candidate
+            definition = symbol_index.definitions.get(current)
+            if definition is None:
+                continue
+            for base in definition.get('bases', []):
+                resolved = symbol_index.resolve(base, definition['module'])
+                if resolved is not None:
+                    pending.append(resolved)
+        return None
+
+    def callees_of(self, name: str) -> List[str]:
+        """Функции, вызываемые функцией"""
+        node = self._ids.get(name)
+        return [self.nodes[t] for s, t in zip(self.sources, self.targets) if s == node]
+
+    def callers_of(self, name: str) -> List[str]:
+        """Функции, вызывающие функцию"""
+        node = self._ids.get(name)
+        return [self.nodes[s] for s, t in zip(self.sources, self.targets) if t == node]
+
+    def condensed(self) -> Tuple[List[List[str]], List[Tuple[int, int]]]:
+        """
+        Граф со сжатыми компонентами сильной связности
+
+        Взаимно рекурсивные функции объединяются в одну вершину, поэтому
+        граф становится ациклическим и остается читаемым на тысячах функций.
+
+        Returns:
+            Пара (группы имен функций, ребра между группами в виде пар номеров)
+        """
+        component, count, sources, targets = condense(len(self.nodes), self.sources, self.targets)
+        return self.component_groups(component, count), list(zip(sources, targets))
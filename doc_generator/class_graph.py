@@ -0,0 +1,115 @@
+"""
+Граф наследования классов проекта
+"""
+
+from typing import Dict, List, Any
+
+from .graph_utils import EdgeListGraph, partition_graph
+from .models import record_field
+from .symbol_index import SymbolIndex
+
+
+class ClassGraph(EdgeListGraph):
+    """
+    Граф наследования между классами всего проекта
+
+    Вершины - полные имена классов из SymbolIndex (каждый класс один раз,
+    даже если его базу используют классы из разных файлов), ребра
+    base -> derived хранятся в двух массивах целых чисел без повторов.
+    Базовые классы вне проекта (стандартная библиотека, зависимости) не
+    становятся вершинами и запоминаются по короткому имени у наследника.
+    """
+
+    def __init__(self):
+        """Инициализация пустого графа"""
+        super().__init__()
+        # Номер вершины -> описание класса {'name', 'module', 'attributes', 'methods'}
+        self.classes: Dict[int, Dict[str, Any]] = {}
+        # Номер вершины -> короткие имена базовых классов вне проекта
+        self.external_bases: Dict[int, List[str]] = {}
+
+    @classmethod
+    def build(cls, files: List[Any], symbol_index: SymbolIndex) -> 'ClassGraph':
+        """
+        Построение графа по результатам анализа файлов
+
+        Args:
+            files: Результаты анализа файлов (словари или ModuleInfo)
+            symbol_index: Индекс символов тех же файлов (после finalize())
+
+        Returns:
+            Граф наследования
+        """
+        graph = cls()
+        for file_info in files:
+            graph.add_file(file_info, symbol_index)
+        return graph
+
+    def add_file(self, file_info: Any, symbol_index: SymbolIndex):
+        """
+        Добавление классов одного файла
+
+        Args:
+            file_info: Результат анализа файла (словарь или ModuleInfo)
+            symbol_index: Индекс символов проекта
+        """
+        file_path, classes = record_field(file_info, 'file'), record_field(file_info, 'classes')
+        module = symbol_index.module_of(file_path)
+        if module is None or not classes:
+            return
+
+        prefix = f"{module}." if module else ''
+        for class_info in classes:
+            name = record_field(class_info, 'name')
+            qualname = prefix + (record_field(class_info, 'qualname') or name)
+            node = self.node_id(qualname)
+            self.classes[node] = {
+                'name': name,
+                'module': module,
+                'attributes': list(record_field(class_info, 'attributes', [])),
+                'methods': [
+                    f"{record_field(method, 'name')}"
+                    f"({', '.join(record_field(arg, 'name') for arg in record_field(method, 'args', []))})"
+                    for method in record_field(class_info, 'methods', [])
+                ]
+            }
+            for base in record_field(class_info, 'bases', []):
+                resolved = symbol_index.resolve(base, module)
+                definition = symbol_index.definitions.get(resolved) if resolved else None
+                if definition is not None and definition['kind'] == 'class':
+                    self.add_edge(resolved, qualname)
+                else:
+                    self.external_bases.setdefault(node, []).append(base.split('.')[-1])
+
+    def clusters(self, max_classes: int = 40) -> List[List[int]]:
+        """
+        Разбиение графа на части не больше max_classes классов
+
+        Связанные наследованием классы по возможности попадают в одну часть
+        (см. graph_utils.partition_graph); иерархия крупнее лимита режется по
+        обходу в ширину от корневого класса, а ребра между частями выводятся
+        в диаграмме наследника с заглушкой базового класса.
+
+        Args:
+            max_classes: Максимальное число классов проекта в одной части
+
+        Returns:
+            Списки номеров вершин по частям
+        """
+        return partition_graph(len(self.nodes), self.sources, self.targets, max_classes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация в JSON-совместимый словарь (с описаниями классов)"""
+        data = super().to_dict()
+        data['classes'] = {str(node): info for node, info in self.classes.items()}
+        data['external_bases'] = {str(node): bases for node, bases in self.external_bases.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ClassGraph':
+        """Восстановление графа из словаря to_dict()"""
+        graph = super().from_dict(data)
+        graph.classes = {int(node): info for node, info in data.get('classes', {}).items()}
+        graph.external_bases = {int(node): list(bases)
+                                for node, bases in data.get('external_bases', {}).items()}
+        return graph
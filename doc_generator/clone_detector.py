@@ -0,0 +1,213 @@
+"""
+Поиск дублирующегося кода по хэшам нормализованных поддеревьев AST
+"""
+
+import ast
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+from .models import record_field
+
+
+# Минимальный размер фрагмента (число узлов AST) по умолчанию
+DEFAULT_MIN_NODES = 50
+
+# Составные операторы, блоки которых сравниваются наряду с функциями
+BLOCK_KINDS = {
+    ast.For: 'for',
+    ast.AsyncFor: 'async for',
+    ast.While: 'while',
+    ast.If: 'if',
+    ast.With: 'with',
+    ast.AsyncWith: 'async with',
+    ast.Try: 'try',
+}
+
+_FUNCTION_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+
+# Фрагмент: (хэш, имя, первая строка, последняя строка, число узлов)
+Fragment = Tuple[str, str, int, int, int]
+
+
+def _label(node: ast.AST) -> str:
+    """
+    Метка узла после нормализации
+
+    Имена переменных, аргументов и функций и значения констант не
+    учитываются, поэтому совпадают фрагменты, отличающиеся только ими.
+    """
+    node_type = type(node)
+    if node_type is ast.Constant:
+        return f"Constant:{type(node.value).__name__}"
+    if node_type is ast.Attribute:
+        return f"Attribute:{node.attr}"
+    if node_type is ast.keyword:
+        return f"keyword:{node.arg}"
+    if node_type is ast.alias:
+        return f"alias:{node.name}"
+    return node_type.__name__
+
+
+@lru_cache(maxsize=None)
+def _child_fields(node_type: type) -> Tuple[str, ...]:
+    """Поля типа узла, которые могут содержать дочерние узлы (без контекста Load/Store)"""
+    return tuple(name for name in node_type._fields if name != 'ctx')
+
+
+def _is_docstring(statement: ast.AST) -> bool:
+    return (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant)
+            and isinstance(statement.value.value, str))
+
+
+def hash_fragments(tree: ast.AST, min_nodes: int = DEFAULT_MIN_NODES) -> List[Fragment]:
+    """
+    Хэши функций и блоков, размер которых не меньше порога
+
+    Хэш узла считается снизу вверх из метки узла и хэшей дочерних узлов.
+    Одинаковые поддеревья получают общий номер через таблицу
+    (метка, номера детей) -> номер, поэтому хэш каждой различной структуры
+    вычисляется один раз, а обход линеен по размеру дерева.
+
+    Args:
+        tree: Разобранный модуль
+        min_nodes: Минимальный размер фрагмента в узлах AST
+
+    Returns:
+        Список фрагментов (хэш, имя, первая строка, последняя строка, число узлов)
+    """
+    fragments: List[Fragment] = []
+    # (метка, номера детей с разделителями полей) -> номер структуры
+    table: Dict[Tuple[str, Tuple[int, ...]], int] = {}
+    # Номер структуры -> хэш, не зависящий от процесса
+    digests: List[bytes] = []
+    separator = -1
+
+    def visit(node: ast.AST, scope: str) -> Tuple[int, int]:
+        node_type = type(node)
+        is_function = node_type in _FUNCTION_TYPES
+        if is_function or node_type is ast.ClassDef:
+            inner_scope = f"{scope}.{node.name}" if scope else node.name
+        else:
+            inner_scope = scope
+
+        children = []
+        size = 1
+        for field_name in _child_fields(node_type):
+            value = getattr(node, field_name, None)
+            if value.__class__ is list:
+                items = value
+                if field_name == 'body' and items and _is_docstring(items[0]):
+                    items = items[1:]
+                for item in items:
+                    if isinstance(item, ast.AST):
+                        child, child_size = visit(item, inner_scope)
+                        children.append(child)
+                        size += child_size
+            elif value is not None and isinstance(value, ast.AST):
+                child, child_size = visit(value, inner_scope)
+                children.append(child)
+                size += child_size
+            children.append(separator)
+
+        label = _label(node)
+        key = (label, tuple(children))
+        structure = table.get(key)
+        if structure is None:
+            digest = hashlib.blake2b(label.encode(), digest_size=8)
+            for child in children:
+                digest.update(digests[child] if child != separator else b'|')
+            structure = table[key] = len(digests)
+            digests.append(digest.digest())
+
+        if size >= min_nodes:
+            if is_function:
+                name = inner_scope
+            else:
+                kind = BLOCK_KINDS.get(type(node))
+                name = f"{scope or '<module>'}: {kind}" if kind else None
+            if name is not None:
+                end = getattr(node, 'end_lineno', None) or node.lineno
+                fragments.append((digests[structure].hex(), name, node.lineno, end, size))
+        return structure, size
+
+    visit(tree, '')
+    return fragments
+
+
+class CloneIndex:
+    """
+    Индекс фрагментов кода по хэшу для поиска групп дубликатов
+
+    Фрагменты группируются через словарь хэш -> фрагменты, без попарного
+    сравнения, поэтому время работы почти линейно по числу фрагментов.
+    """
+
+    def __init__(self):
+        """Инициализация пустого индекса"""
+        # Хэш -> фрагменты (файл, имя, первая строка, последняя строка, число узлов)
+        self._by_hash: Dict[str, List[Tuple[str, str, int, int, int]]] = {}
+
+    def add_file(self, file_info: Any):
+        """
+        Добавление фрагментов одного файла
+
+        Args:
+            file_info: Результат анализа файла (словарь или ModuleInfo)
+        """
+        file_path = record_field(file_info, 'file')
+        for digest, name, line_start, line_end, size in record_field(file_info, 'fragments') or ():
+            self._by_hash.setdefault(digest, []).append((file_path, name, line_start, line_end, size))
+
+    def groups(self) -> List[Dict[str, Any]]:
+        """
+        Группы дублирующихся фрагментов
+
+        Группы, все фрагменты которых лежат внутри фрагментов более крупной
+        группы (например, совпадающие циклы внутри совпадающих функций), не выводятся.
+
+        Returns:
+            Список групп {'size': число узлов, 'fragments': [...]}, крупные группы первыми
+        """
+        candidates = [members for members in self._by_hash.values() if len(members) > 1]
+        candidates.sort(key=lambda members: (-members[0][4], members[0][0], members[0][2]))
+
+        # Принятые фрагменты по файлам: (первая строка, последняя строка)
+        covered: Dict[str, List[Tuple[int, int]]] = {}
+        result = []
+        for members in candidates:
+            if all(self._is_covered(covered, member) for member in members):
+                continue
+            for file_path, _, line_start, line_end, _ in members:
+                covered.setdefault(file_path, []).append((line_start, line_end))
+            result.append({
+                'size': members[0][4],
+                'fragments': [
+                    {'file': file_path, 'name': name, 'line_start': line_start, 'line_end': line_end}
+                    for file_path, name, line_start, line_end, _ in members
+                ]
+            })
+        return result
+
+    @staticmethod
+    def _is_covered(covered: Dict[str, List[Tuple[int, int]]],
+                    member: Tuple[str, str, int, int, int]) -> bool:
+        file_path, _, line_start, line_end, _ = member
+        return any(start <= line_start and line_end <= end
+                   for start, end in covered.get(file_path, ()))
+
+
+def find_clone_groups(files: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Поиск групп дублирующегося кода по результатам анализа файлов
+
+    Args:
+        files: Результаты CodeAnalyzer (словари или ModuleInfo)
+
+    Returns:
+        Список групп (см. CloneIndex.groups)
+    """
+    index = CloneIndex()
+    for file_info in files:
+        index.add_file(file_info)
+    return index.groups()
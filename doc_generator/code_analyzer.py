@@ -4,11 +4,44 @@
 
 import ast
 import inspect
+import multiprocessing
 import os
-from typing import Dict, List, Any, Optional
+import signal
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import chain, islice
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
 import re
 
+from .analysis_cache import AnalysisCache
+from .call_graph import CallGraph
+from .class_graph import ClassGraph
+from .clone_detector import DEFAULT_MIN_NODES, find_clone_groups, hash_fragments
+from .docstring_parser import parse_docstring
+from .file_walker import filter_source_paths, iter_source_files
+from .flask_routes import (HTTP_METHODS, blueprint_prefix, blueprint_registration, dotted_name,
+                           route_from_add_url_rule, route_from_decorator)
+from .git_source import CatFileBatch, GitTreeEntry, list_tree, resolve_revision
+from .models import ArgInfo, ClassInfo, FunctionInfo, ImportInfo, ModuleInfo, RouteInfo, intern_name, record_field
+from .module_graph import ModuleGraph
+from .symbol_index import SymbolIndex
+
+
+# Версия формата результатов анализа; меняется при любом изменении
+# структуры результата, чтобы сбросить постоянный кэш
+ANALYZER_VERSION = '6'
+
+# Лимиты анализа одного файла по умолчанию (None - без ограничения)
+DEFAULT_MAX_FILE_SIZE = 2 * 1024 * 1024
+DEFAULT_PARSE_TIMEOUT = 10.0
+
+# Запас к parse_timeout при ожидании результата из процесса пула: в процессе
+# лимит применяется сигналом, а ожидание прерывает только зависший ast.parse
+_PROCESS_TIMEOUT_GRACE = 5.0
+
 try:
     from ast import unparse
 except ImportError:
@@ -20,15 +53,268 @@ except ImportError:
             return str(node)
 
 
-class CodeAnalyzer:
-    """Анализатор Python кода для извлечения структуры и документации"""
+class AnalysisTimeout(Exception):
+    """Превышено время анализа одного файла"""
+
+
+def process_pool_context():
+    """
+    Контекст multiprocessing для пулов процессов пакета
+    
+    Пулы создаются в том числе из потоков обработки запросов веб-приложения,
+    а fork многопоточного процесса копирует блокировки в захваченном другими
+    потоками состоянии. Процессы запускаются через forkserver (сервер
+    создается из однопоточного процесса), а где его нет (Windows) - через
+    spawn; поэтому скрипты, запускающие параллельный анализ, должны
+    выполнять его под if __name__ == '__main__'.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _signal_limit_available() -> bool:
+    """Можно ли ограничить время блока сигналом в текущем потоке"""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    """
+    Ограничение времени выполнения блока через SIGALRM
+    
+    Работает только в главном потоке процесса на POSIX (в том числе в
+    процессах пула); в остальных случаях ограничение не применяется, а вне
+    главного потока CodeAnalyzer выполняет анализ в отдельном процессе.
+    Обработчик сигнала срабатывает между инструкциями Python, поэтому
+    разбор в ast.parse прерывается только после его завершения - время
+    разбора ограничивает лимит размера файла.
+    """
+    if not seconds or not _signal_limit_available():
+        yield
+        return
+    
+    def handler(signum, frame):
+        raise AnalysisTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _count_file_lines(file_path: str) -> int:
+    """Подсчет строк файла чтением блоками, без загрузки файла целиком"""
+    newlines = 0
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            newlines += block.count(b'\n')
+    return newlines + 1
+
+
+class _AnalysisVisitor(ast.NodeVisitor):
+    """
+    Однопроходный обход AST с отслеживанием области видимости
     
-    def __init__(self):
-        """Инициализация анализатора"""
-        self.modules = []
+    Методы попадают только в свой класс, вложенные функции - в
+    'nested_functions' родительской функции, в 'functions' остаются
+    только функции уровня модуля. В том же проходе собираются вызовы:
+    вызовы во вложенных функциях относятся к внешней функции или методу,
+    и маршруты Flask: декораторы route/get/post..., вызовы add_url_rule,
+    объекты Blueprint и вызовы register_blueprint.
+    """
+    
+    def __init__(self, analyzer: 'CodeAnalyzer', source_code: str):
+        self.analyzer = analyzer
+        self.source_code = source_code
         self.classes = []
         self.functions = []
         self.imports = []
+        # Полное имя функции -> вызываемые имена (словарь используется как упорядоченное множество)
+        self.calls: Dict[str, Dict[str, None]] = {}
+        # Стек областей видимости: пары (вид, информация об узле)
+        self._scope = []
+        # Вызовы текущей функции верхнего уровня или метода
+        self._current_calls: Optional[Dict[str, None]] = None
+        self.routes: List[RouteInfo] = []
+        self.blueprints: List[Tuple[str, Optional[str], int]] = []
+        self.blueprint_registrations: List[Tuple[str, str, Optional[str]]] = []
+        # Маршруты add_url_rule, представление которых ищется после обхода:
+        # (маршрут, имя представления, методы заданы в вызове, представление - класс)
+        self._pending_views: List[Tuple[RouteInfo, str, bool, bool]] = []
+        # Имя -> функция или класс (последнее определение с таким именем)
+        self._definitions: Dict[str, Any] = {}
+    
+    def _qualname(self, name: str) -> str:
+        """Полное имя с учетом объемлющих классов и функций"""
+        return '.'.join([info.name for _, info in self._scope] + [name])
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        class_info = self.analyzer._extract_class_info(node, self.source_code)
+        class_info.qualname = intern_name(self._qualname(node.name))
+        self.classes.append(class_info)
+        self._definitions[node.name] = class_info
+        
+        self._scope.append(('class', class_info))
+        self.generic_visit(node)
+        self._scope.pop()
+    
+    def visit_FunctionDef(self, node):
+        func_info = self.analyzer._extract_function_info(node, self.source_code)
+        # Методы не могут быть представлениями add_url_rule по простому имени
+        if not self._scope or self._scope[-1][0] != 'class':
+            self._definitions[node.name] = func_info
+        
+        for decorator in node.decorator_list:
+            route = route_from_decorator(decorator)
+            if route is not None:
+                owner, rule, methods = route
+                self.routes.append(RouteInfo(rule, methods, intern_name(owner),
+                                             intern_name(self._qualname(node.name)),
+                                             decorator.lineno, func_info.docstring))
+        
+        if not self._scope:
+            self.functions.append(func_info)
+        else:
+            kind, parent = self._scope[-1]
+            if kind == 'class':
+                parent.methods.append(func_info)
+            else:
+                parent.nested_functions.append(func_info)
+        
+        outer_calls = self._current_calls
+        if outer_calls is None:
+            self._current_calls = self.calls.setdefault(intern_name(self._qualname(node.name)), {})
+        
+        self._scope.append(('function', func_info))
+        self.generic_visit(node)
+        self._scope.pop()
+        self._current_calls = outer_calls
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_Call(self, node: ast.Call):
+        if self._current_calls is not None:
+            name = dotted_name(node.func)
+            if name is not None:
+                self._current_calls[intern_name(name)] = None
+        if isinstance(node.func, ast.Attribute):
+            if node.func.attr == 'add_url_rule':
+                self._add_url_rule(node)
+            elif node.func.attr == 'register_blueprint':
+                registration = blueprint_registration(node)
+                if registration is not None:
+                    self.blueprint_registrations.append(registration)
+        self.generic_visit(node)
+    
+    def visit_Assign(self, node: ast.Assign):
+        if (isinstance(node.value, ast.Call) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)):
+            is_blueprint, url_prefix = blueprint_prefix(node.value)
+            if is_blueprint:
+                self.blueprints.append((intern_name(node.targets[0].id), url_prefix, node.lineno))
+        self.generic_visit(node)
+    
+    def _add_url_rule(self, node: ast.Call):
+        """Маршрут из вызова add_url_rule (представление ищется в finish_routes)"""
+        route = route_from_add_url_rule(node)
+        if route is None:
+            return
+        owner, rule, methods, view, is_class = route
+        route_info = RouteInfo(rule, methods or ['GET'], intern_name(owner),
+                               intern_name(view or ''), node.lineno)
+        self.routes.append(route_info)
+        if view is not None:
+            self._pending_views.append((route_info, view, methods is not None, is_class))
+    
+    def finish_routes(self):
+        """
+        Заполнение описаний маршрутов add_url_rule после обхода модуля
+        
+        Представление может быть определено ниже вызова, поэтому оно ищется
+        по имени среди всех определений модуля (имена вида 'views.index'
+        относятся к другим модулям и остаются как есть). Для класса
+        (MethodView) без явных methods методы маршрута - его методы get, post и т.д.
+        """
+        for route, view, explicit_methods, is_class in self._pending_views:
+            definition = self._definitions.get(view) if '.' not in view else None
+            if definition is None:
+                continue
+            route.docstring = definition.docstring
+            if isinstance(definition, ClassInfo):
+                route.view = definition.qualname
+                if is_class and not explicit_methods:
+                    methods = [method.name.upper() for method in definition.methods
+                               if method.name.upper() in HTTP_METHODS]
+                    route.methods = methods or route.methods
+    
+    def visit_Import(self, node):
+        self.imports.append(self.analyzer._extract_import_info(node))
+    
+    visit_ImportFrom = visit_Import
+
+
+class CodeAnalyzer:
+    """
+    Анализатор Python кода для извлечения структуры и документации
+    
+    Анализатор не хранит результаты между вызовами: все данные возвращаются
+    из методов, поэтому один экземпляр можно использовать из нескольких потоков.
+    Вне главного потока (например, в потоках запросов Flask) лимит времени
+    анализа нельзя применить сигналом, поэтому файлы анализируются в пуле
+    процессов анализатора (см. _analyze_source_in_process). В главном потоке
+    на платформах без signal.setitimer (Windows) лимит времени не применяется.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                 parse_timeout: Optional[float] = DEFAULT_PARSE_TIMEOUT,
+                 clone_min_nodes: Optional[int] = DEFAULT_MIN_NODES):
+        """
+        Инициализация анализатора
+        
+        Файлы больше max_file_size не читаются и не разбираются, а файлы,
+        анализ которых не уложился в parse_timeout, прерываются; в обоих
+        случаях результат содержит только число строк и причину пропуска
+        (ключ 'skipped'), а файл учитывается в сводке как пропущенный.
+        
+        Args:
+            cache_dir: Директория постоянного кэша результатов анализа (опционально)
+            max_file_size: Максимальный размер файла в байтах (None - без ограничения)
+            parse_timeout: Максимальное время анализа файла в секундах (None - без ограничения)
+            clone_min_nodes: Минимальный размер (в узлах AST) функции или блока
+                             для поиска дубликатов (None - не искать)
+        """
+        self.max_file_size = max_file_size
+        self.parse_timeout = parse_timeout
+        self.clone_min_nodes = clone_min_nodes
+        # Результаты зависят от настроек анализатора: при их смене кэш сбрасывается
+        self.cache_version = f'{ANALYZER_VERSION}:{clone_min_nodes}:{max_file_size}:{parse_timeout}'
+        self.cache = AnalysisCache(cache_dir, self.cache_version) if cache_dir else None
+        self._init_process_pool()
+    
+    def _init_process_pool(self):
+        """Состояние пула процессов для анализа с лимитом времени вне главного потока"""
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._pool_size = min(os.cpu_count() or 1, 4)
+        # Задание отправляется в пул только при свободном процессе, чтобы
+        # ожидание в очереди не учитывалось в лимите времени
+        self._pool_slots = threading.BoundedSemaphore(self._pool_size)
+    
+    def __getstate__(self):
+        # Пул и примитивы синхронизации не передаются в процессы пула
+        state = self.__dict__.copy()
+        for name in ('_pool', '_pool_lock', '_pool_slots'):
+            del state[name]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_process_pool()
     
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -40,10 +326,51 @@ class CodeAnalyzer:
         Returns:
             Словарь с информацией о коде
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source_code = f.read()
+        return self.analyze_file_info(file_path).to_dict()
+    
+    def _analyze_file_record(self, file_path: str) -> Dict[str, Any]:
+        """Результат анализа файла в виде словаря со служебными полями (см. ModuleInfo.to_dict)"""
+        if self.cache is not None:
+            return self._analyze_file_cached(file_path)
+        return self.analyze_file_info(file_path).to_dict(internal=True)
+    
+    def _check_file_size(self, file_path: str, size: int) -> Optional[ModuleInfo]:
+        """Результат для файла больше лимита (None, если файл можно анализировать)"""
+        if self.max_file_size is None or size <= self.max_file_size:
+            return None
+        return ModuleInfo(
+            file=file_path,
+            skipped=f'размер файла {size} байт превышает лимит {self.max_file_size} байт',
+            line_count=_count_file_lines(file_path)
+        )
+    
+    def _analyze_file_cached(self, file_path: str) -> Dict[str, Any]:
+        """Анализ файла с использованием постоянного кэша"""
+        stat = os.stat(file_path)
+        skipped = self._check_file_size(file_path, stat.st_size)
+        if skipped is not None:
+            return skipped.to_dict()
+        
+        cached = self.cache.get_by_stat(file_path, stat)
+        if cached is not None:
+            return cached
         
-        return self.analyze_source(source_code, file_path)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        content_hash = self.cache.content_hash(data)
+        cached = self.cache.get_by_hash(file_path, stat, content_hash)
+        if cached is not None:
+            return cached
+        
+        # Те же преобразования переводов строк, что и при чтении в текстовом режиме
+        source_code = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        info = self.analyze_source_info(source_code, file_path).to_dict(internal=True)
+        # Пропуск по лимиту зависит от настроек анализатора и не кэшируется
+        if 'skipped' not in info:
+            self.cache.put(file_path, stat, content_hash, info)
+            info['content_hash'] = content_hash
+        return info
     
     def analyze_source(self, source_code: str, file_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -56,100 +383,160 @@ class CodeAnalyzer:
         Returns:
             Словарь с информацией о коде
         """
+        return self.analyze_source_info(source_code, file_path).to_dict()
+    
+    def analyze_source_info(self, source_code: str, file_path: Optional[str] = None) -> ModuleInfo:
+        """
+        Анализ исходного кода с результатом в виде компактной модели
+        
+        Args:
+            source_code: Исходный код
+            file_path: Путь к файлу (опционально)
+            
+        Returns:
+            ModuleInfo (при синтаксической ошибке заполнено поле error,
+            при превышении лимитов - поле skipped)
+        """
+        line_count = source_code.count('\n') + 1
+        if self.max_file_size is not None and len(source_code) > self.max_file_size:
+            return ModuleInfo(
+                file=file_path or 'unknown',
+                skipped=f'размер исходного кода превышает лимит {self.max_file_size} байт',
+                line_count=line_count
+            )
+        
+        # Вне главного потока сигнал недоступен, и лимит применяется в процессе пула;
+        # в главном потоке без setitimer (Windows) лимит времени не применяется
+        if (self.parse_timeout and not _in_worker_process
+                and threading.current_thread() is not threading.main_thread()):
+            return self._analyze_source_in_process(source_code, file_path, line_count)
+        
         try:
-            tree = ast.parse(source_code)
+            with _time_limit(self.parse_timeout):
+                tree = ast.parse(source_code)
+                visitor = _AnalysisVisitor(self, source_code)
+                visitor.visit(tree)
+                visitor.finish_routes()
+                fragments = self._hash_fragments(tree)
         except SyntaxError as e:
-            return {
-                'error': f'Синтаксическая ошибка: {e}',
-                'file': file_path
-            }
+            return ModuleInfo(file=file_path, error=f'Синтаксическая ошибка: {e}')
+        except AnalysisTimeout:
+            return ModuleInfo(
+                file=file_path or 'unknown',
+                skipped=f'анализ не уложился в {self.parse_timeout} с',
+                line_count=line_count
+            )
         
-        info = {
-            'file': file_path or 'unknown',
-            'classes': [],
-            'functions': [],
-            'imports': [],
-            'module_docstring': ast.get_docstring(tree),
-            'line_count': len(source_code.split('\n'))
-        }
+        return ModuleInfo(
+            file=file_path or 'unknown',
+            classes=visitor.classes,
+            functions=visitor.functions,
+            imports=visitor.imports,
+            module_docstring=ast.get_docstring(tree),
+            line_count=line_count,
+            calls={caller: list(callees) for caller, callees in visitor.calls.items() if callees},
+            fragments=fragments,
+            routes=visitor.routes,
+            blueprints=visitor.blueprints,
+            blueprint_registrations=visitor.blueprint_registrations
+        )
+    
+    def _analyze_source_in_process(self, source_code: str, file_path: Optional[str],
+                                   line_count: int) -> ModuleInfo:
+        """
+        Анализ исходного кода в пуле процессов с ограничением времени
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = self._extract_class_info(node, source_code)
-                info['classes'].append(class_info)
-            
-            elif isinstance(node, ast.FunctionDef):
-                func_info = self._extract_function_info(node, source_code)
-                info['functions'].append(func_info)
+        В процессе пула лимит применяется сигналом, как в главном потоке.
+        Если процесс не ответил за parse_timeout с запасом (завис в
+        ast.parse), файл считается пропущенным, а пул заменяется новым.
+        """
+        with self._pool_slots:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self._pool_size,
+                                                     mp_context=process_pool_context(),
+                                                     initializer=_init_worker, initargs=(self,))
+                pool = self._pool
+            future = pool.submit(_analyze_source_worker, source_code, file_path)
+            try:
+                return future.result(timeout=self.parse_timeout + _PROCESS_TIMEOUT_GRACE)
+            except FutureTimeoutError:
+                with self._pool_lock:
+                    if self._pool is pool:
+                        self._pool = None
+                # Зависший процесс завершится после разбора файла
+                pool.shutdown(wait=False)
+                return ModuleInfo(
+                    file=file_path or 'unknown',
+                    skipped=f'анализ не уложился в {self.parse_timeout} с',
+                    line_count=line_count
+                )
+    
+    def _hash_fragments(self, tree: ast.AST) -> List[Tuple[str, str, int, int, int]]:
+        """Хэши фрагментов для поиска дубликатов (по уже разобранному дереву)"""
+        if self.clone_min_nodes is None:
+            return []
+        try:
+            return hash_fragments(tree, self.clone_min_nodes)
+        except RecursionError:
+            # Слишком глубокое дерево (например, длинная цепочка операторов)
+            return []
+    
+    def analyze_file_info(self, file_path: str) -> ModuleInfo:
+        """
+        Анализ Python файла с результатом в виде компактной модели
+        
+        Args:
+            file_path: Путь к Python файлу
             
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                import_info = self._extract_import_info(node)
-                info['imports'].append(import_info)
+        Returns:
+            ModuleInfo
+        """
+        if self.cache is not None:
+            return ModuleInfo.from_dict(self._analyze_file_cached(file_path))
         
-        return info
+        skipped = self._check_file_size(file_path, os.path.getsize(file_path))
+        if skipped is not None:
+            return skipped
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+        
+        return self.analyze_source_info(source_code, file_path)
     
-    def _extract_class_info(self, node: ast.ClassDef, source_code: str) -> Dict[str, Any]:
-        """Извлечение информации о классе"""
-        methods = []
+    def _extract_class_info(self, node: ast.ClassDef, source_code: str) -> ClassInfo:
+        """Извлечение информации о классе (методы добавляет обход AST)"""
         attributes = []
         
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                method_info = self._extract_function_info(item, source_code)
-                methods.append(method_info)
-            elif isinstance(item, ast.Assign):
+            if isinstance(item, ast.Assign):
                 for target in item.targets:
                     if isinstance(target, ast.Name):
-                        attributes.append(target.id)
+                        attributes.append(intern_name(target.id))
         
         # Получаем базовые классы
-        bases = [self._get_node_name(base) for base in node.bases]
+        bases = [intern_name(self._get_node_name(base)) for base in node.bases]
         
-        return {
-            'name': node.name,
-            'docstring': ast.get_docstring(node),
-            'line_start': node.lineno,
-            'line_end': node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
-            'methods': methods,
-            'attributes': attributes,
-            'bases': bases,
-            'decorators': [self._get_node_name(d) for d in node.decorator_list]
-        }
+        return ClassInfo(
+            name=intern_name(node.name),
+            qualname=intern_name(node.name),
+            docstring=ast.get_docstring(node),
+            line_start=node.lineno,
+            line_end=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+            attributes=attributes,
+            bases=bases,
+            decorators=[intern_name(self._get_node_name(d)) for d in node.decorator_list]
+        )
     
-    def _extract_function_info(self, node: ast.FunctionDef, source_code: str) -> Dict[str, Any]:
+    def _extract_function_info(self, node: ast.FunctionDef, source_code: str) -> FunctionInfo:
         """Извлечение информации о функции"""
-        args = []
-        
-        # Обработка аргументов
-        for arg in node.args.args:
-            try:
-                annotation = None
-                if arg.annotation:
-                    try:
-                        annotation = unparse(arg.annotation)
-                    except Exception:
-                        annotation = str(arg.annotation)
-                
-                arg_info = {
-                    'name': arg.arg,
-                    'annotation': annotation
-                }
-                args.append(arg_info)
-            except Exception as e:
-                # Пропускаем проблемные аргументы
-                print(f"Ошибка при обработке аргумента: {e}")
-                continue
-        
-        # Обработка дефолтных значений
-        defaults = node.args.defaults
-        if defaults and len(defaults) > 0:
-            for i, default in enumerate(defaults):
-                idx = len(args) - len(defaults) + i
-                if idx >= 0 and idx < len(args):
-                    try:
-                        args[idx]['default'] = unparse(default) if default else None
-                    except Exception:
-                        args[idx]['default'] = str(default) if default else None
+        arguments = node.args
+        # Значения по умолчанию относятся к последним из позиционных параметров
+        # (posonlyargs есть в AST с Python 3.8)
+        positional = getattr(arguments, 'posonlyargs', []) + arguments.args
+        defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+        positional = [self._extract_arg_info(arg, default) for arg, default in zip(positional, defaults)]
+        posonly_count = len(positional) - len(arguments.args)
         
         # Возвращаемое значение
         returns = None
@@ -159,31 +546,47 @@ class CodeAnalyzer:
             except Exception:
                 returns = str(node.returns)
         
-        return {
-            'name': node.name,
-            'docstring': ast.get_docstring(node),
-            'args': args,
-            'returns': returns,
-            'line_start': node.lineno,
-            'line_end': node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
-            'decorators': [self._get_node_name(d) for d in node.decorator_list],
-            'is_async': isinstance(node, ast.AsyncFunctionDef)
-        }
+        return FunctionInfo(
+            name=intern_name(node.name),
+            docstring=ast.get_docstring(node),
+            args=positional[posonly_count:],
+            posonlyargs=tuple(positional[:posonly_count]),
+            vararg=self._extract_arg_info(arguments.vararg) if arguments.vararg else None,
+            kwonlyargs=tuple(self._extract_arg_info(arg, default)
+                             for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults)),
+            kwarg=self._extract_arg_info(arguments.kwarg) if arguments.kwarg else None,
+            returns=returns,
+            line_start=node.lineno,
+            line_end=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+            decorators=[intern_name(self._get_node_name(d)) for d in node.decorator_list],
+            is_async=isinstance(node, ast.AsyncFunctionDef)
+        )
+    
+    @staticmethod
+    def _extract_arg_info(arg: ast.arg, default: Optional[ast.AST] = None) -> ArgInfo:
+        """Извлечение информации о параметре функции и его значении по умолчанию"""
+        annotation = None
+        if arg.annotation:
+            try:
+                annotation = unparse(arg.annotation)
+            except Exception:
+                annotation = str(arg.annotation)
+        default_text = None
+        if default is not None:
+            try:
+                default_text = unparse(default)
+            except Exception:
+                default_text = str(default)
+        return ArgInfo(intern_name(arg.arg), annotation, default_text)
     
-    def _extract_import_info(self, node: ast.Import) -> Dict[str, Any]:
+    def _extract_import_info(self, node: ast.Import) -> ImportInfo:
         """Извлечение информации об импортах"""
-        if isinstance(node, ast.Import):
-            names = [alias.name for alias in node.names]
-            return {'type': 'import', 'names': names}
-        elif isinstance(node, ast.ImportFrom):
-            names = [alias.name for alias in node.names]
-            return {
-                'type': 'from',
-                'module': node.module,
-                'names': names,
-                'level': node.level
-            }
-        return {}
+        names = [intern_name(alias.name) for alias in node.names]
+        asnames = ([intern_name(alias.asname) for alias in node.names]
+                   if any(alias.asname for alias in node.names) else [])
+        if isinstance(node, ast.ImportFrom):
+            return ImportInfo('from', names, intern_name(node.module), node.level, asnames)
+        return ImportInfo('import', names, asnames=asnames)
     
     def _get_node_name(self, node: ast.AST) -> str:
         """Получение имени узла AST"""
@@ -199,137 +602,312 @@ class CodeAnalyzer:
             except:
                 return str(node)
     
-    def analyze_directory(self, directory: str, extensions: List[str] = None) -> Dict[str, Any]:
+    def analyze_directory(self, directory: str, extensions: List[str] = None,
+                          workers: Optional[int] = None, chunk_size: int = 32,
+                          exclude: Optional[List[str]] = None,
+                          as_models: bool = False) -> Dict[str, Any]:
         """
         Анализ директории с кодом
         
+        Директории VCS, виртуальных окружений, node_modules, __pycache__ и
+        пути из .gitignore пропускаются без обхода.
+        
         Args:
             directory: Путь к директории
             extensions: Список расширений файлов (по умолчанию ['.py'])
+            workers: Число процессов для параллельного анализа
+                     (None или 1 - последовательный анализ)
+            chunk_size: Число файлов в одной порции задания для процесса
+            exclude: Дополнительные шаблоны исключений в формате .gitignore
+            as_models: Возвращать результаты по файлам в виде ModuleInfo вместо словарей
+                       (словари содержат служебные поля ModuleInfo.to_dict(internal=True))
             
         Returns:
-            Словарь с информацией о всех файлах
+            Словарь с информацией о всех файлах (в порядке обхода директории);
+            ключ 'symbol_index' содержит SymbolIndex по всем файлам проекта,
+            ключ 'call_graph' - CallGraph вызовов между функциями проекта,
+            ключ 'class_graph' - ClassGraph наследования классов проекта,
+            ключ 'module_graph' - ModuleGraph импортов между модулями проекта,
+            ключ 'clone_groups' - группы дублирующегося кода
         """
-        if extensions is None:
-            extensions = ['.py']
-        
         results = {
             'directory': directory,
             'files': [],
-            'summary': {
-                'total_files': 0,
-                'total_classes': 0,
-                'total_functions': 0,
-                'total_lines': 0
-            }
+            'summary': self._empty_summary()
         }
+        file_infos = self.analyze_directory_iter(directory, extensions, workers=workers,
+                                                 chunk_size=chunk_size, exclude=exclude,
+                                                 as_models=as_models)
+        return self._collect_results(results, file_infos, directory)
+    
+    def _collect_results(self, results: Dict[str, Any], file_infos: Iterator[Tuple[Any, Dict[str, int]]],
+                         root: str) -> Dict[str, Any]:
+        """Накопление результатов потокового анализа и построение индексов проекта"""
+        symbol_index = SymbolIndex()
+        
+        for file_info, summary in file_infos:
+            results['files'].append(file_info)
+            results['summary'] = summary
+            symbol_index.add_file(file_info, root)
         
-        path = Path(directory)
-        if not path.exists():
-            return results
+        symbol_index.finalize()
+        results['symbol_index'] = symbol_index
+        results['call_graph'] = CallGraph.build(results['files'], symbol_index)
+        results['class_graph'] = ClassGraph.build(results['files'], symbol_index)
+        results['module_graph'] = ModuleGraph.build(symbol_index)
+        results['clone_groups'] = find_clone_groups(results['files'])
+        return results
+    
+    def analyze_git_revision(self, repo_path: str, revision: str = 'HEAD',
+                             extensions: List[str] = None, exclude: Optional[List[str]] = None,
+                             as_models: bool = False) -> Dict[str, Any]:
+        """
+        Анализ файлов коммита git без checkout и распаковки на диск
         
-        for file_path in path.rglob('*'):
-            if file_path.suffix in extensions and file_path.is_file():
+        Args:
+            repo_path: Путь к репозиторию (рабочая копия или bare)
+            revision: Ветка, тег или SHA коммита
+            extensions: Список расширений файлов (по умолчанию ['.py'])
+            exclude: Дополнительные шаблоны исключений в формате .gitignore
+            as_models: Возвращать результаты по файлам в виде ModuleInfo вместо словарей
+                       (словари содержат служебные поля ModuleInfo.to_dict(internal=True))
+            
+        Returns:
+            Словарь в формате analyze_directory с ключом 'revision' (SHA коммита);
+            пути файлов указываются относительно корня репозитория
+        """
+        commit = resolve_revision(repo_path, revision)
+        results = {
+            'directory': repo_path,
+            'revision': commit,
+            'files': [],
+            'summary': self._empty_summary()
+        }
+        file_infos = self.analyze_git_revision_iter(repo_path, commit, extensions,
+                                                    exclude=exclude, as_models=as_models)
+        return self._collect_results(results, file_infos, '')
+    
+    def analyze_git_revision_iter(self, repo_path: str, revision: str = 'HEAD',
+                                  extensions: List[str] = None, exclude: Optional[List[str]] = None,
+                                  as_models: bool = False) -> Iterator[Tuple[Any, Dict[str, int]]]:
+        """
+        Потоковый анализ файлов коммита git
+        
+        Список файлов берется из 'git ls-tree', содержимое читается в память
+        через один процесс 'git cat-file --batch'. Постоянный кэш ищет
+        результаты по SHA объекта blob, поэтому файлы, не изменившиеся между
+        коммитами, не читаются и не разбираются повторно.
+        
+        Args:
+            repo_path: Путь к репозиторию (рабочая копия или bare)
+            revision: Ветка, тег или SHA коммита
+            extensions: Список расширений файлов (по умолчанию ['.py'])
+            exclude: Дополнительные шаблоны исключений в формате .gitignore
+            as_models: Отдавать результаты в виде ModuleInfo вместо словарей
+                       (словари содержат служебные поля ModuleInfo.to_dict(internal=True))
+            
+        Returns:
+            Итератор пар (информация о файле, сводка на текущий момент)
+        """
+        if extensions is None:
+            extensions = ['.py']
+        
+        entries = {entry.path: entry for entry in list_tree(repo_path, revision)}
+        paths = filter_source_paths(entries, extensions, exclude=exclude)
+        summary = self._empty_summary()
+        
+        with CatFileBatch(repo_path) as batch:
+            for path in paths:
                 try:
-                    file_info = self.analyze_file(str(file_path))
-                    results['files'].append(file_info)
-                    
-                    # Пропускаем файлы с ошибками при подсчете статистики
-                    if 'error' not in file_info:
-                        results['summary']['total_files'] += 1
-                        results['summary']['total_classes'] += len(file_info.get('classes', []))
-                        results['summary']['total_functions'] += len(file_info.get('functions', []))
-                        results['summary']['total_lines'] += file_info.get('line_count', 0)
+                    file_info = self._analyze_blob(batch, entries[path])
                 except Exception as e:
-                    # Добавляем информацию об ошибке
-                    error_info = {
-                        'file': str(file_path),
-                        'error': f'Ошибка при анализе: {str(e)}'
-                    }
-                    results['files'].append(error_info)
+                    file_info = {'file': path, 'error': f'Ошибка при анализе: {str(e)}'}
+                if as_models:
+                    file_info = ModuleInfo.from_dict(file_info)
+                self._update_summary(summary, file_info)
+                yield file_info, summary
+    
+    def _analyze_blob(self, batch: CatFileBatch, entry: GitTreeEntry) -> Dict[str, Any]:
+        """Анализ объекта blob с использованием кэша по его SHA"""
+        if self.max_file_size is not None and entry.size > self.max_file_size:
+            return ModuleInfo(
+                file=entry.path,
+                skipped=f'размер файла {entry.size} байт превышает лимит {self.max_file_size} байт',
+                line_count=batch.count_lines(entry.sha)
+            ).to_dict()
         
-        return results
+        if self.cache is not None:
+            cached = self.cache.get_blob(entry.sha, entry.path)
+            if cached is not None:
+                return cached
+        
+        data = batch.read(entry.sha)
+        source_code = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        info = self.analyze_source_info(source_code, entry.path).to_dict(internal=True)
+        if self.cache is not None and 'skipped' not in info:
+            self.cache.put_blob(entry.sha, info)
+        if 'skipped' not in info:
+            info['content_hash'] = entry.sha
+        return info
     
-    def extract_docstring_sections(self, docstring: Optional[str]) -> Dict[str, str]:
+    def analyze_directory_iter(self, directory: str, extensions: List[str] = None,
+                               workers: Optional[int] = None, chunk_size: int = 32,
+                               exclude: Optional[List[str]] = None, as_models: bool = False
+                               ) -> Iterator[Tuple[Any, Dict[str, int]]]:
         """
-        Извлечение секций из docstring (Google/NumPy стиль)
+        Потоковый анализ директории: результаты отдаются по одному файлу
+        
+        В отличие от analyze_directory результаты не накапливаются, поэтому
+        потребление памяти ограничено анализом одного файла (в параллельном
+        режиме - небольшим окном порций, обрабатываемых процессами).
+        После полного обхода из кэша удаляются записи путей директории,
+        файлов по которым больше нет.
         
         Args:
-            docstring: Docstring для анализа
+            directory: Путь к директории
+            extensions: Список расширений файлов (по умолчанию ['.py'])
+            workers: Число процессов для параллельного анализа
+            chunk_size: Число файлов в одной порции задания для процесса
+            exclude: Дополнительные шаблоны исключений в формате .gitignore
+            as_models: Отдавать результаты в виде ModuleInfo вместо словарей
+                       (меньше памяти и компактнее при передаче между процессами;
+                        словари содержат служебные поля ModuleInfo.to_dict(internal=True))
             
         Returns:
-            Словарь с секциями
+            Итератор пар (информация о файле, сводка на текущий момент);
+            сводка - один и тот же словарь, обновляемый после каждого файла
         """
-        if not docstring:
-            return {}
-        
-        sections = {
-            'description': '',
-            'args': {},
-            'returns': '',
-            'raises': {},
-            'examples': ''
+        if extensions is None:
+            extensions = ['.py']
+        
+        if not os.path.isdir(directory):
+            return
+        
+        summary = self._empty_summary()
+        file_paths = iter_source_files(directory, extensions, exclude=exclude)
+        
+        # Небольшие проекты не стоят запуска пула процессов
+        first_chunk = list(islice(file_paths, chunk_size + 1))
+        if workers and workers > 1 and len(first_chunk) > chunk_size:
+            file_infos = self._iter_parallel(chain(first_chunk, file_paths), workers, chunk_size,
+                                             as_models)
+        else:
+            file_infos = (self._analyze_file_safe(file_path, as_models)
+                          for file_path in chain(first_chunk, file_paths))
+        
+        seen = set()
+        for file_info in file_infos:
+            self._update_summary(summary, file_info)
+            seen.add(record_field(file_info, 'file'))
+            yield file_info, summary
+        
+        # Пути файлов, удаленных из директории с прошлого обхода, больше не нужны в кэше
+        if self.cache is not None:
+            self.cache.forget_paths(directory, keep=seen)
+    
+    def _iter_parallel(self, file_paths: Iterable[str], workers: int,
+                       chunk_size: int, as_models: bool = False) -> Iterator[Any]:
+        """Анализ файлов в пуле процессов с ограниченным числом порций в работе"""
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context(),
+                                 initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            while True:
+                chunk = list(islice(file_paths, chunk_size))
+                if chunk:
+                    pending.append(executor.submit(_analyze_chunk_worker, chunk, as_models))
+                # Результаты отдаются строго в порядке файлов
+                if pending and (not chunk or len(pending) >= workers * 2):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    break
+    
+    @staticmethod
+    def _empty_summary() -> Dict[str, int]:
+        """Пустая сводная статистика"""
+        return {
+            'total_files': 0,
+            'total_classes': 0,
+            'total_functions': 0,
+            'total_lines': 0,
+            'skipped_files': 0
         }
+    
+    def _analyze_file_safe(self, file_path: str, as_models: bool = False) -> Any:
+        """Анализ файла с преобразованием исключений в информацию об ошибке"""
+        try:
+            if as_models:
+                return self.analyze_file_info(file_path)
+            return self._analyze_file_record(file_path)
+        except Exception as e:
+            # Добавляем информацию об ошибке
+            error = f'Ошибка при анализе: {str(e)}'
+            if as_models:
+                return ModuleInfo(file=file_path, error=error)
+            return {
+                'file': file_path,
+                'error': error
+            }
+    
+    @staticmethod
+    def _update_summary(summary: Dict[str, int], file_info: Any):
+        """Учет файла (словаря или ModuleInfo) в сводной статистике"""
+        if isinstance(file_info, ModuleInfo):
+            if file_info.error is not None:
+                return
+            if file_info.skipped is not None:
+                summary['skipped_files'] += 1
+                return
+            classes, functions, line_count = file_info.classes, file_info.functions, file_info.line_count
+        else:
+            # Пропускаем файлы с ошибками при подсчете статистики
+            if 'error' in file_info:
+                return
+            if 'skipped' in file_info:
+                summary['skipped_files'] += 1
+                return
+            classes = file_info.get('classes', [])
+            functions = file_info.get('functions', [])
+            line_count = file_info.get('line_count', 0)
+        
+        summary['total_files'] += 1
+        summary['total_classes'] += len(classes)
+        summary['total_functions'] += len(functions)
+        summary['total_lines'] += line_count
+    
+    def extract_docstring_sections(self, docstring: Optional[str]) -> Dict[str, Any]:
+        """
+        Извлечение секций из docstring (Google, NumPy или Sphinx/reST стиль)
         
-        lines = docstring.split('\n')
-        current_section = 'description'
-        current_content = []
+        Результат кэшируется по хэшу текста docstring и разделяется между
+        вызовами, поэтому изменять его нельзя.
         
-        for line in lines:
-            line = line.strip()
+        Args:
+            docstring: Docstring для анализа
             
-            # Определяем секции
-            if line.lower().startswith('args:'):
-                if current_section == 'description':
-                    sections['description'] = '\n'.join(current_content).strip()
-                current_section = 'args'
-                current_content = []
-            elif line.lower().startswith('returns:'):
-                if current_section == 'args':
-                    sections['args'] = self._parse_args_section('\n'.join(current_content))
-                current_section = 'returns'
-                current_content = []
-            elif line.lower().startswith('raises:'):
-                if current_section == 'returns':
-                    sections['returns'] = '\n'.join(current_content).strip()
-                current_section = 'raises'
-                current_content = []
-            elif line.lower().startswith('example'):
-                if current_section == 'raises':
-                    sections['raises'] = self._parse_raises_section('\n'.join(current_content))
-                current_section = 'examples'
-                current_content = []
-            else:
-                current_content.append(line)
-        
-        # Сохраняем последнюю секцию
-        if current_section == 'description':
-            sections['description'] = '\n'.join(current_content).strip()
-        elif current_section == 'returns':
-            sections['returns'] = '\n'.join(current_content).strip()
-        elif current_section == 'examples':
-            sections['examples'] = '\n'.join(current_content).strip()
-        
-        return sections
-    
-    def _parse_args_section(self, content: str) -> Dict[str, str]:
-        """Парсинг секции Args"""
-        args = {}
-        lines = content.split('\n')
-        current_arg = None
-        
-        for line in lines:
-            line = line.strip()
-            if ':' in line:
-                parts = line.split(':', 1)
-                current_arg = parts[0].strip()
-                args[current_arg] = parts[1].strip() if len(parts) > 1 else ''
-            elif current_arg and line:
-                args[current_arg] += ' ' + line
-        
-        return args
-    
-    def _parse_raises_section(self, content: str) -> Dict[str, str]:
-        """Парсинг секции Raises"""
-        return self._parse_args_section(content)  # Аналогично Args
+        Returns:
+            Словарь с секциями
+        """
+        return parse_docstring(docstring)
+
+
+# Анализатор процесса пула (задается инициализатором ProcessPoolExecutor)
+_worker_analyzer: Optional[CodeAnalyzer] = None
+# Процесс пула анализирует файлы сам, не создавая вложенных пулов
+_in_worker_process = False
+
+
+def _init_worker(analyzer: CodeAnalyzer):
+    """Инициализация процесса пула копией настроенного анализатора"""
+    global _worker_analyzer, _in_worker_process
+    _worker_analyzer = analyzer
+    _in_worker_process = True
+
+
+def _analyze_source_worker(source_code: str, file_path: Optional[str]) -> ModuleInfo:
+    """Анализ исходного кода в процессе пула"""
+    return _worker_analyzer.analyze_source_info(source_code, file_path)
+
 
+def _analyze_chunk_worker(file_paths: List[str], as_models: bool = False) -> List[Any]:
+    """Анализ порции файлов в процессе пула"""
+    return [_worker_analyzer._analyze_file_safe(file_path, as_models) for file_path in file_paths]
@@ -2,11 +2,15 @@
 Генератор документации для баз данных
 """
 
+import io
 import re
-from typing import Dict, List, Any, Optional
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, TextIO, Tuple
 from sqlalchemy import inspect, create_engine, MetaData, Table
 from sqlalchemy.engine import Engine
 
+from .graph_utils import build_adjacency, partition_graph
+
 
 class DBDocGenerator:
     """Генератор документации для баз данных"""
@@ -86,46 +90,157 @@ class DBDocGenerator:
             ]
         }
     
-    def generate_er_diagram_mermaid(self, db_info: Dict[str, Any]) -> str:
+    def generate_er_diagram_mermaid(self, db_info: Dict[str, Any],
+                                    table_names: Optional[Iterable[str]] = None) -> str:
         """
         Генерация ER-диаграммы в формате Mermaid
         
+        Для больших схем лучше использовать generate_er_diagrams_mermaid
+        (разбиение на части) или generate_er_focus_mermaid (окрестность таблиц).
+        
         Args:
             db_info: Информация о БД
+            table_names: Выводимые таблицы (по умолчанию все)
             
         Returns:
             Mermaid диаграмма
         """
-        mermaid = "erDiagram\n"
+        buffer = io.StringIO()
+        self.write_er_diagram_mermaid(db_info, buffer, table_names)
+        return buffer.getvalue()
+    
+    def write_er_diagram_mermaid(self, db_info: Dict[str, Any], out: TextIO,
+                                 table_names: Optional[Iterable[str]] = None,
+                                 include_external: bool = True):
+        """
+        Запись ER-диаграммы в формате Mermaid в поток
         
-        # Определяем связи
-        relationships = []
+        Связь рисуется от таблицы, на которую ссылается внешний ключ, к таблице
+        с ключом; для составного ключа в подписи перечисляются все столбцы.
+        
+        Args:
+            db_info: Информация о БД
+            out: Текстовый поток для записи
+            table_names: Выводимые таблицы (по умолчанию все)
+            include_external: Выводить связи с таблицами вне table_names
+                              (такие таблицы показываются без столбцов)
+        """
+        tables = db_info['tables']
+        if table_names is not None:
+            selected = set(table_names)
+            tables = [table for table in tables if table['name'] in selected]
+        self._write_er_tables(tables, out, include_external)
+    
+    def _write_er_tables(self, tables: List[Dict[str, Any]], out: TextIO,
+                         include_external: bool = True):
+        """Запись ER-диаграммы только по переданным таблицам (без просмотра всей схемы)"""
+        selected = {table['name'] for table in tables}
+        out.write("erDiagram\n")
         
-        for table in db_info['tables']:
+        relationships = []
+        for table in tables:
             table_name = table['name']
-            mermaid += f"    {table_name} {{\n"
-            
+            primary_keys = set(table.get('primary_keys') or [])
+            foreign_columns = {column for fk in table['foreign_keys']
+                               for column in fk['constrained_columns']}
+            out.write(f"    {table_name} {{\n")
             for col in table['columns']:
                 col_type = self._simplify_type(col['type'])
-                pk_marker = " PK" if col['primary_key'] else ""
-                mermaid += f"        {col_type} {col['name']}{pk_marker}\n"
-            
-            mermaid += "    }\n\n"
+                keys = []
+                if col['primary_key'] or col['name'] in primary_keys:
+                    keys.append('PK')
+                if col['name'] in foreign_columns:
+                    keys.append('FK')
+                key_marker = f" {', '.join(keys)}" if keys else ""
+                out.write(f"        {col_type} {col['name']}{key_marker}\n")
+            out.write("    }\n\n")
             
-            # Собираем связи
             for fk in table['foreign_keys']:
-                relationships.append({
-                    'from': table_name,
-                    'to': fk['referred_table'],
-                    'from_col': fk['constrained_columns'][0] if fk['constrained_columns'] else '',
-                    'to_col': fk['referred_columns'][0] if fk['referred_columns'] else ''
-                })
+                referred = fk['referred_table']
+                if referred not in selected and not include_external:
+                    continue
+                relationships.append((referred, table_name, ', '.join(fk['constrained_columns']),
+                                      ', '.join(fk['referred_columns'])))
         
-        # Добавляем связи
-        for rel in relationships:
-            mermaid += f"    {rel['from']} ||--o{{ {rel['to']} : \"{rel['from_col']} -> {rel['to_col']}\"\n"
+        for referred, table_name, from_columns, to_columns in relationships:
+            out.write(f"    {referred} ||--o{{ {table_name} : \"{from_columns} -> {to_columns}\"\n")
+    
+    def generate_er_diagrams_mermaid(self, db_info: Dict[str, Any],
+                                     max_tables: int = 50) -> List[str]:
+        """
+        Генерация ER-диаграмм схемы, разбитой на части по связям внешних ключей
+        
+        Таблицы, связанные внешними ключами, по возможности попадают в одну
+        диаграмму (см. graph_utils.partition_graph), несвязанные небольшие
+        группы объединяются. Связь с таблицей из другой части выводится в
+        диаграмме таблицы с ключом, а таблица показывается без столбцов.
         
-        return mermaid
+        Args:
+            db_info: Информация о БД
+            max_tables: Максимальное число таблиц в одной диаграмме
+            
+        Returns:
+            Список Mermaid диаграмм
+        """
+        # Номер вершины графа - позиция таблицы в db_info['tables'], поэтому
+        # каждая часть получает свои таблицы напрямую: общая работа линейна
+        tables = db_info['tables']
+        names, sources, targets = self._foreign_key_graph(db_info)
+        diagrams = []
+        for part in partition_graph(len(names), sources, targets, max_tables):
+            buffer = io.StringIO()
+            self._write_er_tables([tables[node] for node in sorted(part)], buffer)
+            diagrams.append(buffer.getvalue())
+        return diagrams
+    
+    def generate_er_focus_mermaid(self, db_info: Dict[str, Any], tables: Iterable[str],
+                                  hops: int = 1) -> str:
+        """
+        Генерация ER-диаграммы окрестности выбранных таблиц
+        
+        Args:
+            db_info: Информация о БД
+            tables: Имена выбранных таблиц
+            hops: Радиус окрестности в связях внешних ключей (в обе стороны)
+            
+        Returns:
+            Mermaid диаграмма выбранных таблиц и таблиц не дальше hops связей от них
+        """
+        names, sources, targets = self._foreign_key_graph(db_info)
+        ids = {name: node for node, name in enumerate(names)}
+        offsets, neighbors = build_adjacency(len(names), list(sources) + list(targets),
+                                             list(targets) + list(sources))
+        
+        frontier = [ids[name] for name in tables if name in ids]
+        seen = set(frontier)
+        for _ in range(hops):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        
+        buffer = io.StringIO()
+        self._write_er_tables([db_info['tables'][node] for node in sorted(seen)], buffer,
+                              include_external=False)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _foreign_key_graph(db_info: Dict[str, Any]) -> Tuple[List[str], array, array]:
+        """Граф внешних ключей: имена таблиц и ребра (таблица с ключом -> таблица, на которую он ссылается)"""
+        names = [table['name'] for table in db_info['tables']]
+        ids = {name: node for node, name in enumerate(names)}
+        sources = array('I')
+        targets = array('I')
+        for node, table in enumerate(db_info['tables']):
+            for fk in table['foreign_keys']:
+                referred = ids.get(fk['referred_table'])
+                if referred is not None and referred != node:
+                    sources.append(node)
+                    targets.append(referred)
+        return names, sources, targets
     
     def _simplify_type(self, db_type: str) -> str:
         """Упрощение типа данных для диаграммы"""
@@ -177,7 +292,8 @@ class DBDocGenerator:
             if table.get('foreign_keys'):
                 md += "**Foreign Keys:**\n\n"
                 for fk in table['foreign_keys']:
-                    md += f"- `{fk['name']}`: "
+                    fk_name = fk.get('name') or f"fk_{table['name']}_{'_'.join(fk['constrained_columns'])}"
+                    md += f"- `{fk_name}`: "
                     md += f"{', '.join(fk['constrained_columns'])} -> "
                     md += f"{fk['referred_table']}({', '.join(fk['referred_columns'])})\n"
                 md += "\n"
@@ -201,14 +317,15 @@ class DBDocGenerator:
         
         tables = []
         
-        # Поиск CREATE TABLE
-        create_table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*?)\)'
+        # Поиск CREATE TABLE; тело таблицы - до парной закрывающей скобки,
+        # так как внутри встречаются VARCHAR(255) и составные ключи (a, b)
+        create_table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\('
         
-        matches = re.finditer(create_table_pattern, sql_content, re.IGNORECASE | re.DOTALL)
+        matches = re.finditer(create_table_pattern, sql_content, re.IGNORECASE)
         
         for match in matches:
             table_name = match.group(1)
-            table_body = match.group(2)
+            table_body = self._balanced_body(sql_content, match.end())
             
             columns = self._parse_table_columns(table_body)
             primary_keys = self._extract_primary_keys(table_body)
@@ -229,11 +346,10 @@ class DBDocGenerator:
     def _parse_table_columns(self, table_body: str) -> List[Dict[str, Any]]:
         """Парсинг колонок из SQL"""
         columns = []
-        lines = table_body.split(',')
         
-        for line in lines:
+        for line in self._split_definitions(table_body):
             line = line.strip()
-            if not line or line.startswith('PRIMARY') or line.startswith('FOREIGN') or line.startswith('UNIQUE'):
+            if not line or line.upper().startswith(('PRIMARY', 'FOREIGN', 'UNIQUE', 'CONSTRAINT')):
                 continue
             
             parts = line.split()
@@ -241,6 +357,7 @@ class DBDocGenerator:
                 col_name = parts[0].strip('`')
                 col_type = parts[1] if len(parts) > 1 else 'TEXT'
                 nullable = 'NOT NULL' not in line.upper()
+                primary_key = re.search(r'PRIMARY\s+KEY', line, re.IGNORECASE) is not None
                 default = None
                 
                 if 'DEFAULT' in line.upper():
@@ -253,11 +370,42 @@ class DBDocGenerator:
                     'type': col_type,
                     'nullable': nullable,
                     'default': default,
-                    'primary_key': False
+                    'primary_key': primary_key
                 })
         
         return columns
     
+    @staticmethod
+    def _balanced_body(sql: str, start: int) -> str:
+        """Текст от позиции start до парной закрывающей скобки"""
+        depth = 1
+        for position in range(start, len(sql)):
+            char = sql[position]
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    return sql[start:position]
+        return sql[start:]
+    
+    @staticmethod
+    def _split_definitions(table_body: str) -> List[str]:
+        """Разбиение тела таблицы по запятым вне скобок"""
+        definitions = []
+        depth = 0
+        start = 0
+        for position, char in enumerate(table_body):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                definitions.append(table_body[start:position])
+                start = position + 1
+        definitions.append(table_body[start:])
+        return definitions
+    
     def _extract_primary_keys(self, table_body: str) -> List[str]:
         """Извлечение первичных ключей"""
         pk_match = re.search(r'PRIMARY\s+KEY\s*\(([^)]+)\)', table_body, re.IGNORECASE)
@@ -267,18 +415,19 @@ class DBDocGenerator:
         return []
     
     def _extract_foreign_keys(self, table_body: str) -> List[Dict[str, Any]]:
-        """Извлечение внешних ключей"""
+        """Извлечение внешних ключей (имя - из CONSTRAINT <имя>, если оно указано)"""
         fks = []
-        fk_pattern = r'FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+(\w+)\s*\(([^)]+)\)'
+        fk_pattern = (r'(?:CONSTRAINT\s+`?(\w+)`?\s+)?'
+                      r'FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+`?(\w+)`?\s*\(([^)]+)\)')
         
         matches = re.finditer(fk_pattern, table_body, re.IGNORECASE)
         
         for match in matches:
             fks.append({
-                'constrained_columns': [c.strip().strip('`') for c in match.group(1).split(',')],
-                'referred_table': match.group(2),
-                'referred_columns': [c.strip().strip('`') for c in match.group(3).split(',')]
+                'name': match.group(1),
+                'constrained_columns': [c.strip().strip('`') for c in match.group(2).split(',')],
+                'referred_table': match.group(3),
+                'referred_columns': [c.strip().strip('`') for c in match.group(4).split(',')]
             })
         
         return fks
-
@@ -2,77 +2,217 @@
 Генератор диаграмм для документации
 """
 
-from typing import Dict, List, Any, Optional
+import hashlib
+import json
+import re
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+from .cache import TieredCache
+from .call_graph import CallGraph
+from .class_graph import ClassGraph
 from .code_analyzer import CodeAnalyzer
+from .fragment_cache import DiagramCache
+from .module_graph import ModuleGraph
+from .symbol_index import SymbolIndex
+
+
+# Версия формата диаграмм; меняется при любом изменении вывода,
+# чтобы сбросить постоянный кэш диаграмм
+DIAGRAM_VERSION = '1'
 
 
 class DiagramGenerator:
-    """Генератор различных типов диаграмм"""
+    """
+    Генератор различных типов диаграмм
+    
+    Диаграммы классов и графов кэшируются по хэшу той части анализа, от
+    которой они зависят (классы, базы, методы; вершины и ребра графа), и
+    типу диаграммы: в памяти (LRU) и, при заданном cache_dir, на диске.
+    Повторная загрузка того же кода или неизменившиеся модули проекта
+    получают готовый текст диаграммы без повторного построения.
+    """
     
-    def __init__(self):
-        """Инициализация генератора"""
+    def __init__(self, cache_dir: Optional[str] = None, memory_size: int = 256):
+        """
+        Инициализация генератора
+        
+        Args:
+            cache_dir: Директория постоянного кэша диаграмм (опционально)
+            memory_size: Число диаграмм в кэше в памяти
+        """
         self.analyzer = CodeAnalyzer()
+        store = DiagramCache(cache_dir, DIAGRAM_VERSION) if cache_dir else None
+        self.cache = TieredCache(memory_size, store)
     
-    def generate_class_diagram_mermaid(self, code_info: Dict[str, Any]) -> str:
+    def generate_class_diagram_mermaid(self, code_info: Dict[str, Any],
+                                       symbol_index: Optional[SymbolIndex] = None,
+                                       module: Optional[str] = None) -> str:
         """
         Генерация диаграммы классов в формате Mermaid
         
         Args:
             code_info: Информация о коде
+            symbol_index: Индекс символов проекта для разрешения базовых классов
+                          из других файлов (опционально)
+            module: Имя модуля файла в индексе (по умолчанию определяется по пути)
             
         Returns:
             Mermaid диаграмма
         """
-        mermaid = "classDiagram\n"
+        if symbol_index is not None and module is None:
+            module = symbol_index.module_of(code_info.get('file')) or ''
         
-        classes = code_info.get('classes', [])
-        if not classes:
-            return mermaid + "    class Empty { }\n"
+        if not code_info.get('classes', []):
+            return "classDiagram\n    class Empty { }\n"
         
-        for cls in classes:
+        # Часть анализа, от которой зависит диаграмма:
+        # [имя, атрибуты, [[метод, [аргументы]]], [[база, модуль внешней базы или None]]]
+        classes = []
+        for cls in code_info['classes']:
             if not isinstance(cls, dict) or 'name' not in cls:
                 continue
-            class_name = cls.get('name', 'Unknown')
             
-            # Добавляем атрибуты
-            attributes = []
-            for attr in cls.get('attributes', []):
-                attributes.append(f"  +{attr}")
-            
-            # Добавляем методы
             methods = []
             for method in cls.get('methods', []):
                 try:
-                    method_name = method.get('name', 'unknown')
                     args_list = method.get('args', [])
-                    args = ', '.join([arg.get('name', '') for arg in args_list if isinstance(arg, dict)])
-                    methods.append(f"  +{method_name}({args})")
+                    methods.append([method.get('name', 'unknown'),
+                                    [arg.get('name', '') for arg in args_list if isinstance(arg, dict)]])
                 except Exception:
                     # Пропускаем методы с ошибками
                     continue
             
+            bases = []
+            for base in cls.get('bases', []):
+                base_name = base.split('.')[-1]  # Убираем модуль, оставляем только имя класса
+                base_module = None
+                if symbol_index is not None:
+                    resolved = symbol_index.resolve(base, module)
+                    definition = symbol_index.definitions.get(resolved) if resolved else None
+                    if definition and definition['kind'] == 'class' and definition['module'] != module:
+                        base_name = definition['name']
+                        base_module = definition['module']
+                bases.append([base_name, base_module])
+            
+            classes.append([cls.get('name', 'Unknown'), list(cls.get('attributes', [])), methods, bases])
+        
+        return self._cached('class_mermaid', [classes],
+                            lambda: self._build_class_diagram_mermaid(classes))
+    
+    @staticmethod
+    def _build_class_diagram_mermaid(classes: List[List[Any]]) -> str:
+        """Построение текста диаграммы классов файла (см. generate_class_diagram_mermaid)"""
+        mermaid = "classDiagram\n"
+        
+        # Базовые классы из других модулей проекта: короткое имя -> модуль
+        external_bases = {}
+        
+        for class_name, attributes, methods, bases in classes:
             mermaid += f"    class {class_name} {{\n"
             if attributes:
-                mermaid += "\n".join(attributes) + "\n"
+                mermaid += "\n".join(f"  +{attr}" for attr in attributes) + "\n"
             if methods:
-                mermaid += "\n".join(methods) + "\n"
+                mermaid += "\n".join(f"  +{name}({', '.join(args)})" for name, args in methods) + "\n"
             mermaid += "    }\n\n"
             
             # Добавляем наследование
-            for base in cls.get('bases', []):
-                base_name = base.split('.')[-1]  # Убираем модуль, оставляем только имя класса
+            for base_name, base_module in bases:
+                if base_module is not None:
+                    external_bases[base_name] = base_module
                 mermaid += f"    {base_name} <|-- {class_name}\n"
         
+        # Классы из других модулей помечаются именем своего модуля
+        for base_name, base_module in external_bases.items():
+            mermaid += f"    class {base_name} {{\n        <<{base_module}>>\n    }}\n"
+        
         return mermaid
     
+    def generate_project_class_diagrams_mermaid(self, class_graph: ClassGraph,
+                                                max_classes: int = 40,
+                                                show_members: bool = True) -> List[str]:
+        """
+        Генерация диаграмм классов всего проекта в формате Mermaid
+        
+        Наследование между модулями разрешено через индекс символов, каждый
+        класс выводится один раз. Граф разбивается на части не больше
+        max_classes классов (см. ClassGraph.clusters), чтобы каждая
+        диаграмма укладывалась в ограничения размера рендерера Mermaid.
+        
+        Args:
+            class_graph: Граф наследования (CodeAnalyzer.analyze_directory()['class_graph'])
+            max_classes: Максимальное число классов проекта в одной диаграмме
+            show_members: Выводить атрибуты и методы классов
+            
+        Returns:
+            Список Mermaid диаграмм
+        """
+        parts = [class_graph.nodes, class_graph.sources.tobytes(), class_graph.targets.tobytes(),
+                 class_graph.classes, class_graph.external_bases, max_classes, show_members]
+        diagrams = self._cached(
+            'project_class_mermaid', parts,
+            lambda: json.dumps(self._build_project_class_diagrams(class_graph, max_classes,
+                                                                  show_members)))
+        return json.loads(diagrams)
+    
+    @staticmethod
+    def _build_project_class_diagrams(class_graph: ClassGraph, max_classes: int,
+                                      show_members: bool) -> List[str]:
+        """Построение диаграмм классов проекта (см. generate_project_class_diagrams_mermaid)"""
+        bases_of: Dict[int, List[int]] = {}
+        for source, target in zip(class_graph.sources, class_graph.targets):
+            bases_of.setdefault(target, []).append(source)
+        
+        diagrams = []
+        for part in class_graph.clusters(max_classes):
+            in_part = set(part)
+            # Базовые классы из других частей выводятся заглушками
+            stubs = [base for node in part for base in bases_of.get(node, ()) if base not in in_part]
+            stubs = list(dict.fromkeys(stubs))
+            
+            # Короткие имена, а при совпадении в одной диаграмме - полные
+            names = {}
+            short_counts: Dict[str, int] = {}
+            for node in part + stubs:
+                short = class_graph.nodes[node].rsplit('.', 1)[-1]
+                short_counts[short] = short_counts.get(short, 0) + 1
+            for node in part + stubs:
+                short = class_graph.nodes[node].rsplit('.', 1)[-1]
+                names[node] = short if short_counts[short] == 1 else _node_id(class_graph.nodes[node])
+            
+            lines = ["classDiagram"]
+            for node in part:
+                info = class_graph.classes.get(node, {})
+                lines.append(f"    class {names[node]} {{")
+                lines.append(f"        <<{info.get('module') or 'main'}>>")
+                if show_members:
+                    lines.extend(f"      +{attr}" for attr in info.get('attributes', []))
+                    lines.extend(f"      +{method}" for method in info.get('methods', []))
+                lines.append("    }")
+            for node in stubs:
+                info = class_graph.classes.get(node, {})
+                lines.append(f"    class {names[node]} {{")
+                lines.append(f"        <<{info.get('module') or 'main'}>>")
+                lines.append("    }")
+            
+            for node in part:
+                for base in bases_of.get(node, ()):
+                    lines.append(f"    {names[base]} <|-- {names[node]}")
+                for base_name in class_graph.external_bases.get(node, ()):
+                    # Внешняя база не должна совпасть по имени с классом проекта
+                    base_id = base_name if base_name not in short_counts else f"ext_{base_name}"
+                    lines.append(f"    {base_id} <|-- {names[node]}")
+            diagrams.append("\n".join(lines) + "\n")
+        return diagrams
+    
     def generate_flowchart_mermaid(self, functions: List[Dict[str, Any]], 
                                    connections: Optional[List[Dict[str, str]]] = None) -> str:
         """
         Генерация блок-схемы в формате Mermaid
         
         Args:
-            functions: Список функций
-            connections: Список связей между функциями
+            functions: Список функций (ключ 'id' задает идентификатор узла,
+                       по умолчанию он строится из 'name')
+            connections: Список связей между функциями ('from'/'to' - идентификаторы
+                         или имена функций)
             
         Returns:
             Mermaid диаграмма
@@ -82,18 +222,121 @@ class DiagramGenerator:
         # Создаем узлы для функций
         for func in functions:
             func_name = func['name']
-            func_id = func_name.replace(' ', '_').replace('-', '_')
+            func_id = _node_id(func.get('id', func_name))
             mermaid += f"    {func_id}[\"{func_name}\"]\n"
         
         # Добавляем связи
         if connections:
             for conn in connections:
-                from_id = conn['from'].replace(' ', '_').replace('-', '_')
-                to_id = conn['to'].replace(' ', '_').replace('-', '_')
+                from_id = _node_id(conn['from'])
+                to_id = _node_id(conn['to'])
                 mermaid += f"    {from_id} --> {to_id}\n"
         
         return mermaid
     
+    def generate_call_graph_mermaid(self, call_graph: CallGraph, collapse_cycles: bool = True,
+                                    max_names: int = 3) -> str:
+        """
+        Генерация блок-схемы графа вызовов в формате Mermaid
+        
+        Args:
+            call_graph: Граф вызовов (CodeAnalyzer.analyze_directory()['call_graph'])
+            collapse_cycles: Объединять взаимно рекурсивные функции в один узел
+            max_names: Сколько имен показывать в подписи объединенного узла
+            
+        Returns:
+            Mermaid диаграмма
+        """
+        parts = [call_graph.nodes, call_graph.sources.tobytes(), call_graph.targets.tobytes(),
+                 collapse_cycles, max_names]
+        return self._cached('call_graph_mermaid', parts,
+                            lambda: self._build_call_graph_mermaid(call_graph, collapse_cycles, max_names))
+    
+    def _build_call_graph_mermaid(self, call_graph: CallGraph, collapse_cycles: bool,
+                                  max_names: int) -> str:
+        """Построение блок-схемы графа вызовов (см. generate_call_graph_mermaid)"""
+        if not collapse_cycles:
+            functions = [{'id': f"f{node}", 'name': name} for node, name in enumerate(call_graph.nodes)]
+            connections = [{'from': f"f{source}", 'to': f"f{target}"}
+                           for source, target in zip(call_graph.sources, call_graph.targets)]
+            return self.generate_flowchart_mermaid(functions, connections)
+        
+        groups, edges = call_graph.condensed()
+        functions = [{'id': f"c{index}", 'name': _group_label(names, max_names)}
+                     for index, names in enumerate(groups)]
+        connections = [{'from': f"c{source}", 'to': f"c{target}"} for source, target in edges]
+        return self.generate_flowchart_mermaid(functions, connections)
+    
+    def generate_module_graph_mermaid(self, module_graph: ModuleGraph, reduce: bool = True,
+                                      max_names: int = 3) -> str:
+        """
+        Генерация диаграммы зависимостей модулей в формате Mermaid
+        
+        Args:
+            module_graph: Граф импортов (CodeAnalyzer.analyze_directory()['module_graph'])
+            reduce: Сжимать циклы импортов в один узел и убирать транзитивные ребра
+            max_names: Сколько имен показывать в подписи узла цикла
+            
+        Returns:
+            Mermaid диаграмма (ребро importer --> imported)
+        """
+        return self._cached('module_graph_mermaid', self._module_graph_parts(module_graph, reduce, max_names),
+                            lambda: self._build_module_graph_mermaid(module_graph, reduce, max_names))
+    
+    def _build_module_graph_mermaid(self, module_graph: ModuleGraph, reduce: bool,
+                                    max_names: int) -> str:
+        """Построение диаграммы зависимостей модулей (см. generate_module_graph_mermaid)"""
+        groups, edges = self._module_graph_edges(module_graph, reduce)
+        modules = [{'id': f"m{index}", 'name': _group_label(names, max_names)}
+                   for index, names in enumerate(groups)]
+        connections = [{'from': f"m{source}", 'to': f"m{target}"} for source, target in edges]
+        return self.generate_flowchart_mermaid(modules, connections)
+    
+    def generate_module_graph_plantuml(self, module_graph: ModuleGraph, reduce: bool = True,
+                                       max_names: int = 3) -> str:
+        """
+        Генерация диаграммы зависимостей модулей в формате PlantUML
+        
+        Args:
+            module_graph: Граф импортов (CodeAnalyzer.analyze_directory()['module_graph'])
+            reduce: Сжимать циклы импортов в один узел и убирать транзитивные ребра
+            max_names: Сколько имен показывать в подписи узла цикла
+            
+        Returns:
+            PlantUML диаграмма
+        """
+        return self._cached('module_graph_plantuml', self._module_graph_parts(module_graph, reduce, max_names),
+                            lambda: self._build_module_graph_plantuml(module_graph, reduce, max_names))
+    
+    def _build_module_graph_plantuml(self, module_graph: ModuleGraph, reduce: bool,
+                                     max_names: int) -> str:
+        """Построение диаграммы зависимостей модулей (см. generate_module_graph_plantuml)"""
+        groups, edges = self._module_graph_edges(module_graph, reduce)
+        plantuml = "@startuml\n"
+        for index, names in enumerate(groups):
+            label = _group_label(names, max_names).replace('"', "'")
+            color = " #FFCCCC" if len(names) > 1 else ""
+            plantuml += f'component "{label}" as m{index}{color}\n'
+        for source, target in edges:
+            plantuml += f"m{source} --> m{target}\n"
+        plantuml += "@enduml\n"
+        return plantuml
+    
+    @staticmethod
+    def _module_graph_parts(module_graph: ModuleGraph, reduce: bool, max_names: int) -> List[Any]:
+        """Данные графа модулей для ключа кэша"""
+        return [module_graph.nodes, module_graph.sources.tobytes(), module_graph.targets.tobytes(),
+                reduce, max_names]
+    
+    @staticmethod
+    def _module_graph_edges(module_graph: ModuleGraph,
+                            reduce: bool) -> Tuple[List[List[str]], List[Tuple[int, int]]]:
+        """Группы модулей и ребра для диаграммы зависимостей"""
+        if reduce:
+            return module_graph.reduced()
+        groups = [[name] for name in module_graph.nodes]
+        return groups, list(zip(module_graph.sources, module_graph.targets))
+    
     def generate_sequence_diagram_mermaid(self, interactions: List[Dict[str, Any]]) -> str:
         """
         Генерация диаграммы последовательности в формате Mermaid
@@ -201,29 +444,74 @@ class DiagramGenerator:
         Returns:
             PlantUML диаграмма
         """
+        # [имя, атрибуты, [[метод, [аргументы]]], [базы]]
+        classes = [
+            [cls['name'], list(cls.get('attributes', [])),
+             [[method['name'], [arg['name'] for arg in method.get('args', [])]]
+              for method in cls.get('methods', [])],
+             [base.split('.')[-1] for base in cls.get('bases', [])]]
+            for cls in code_info.get('classes', [])
+        ]
+        return self._cached('class_plantuml', [classes],
+                            lambda: self._build_plantuml_class_diagram(classes))
+    
+    @staticmethod
+    def _build_plantuml_class_diagram(classes: List[List[Any]]) -> str:
+        """Построение текста диаграммы классов PlantUML (см. generate_plantuml_class_diagram)"""
         plantuml = "@startuml\n"
         
-        for cls in code_info.get('classes', []):
-            class_name = cls['name']
+        for class_name, attributes, methods, bases in classes:
             plantuml += f"class {class_name} {{\n"
             
             # Атрибуты
-            for attr in cls.get('attributes', []):
+            for attr in attributes:
                 plantuml += f"  + {attr}\n"
             
             # Методы
-            for method in cls.get('methods', []):
-                method_name = method['name']
-                args = ', '.join([arg['name'] for arg in method.get('args', [])])
-                plantuml += f"  + {method_name}({args})\n"
+            for method_name, args in methods:
+                plantuml += f"  + {method_name}({', '.join(args)})\n"
             
             plantuml += "}\n\n"
             
             # Наследование
-            for base in cls.get('bases', []):
-                base_name = base.split('.')[-1]
+            for base_name in bases:
                 plantuml += f"{base_name} <|-- {class_name}\n"
         
         plantuml += "@enduml\n"
         return plantuml
+    
+    def _cached(self, kind: str, parts: Iterable[Any], build: Callable[[], str]) -> str:
+        """
+        Диаграмма из кэша или ее построение
+        
+        Args:
+            kind: Тип диаграммы (входит в ключ)
+            parts: Данные, от которых зависит диаграмма: bytes или JSON-совместимые значения
+            build: Функция построения текста диаграммы
+            
+        Returns:
+            Текст диаграммы
+        """
+        digest = hashlib.blake2b(kind.encode(), digest_size=16)
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = json.dumps(part, ensure_ascii=False, sort_keys=True).encode('utf-8', 'surrogatepass')
+            # Длина перед данными, чтобы границы частей не смешивались
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return self.cache.get_or_create(digest.hexdigest(), build)
+
+
+def _group_label(names: List[str], max_names: int) -> str:
+    """Подпись узла из одного или нескольких имен (несколько имен - цикл)"""
+    label = ', '.join(name or '__init__' for name in names[:max_names])
+    if len(names) > max_names:
+        label += f" (+{len(names) - max_names})"
+    if len(names) > 1:
+        label = f"цикл: {label}"
+    return label
+
 
+def _node_id(name: str) -> str:
+    """Идентификатор узла Mermaid (только буквы, цифры и '_')"""
+    return re.sub(r'\W', '_', name)
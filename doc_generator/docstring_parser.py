@@ -0,0 +1,254 @@
+"""
+Разбор docstring в стилях Google, NumPy и Sphinx/reST
+"""
+
+import hashlib
+import inspect
+import re
+import textwrap
+from typing import Dict, List, Any, Optional, Tuple
+
+from .cache import LRUCache
+
+
+# Канонические секции и их варианты написания
+SECTION_ALIASES = {
+    'args': 'args',
+    'arguments': 'args',
+    'parameters': 'args',
+    'params': 'args',
+    'keyword args': 'args',
+    'keyword arguments': 'args',
+    'other parameters': 'args',
+    'returns': 'returns',
+    'return': 'returns',
+    'yields': 'returns',
+    'yield': 'returns',
+    'raises': 'raises',
+    'raise': 'raises',
+    'exceptions': 'raises',
+    'example': 'examples',
+    'examples': 'examples',
+}
+
+# Прочие распознаваемые секции (сохраняются в 'other' под своим заголовком)
+OTHER_SECTIONS = {
+    'attributes', 'note', 'notes', 'see also', 'warning', 'warnings',
+    'todo', 'references', 'methods'
+}
+
+_GOOGLE_HEADER = re.compile(r'^([A-Za-z][A-Za-z ]*?)\s*:\s*(.*)$')
+_NUMPY_UNDERLINE = re.compile(r'^\s*-{3,}\s*$')
+_REST_FIELD = re.compile(r'^:(\w+)(?:\s+([^:]+))?:\s*(.*)$')
+_GOOGLE_ITEM = re.compile(r'^(\*{0,2}[\w.]+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$')
+_NUMPY_ITEM = re.compile(r'^(\*{0,2}[\w., *]+?)\s*(?::\s*(.*))?$')
+
+# Разобранные docstring (ключ - хэш текста)
+_parse_cache = LRUCache(maxsize=4096)
+
+
+def parse_docstring(docstring: Optional[str]) -> Dict[str, Any]:
+    """
+    Разбор docstring с кэшированием результата
+
+    Результат разделяется между вызовами, поэтому его нельзя изменять.
+
+    Args:
+        docstring: Текст docstring
+
+    Returns:
+        Словарь с ключами description, args, returns, raises, examples,
+        other (прочие секции) и style; пустой словарь для пустого docstring
+    """
+    if not docstring:
+        return {}
+
+    key = hashlib.blake2b(docstring.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return _parse_cache.get_or_create(key, lambda: _parse(docstring))
+
+
+def detect_style(docstring: str) -> str:
+    """Определение стиля docstring: 'rest', 'numpy' или 'google'"""
+    if re.search(r'^\s*:(param|parameter|arg|returns?|raises?|type|rtype)\b', docstring, re.MULTILINE):
+        return 'rest'
+
+    lines = docstring.splitlines()
+    for i in range(len(lines) - 1):
+        if lines[i].strip().lower() in SECTION_ALIASES and _NUMPY_UNDERLINE.match(lines[i + 1]):
+            return 'numpy'
+
+    return 'google'
+
+
+def _parse(docstring: str) -> Dict[str, Any]:
+    """Разбор без кэширования"""
+    docstring = inspect.cleandoc(docstring)
+    style = detect_style(docstring)
+
+    if style == 'rest':
+        sections = _parse_rest(docstring.splitlines())
+    else:
+        if style == 'numpy':
+            blocks = _split_numpy(docstring.splitlines())
+        else:
+            blocks = _split_google(docstring.splitlines())
+        sections = _build_sections(blocks, style)
+
+    sections['style'] = style
+    return sections
+
+
+def _empty_sections() -> Dict[str, Any]:
+    return {
+        'description': '',
+        'args': {},
+        'returns': '',
+        'raises': {},
+        'examples': '',
+        'other': {}
+    }
+
+
+def _split_google(lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+    """Разбиение на блоки по заголовкам вида 'Args:' (без отступа)"""
+    blocks = [(None, [])]
+    for line in lines:
+        match = _GOOGLE_HEADER.match(line)
+        if match and not line[:1].isspace():
+            title = match.group(1).strip()
+            if title.lower() in SECTION_ALIASES or title.lower() in OTHER_SECTIONS:
+                inline = match.group(2)
+                blocks.append((title, [inline] if inline else []))
+                continue
+        blocks[-1][1].append(line)
+    return blocks
+
+
+def _split_numpy(lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+    """Разбиение на блоки по заголовкам, подчеркнутым дефисами"""
+    blocks = [(None, [])]
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if i + 1 < len(lines) and line.strip() and _NUMPY_UNDERLINE.match(lines[i + 1]):
+            blocks.append((line.strip(), []))
+            i += 2
+            continue
+        blocks[-1][1].append(line)
+        i += 1
+    return blocks
+
+
+def _build_sections(blocks: List[Tuple[Optional[str], List[str]]], style: str) -> Dict[str, Any]:
+    """Сборка секций из блоков; секции могут идти в любом порядке и повторяться"""
+    sections = _empty_sections()
+    for title, lines in blocks:
+        text = textwrap.dedent('\n'.join(lines)).strip()
+        if title is None:
+            sections['description'] = _join_text(sections['description'], text)
+            continue
+
+        canonical = SECTION_ALIASES.get(title.lower())
+        if canonical in ('args', 'raises'):
+            parse_items = _parse_numpy_items if style == 'numpy' else _parse_google_items
+            sections[canonical].update(parse_items(text.splitlines()))
+        elif canonical == 'returns':
+            text = '\n'.join(line.strip() for line in text.splitlines())
+            sections['returns'] = _join_text(sections['returns'], text)
+        elif canonical == 'examples':
+            sections['examples'] = _join_text(sections['examples'], text)
+        elif text:
+            sections['other'][title] = _join_text(sections['other'].get(title, ''), text)
+    return sections
+
+
+def _join_text(existing: str, text: str) -> str:
+    if existing and text:
+        return f"{existing}\n\n{text}"
+    return existing or text
+
+
+def _parse_google_items(lines: List[str]) -> Dict[str, str]:
+    """Разбор элементов 'name (type): описание' с продолжением на следующих строках"""
+    items = {}
+    current = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = _GOOGLE_ITEM.match(stripped) if not line[:1].isspace() else None
+        if match:
+            current = match.group(1)
+            items[current] = match.group(3).strip()
+        elif current is not None:
+            items[current] = f"{items[current]} {stripped}".strip()
+    return items
+
+
+def _parse_numpy_items(lines: List[str]) -> Dict[str, str]:
+    """Разбор элементов 'name : type' с описанием на строках с отступом"""
+    items = {}
+    current = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not line[:1].isspace():
+            match = _NUMPY_ITEM.match(stripped)
+            names = match.group(1) if match else stripped
+            current = [name.strip() for name in names.split(',') if name.strip()]
+            for name in current:
+                items[name] = ''
+        else:
+            for name in current:
+                items[name] = f"{items[name]} {stripped}".strip()
+    return items
+
+
+def _parse_rest(lines: List[str]) -> Dict[str, Any]:
+    """Разбор полей Sphinx (:param x:, :returns:, :raises E:)"""
+    sections = _empty_sections()
+    description = []
+    current = None  # (секция, ключ)
+
+    for line in lines:
+        match = _REST_FIELD.match(line.strip()) if not line[:1].isspace() else None
+        if match:
+            field, argument, text = match.group(1).lower(), (match.group(2) or '').strip(), match.group(3).strip()
+            if field in ('param', 'parameter', 'arg', 'argument', 'key', 'keyword') and argument:
+                name = argument.split()[-1]
+                sections['args'][name] = text
+                current = ('args', name)
+            elif field in ('returns', 'return', 'yields', 'yield'):
+                sections['returns'] = _join_text(sections['returns'], text)
+                current = ('returns', None)
+            elif field in ('raises', 'raise', 'except', 'exception'):
+                name = argument or 'Exception'
+                sections['raises'][name] = text
+                current = ('raises', name)
+            else:
+                # :type:, :rtype: и прочие служебные поля не отображаются
+                current = None
+            continue
+
+        stripped = line.strip()
+        if current is None:
+            if not sections['args'] and not sections['returns'] and not sections['raises']:
+                description.append(line)
+            continue
+        if not stripped:
+            continue
+
+        section, key = current
+        if section == 'returns':
+            sections['returns'] = f"{sections['returns']} {stripped}".strip()
+        else:
+            sections[section][key] = f"{sections[section][key]} {stripped}".strip()
+
+    text = '\n'.join(description).strip()
+    # Примеры в reST обычно оформлены как doctest в описании
+    if '>>>' in text:
+        head, _, tail = text.partition('>>>')
+        text, sections['examples'] = head.strip(), ('>>>' + tail).strip()
+    sections['description'] = text
+    return sections
@@ -19,7 +19,7 @@ class ExcelGenerator:
         Args:
             template_path: Путь к шаблону Excel (опционально)
             data: Данные для заполнения
-            output_path: Путь для сохранения
+            output_path: Путь (или файловый объект) для сохранения
             
         Returns:
             Путь к сгенерированному файлу
@@ -39,7 +39,8 @@ class ExcelGenerator:
         self._apply_formatting(ws, data)
         
         # Сохранение
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        if isinstance(output_path, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         wb.save(output_path)
         
         return output_path
@@ -179,7 +180,8 @@ class ExcelGenerator:
         # Применяем форматирование
         self._apply_formatting(ws, data)
         
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        if isinstance(output_path, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         wb.save(output_path)
         
         return output_path
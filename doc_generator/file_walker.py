@@ -0,0 +1,266 @@
+"""
+Быстрый обход дерева исходников с отсечением игнорируемых директорий
+"""
+
+import os
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+# Директории, которые никогда не содержат исходников проекта
+DEFAULT_EXCLUDES = [
+    '.git/', '.hg/', '.svn/', '__pycache__/', 'node_modules/',
+    'venv/', '.venv/', '.tox/', '.nox/', '.mypy_cache/', '.pytest_cache/',
+    'site-packages/', '*.egg-info/'
+]
+
+# Маркер виртуального окружения с произвольным именем
+VIRTUALENV_MARKER = 'pyvenv.cfg'
+
+
+def _translate_glob(pattern: str) -> str:
+    """Перевод glob-шаблона в стиле .gitignore в регулярное выражение"""
+    result = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            result.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('/**', i) and i + 3 == length:
+            result.append('/.*')
+            i += 3
+            continue
+        if char == '*':
+            if pattern.startswith('**', i):
+                result.append('.*')
+                i += 2
+                continue
+            result.append('[^/]*')
+        elif char == '?':
+            result.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                result.append(f'[{body}]')
+                i = end
+        elif char == '\\' and i + 1 < length:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return ''.join(result)
+
+
+class IgnoreRules:
+    """Набор правил в формате .gitignore (последнее совпавшее правило побеждает)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Инициализация правил
+
+        Args:
+            patterns: Строки шаблонов (комментарии и пустые строки пропускаются)
+        """
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in patterns:
+            rule = self._compile(line)
+            if rule is not None:
+                self.rules.append(rule)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'IgnoreRules':
+        """Загрузка правил из файла .gitignore"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return cls(f.read().splitlines())
+
+    @staticmethod
+    def _compile(line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        """Компиляция одной строки шаблона"""
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        # Шаблон со слешем внутри привязан к директории файла правил
+        anchored = '/' in line
+        line = line.lstrip('/')
+
+        regex = _translate_glob(line)
+        if anchored:
+            regex = f'^{regex}$'
+        else:
+            regex = f'(?:^|/){regex}$'
+        return re.compile(regex), negate, dir_only
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Проверка пути
+
+        Args:
+            rel_path: Путь относительно директории правил (через '/')
+            is_dir: Является ли путь директорией
+
+        Returns:
+            True - игнорировать, False - явно включен (!шаблон), None - правила не применимы
+        """
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.search(rel_path):
+                result = not negate
+        return result
+
+
+def default_ignore_rules(exclude: Optional[Iterable[str]] = None) -> IgnoreRules:
+    """Правила исключений по умолчанию с дополнительными шаблонами"""
+    return IgnoreRules(DEFAULT_EXCLUDES + list(exclude or []))
+
+
+def _is_ignored(rules_stack: List[Tuple[str, IgnoreRules]], rel_path: str, is_dir: bool) -> bool:
+    """Проверка пути по стеку правил (вложенные .gitignore переопределяют внешние)"""
+    ignored = False
+    for base, rules in rules_stack:
+        local_path = rel_path[len(base) + 1:] if base else rel_path
+        verdict = rules.match(local_path, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+def iter_source_files(directory: str, extensions: Optional[Iterable[str]] = None,
+                      exclude: Optional[Iterable[str]] = None,
+                      use_gitignore: bool = True) -> Iterator[str]:
+    """
+    Обход директории с отсечением игнорируемых поддеревьев
+
+    Игнорируемые директории отбрасываются до спуска в них; тип записи
+    берется из кэша os.DirEntry, без дополнительных вызовов stat.
+    Порядок обхода детерминирован (записи сортируются по имени).
+
+    Args:
+        directory: Корневая директория
+        extensions: Допустимые расширения файлов (None - любые)
+        exclude: Дополнительные шаблоны исключений в формате .gitignore
+        use_gitignore: Учитывать файлы .gitignore в дереве
+
+    Returns:
+        Итератор путей к файлам
+    """
+    extensions = set(extensions) if extensions is not None else None
+    base_rules = default_ignore_rules(exclude)
+
+    # Стек обхода: (абсолютный путь, относительный путь, стек правил)
+    stack = [(os.fspath(directory), '', [('', base_rules)])]
+    while stack:
+        dir_path, rel_dir, rules_stack = stack.pop()
+        try:
+            with os.scandir(dir_path) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        names = {entry.name for entry in entries}
+        if rel_dir and VIRTUALENV_MARKER in names:
+            continue
+
+        if use_gitignore and '.gitignore' in names:
+            try:
+                rules = IgnoreRules.from_file(os.path.join(dir_path, '.gitignore'))
+                rules_stack = rules_stack + [(rel_dir, rules)]
+            except OSError:
+                pass
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if not _is_ignored(rules_stack, rel_path, True):
+                    subdirs.append((entry.path, rel_path, rules_stack))
+                continue
+
+            if extensions is not None and os.path.splitext(entry.name)[1] not in extensions:
+                continue
+            if _is_ignored(rules_stack, rel_path, False):
+                continue
+            try:
+                if entry.is_file():
+                    yield entry.path
+            except OSError:
+                continue
+
+        # Поддиректории обрабатываются в алфавитном порядке
+        stack.extend(reversed(subdirs))
+
+
+def filter_source_paths(paths: Iterable[str], extensions: Optional[Iterable[str]] = None,
+                        exclude: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Отбор исходников из готового списка путей (например, файлов коммита git)
+
+    Применяются те же правила, что и при обходе директории, кроме .gitignore:
+    путь исключается, если исключен он сам или любая из его директорий.
+
+    Args:
+        paths: Относительные пути через '/'
+        extensions: Допустимые расширения файлов (None - любые)
+        exclude: Дополнительные шаблоны исключений в формате .gitignore
+
+    Returns:
+        Отобранные пути в исходном порядке
+    """
+    paths = list(paths)
+    extensions = set(extensions) if extensions is not None else None
+    rules_stack = [('', default_ignore_rules(exclude))]
+
+    # Директории виртуальных окружений определяются по маркеру
+    virtualenvs = {path.rsplit('/', 1)[0] for path in paths
+                   if path.endswith('/' + VIRTUALENV_MARKER)}
+
+    # Решения по директориям кэшируются: у многих файлов общие родители
+    excluded_dirs = {}
+
+    def is_dir_excluded(rel_dir: str) -> bool:
+        verdict = excluded_dirs.get(rel_dir)
+        if verdict is None:
+            parent = rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else ''
+            verdict = bool((parent and is_dir_excluded(parent)) or rel_dir in virtualenvs
+                           or _is_ignored(rules_stack, rel_dir, True))
+            excluded_dirs[rel_dir] = verdict
+        return verdict
+
+    selected = []
+    for path in paths:
+        if extensions is not None and os.path.splitext(path)[1] not in extensions:
+            continue
+        rel_dir = path.rsplit('/', 1)[0] if '/' in path else ''
+        if rel_dir and is_dir_excluded(rel_dir):
+            continue
+        if _is_ignored(rules_stack, path, False):
+            continue
+        selected.append(path)
+    return selected
@@ -0,0 +1,176 @@
+"""
+Извлечение маршрутов Flask из узлов AST
+"""
+
+import ast
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# HTTP методы; одноименные декораторы Flask 2 (@app.get, @bp.post...) задают маршрут
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+_SHORTCUT_METHODS = frozenset(method.lower() for method in HTTP_METHODS) - {'head', 'options'}
+
+# Параметр пути: <name> или <converter:name>
+_PARAMETER_RE = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """Имя вида 'f', 'self.app', 'mod.f'; None для других выражений"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _string(node: Optional[ast.AST]) -> Optional[str]:
+    """Значение строковой константы; None для других выражений"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _argument(call: ast.Call, position: Optional[int], keyword: str) -> Optional[ast.AST]:
+    """Аргумент вызова по позиции (None - только именованный) или имени"""
+    if (position is not None and len(call.args) > position
+            and not any(isinstance(arg, ast.Starred) for arg in call.args[:position + 1])):
+        return call.args[position]
+    for kw in call.keywords:
+        if kw.arg == keyword:
+            return kw.value
+    return None
+
+
+def _methods(call: ast.Call) -> Optional[List[str]]:
+    """Методы из аргумента methods=[...] / (...) / {...}; None, если он не задан литералом"""
+    node = _argument(call, None, 'methods')
+    if not isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return None
+    methods = []
+    for element in node.elts:
+        value = _string(element)
+        if value is None:
+            return None
+        methods.append(value.upper())
+    return methods
+
+
+def route_from_decorator(decorator: ast.AST) -> Optional[Tuple[str, str, List[str]]]:
+    """
+    Маршрут, заданный декоратором функции
+
+    Args:
+        decorator: Узел декоратора
+
+    Returns:
+        Тройка (объект, правило, методы) или None, если декоратор не задает маршрут
+    """
+    if not isinstance(decorator, ast.Call) or not isinstance(decorator.func, ast.Attribute):
+        return None
+    attr = decorator.func.attr
+    if attr != 'route' and attr not in _SHORTCUT_METHODS:
+        return None
+    owner = dotted_name(decorator.func.value)
+    rule = _string(_argument(decorator, 0, 'rule'))
+    if owner is None or rule is None:
+        return None
+    if attr == 'route':
+        return owner, rule, _methods(decorator) or ['GET']
+    # Короткая форма требует правило с '/', чтобы не принять за маршрут, например, cache.get('key')
+    if not rule.startswith('/'):
+        return None
+    return owner, rule, [attr.upper()]
+
+
+def route_from_add_url_rule(call: ast.Call
+                            ) -> Optional[Tuple[str, str, Optional[List[str]], Optional[str], bool]]:
+    """
+    Маршрут, заданный вызовом add_url_rule(rule, endpoint, view_func, methods=...)
+
+    Args:
+        call: Узел вызова
+
+    Returns:
+        Кортеж (объект, правило, методы или None, имя представления, представление - класс)
+        или None, если вызов не задает маршрут
+    """
+    if not isinstance(call.func, ast.Attribute) or call.func.attr != 'add_url_rule':
+        return None
+    owner = dotted_name(call.func.value)
+    rule = _string(_argument(call, 0, 'rule'))
+    if owner is None or rule is None:
+        return None
+
+    view_func = _argument(call, 2, 'view_func')
+    is_class = False
+    # Представление-класс: view_func=UserAPI.as_view('users')
+    if (isinstance(view_func, ast.Call) and isinstance(view_func.func, ast.Attribute)
+            and view_func.func.attr == 'as_view'):
+        view_func = view_func.func.value
+        is_class = True
+    view = dotted_name(view_func) if view_func is not None else None
+    return owner, rule, _methods(call), view, is_class
+
+
+def blueprint_prefix(call: ast.Call) -> Tuple[bool, Optional[str]]:
+    """
+    Проверка, создает ли вызов Blueprint, и его url_prefix
+
+    Args:
+        call: Узел вызова в правой части присваивания
+
+    Returns:
+        Пара (вызов создает Blueprint, url_prefix или None)
+    """
+    name = dotted_name(call.func)
+    if name is None or name.rpartition('.')[2] != 'Blueprint':
+        return False, None
+    return True, _string(_argument(call, None, 'url_prefix'))
+
+
+def blueprint_registration(call: ast.Call) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    Регистрация blueprint: app.register_blueprint(bp, url_prefix=...)
+
+    Args:
+        call: Узел вызова
+
+    Returns:
+        Тройка (приложение, blueprint, url_prefix или None) или None
+    """
+    if not isinstance(call.func, ast.Attribute) or call.func.attr != 'register_blueprint':
+        return None
+    owner = dotted_name(call.func.value)
+    blueprint = dotted_name(_argument(call, 0, 'blueprint'))
+    if owner is None or blueprint is None:
+        return None
+    return owner, blueprint, _string(_argument(call, None, 'url_prefix'))
+
+
+def join_rule(prefix: Optional[str], rule: str) -> str:
+    """Правило с префиксом blueprint (как в Flask: ровно один '/' между ними)"""
+    if not prefix:
+        return rule
+    if not rule:
+        return prefix
+    return f"{prefix.rstrip('/')}/{rule.lstrip('/')}"
+
+
+def path_parameters(rule: str) -> List[Dict[str, Any]]:
+    """
+    Параметры пути правила Flask
+
+    Args:
+        rule: Правило вида '/users/<int:user_id>'
+
+    Returns:
+        Список {'name', 'type', 'in', 'required'}; type - имя конвертера ('string' по умолчанию)
+    """
+    return [
+        {'name': name, 'type': converter or 'string', 'in': 'path', 'required': True}
+        for converter, name in _PARAMETER_RE.findall(rule)
+    ]
@@ -0,0 +1,133 @@
+"""
+Постоянный кэш отрисованных фрагментов документации (SQLite)
+"""
+
+import time
+from typing import Iterable, Optional, Set, Tuple
+
+from .analysis_cache import SQLiteCache
+
+
+class FragmentCache(SQLiteCache):
+    """
+    Кэш готовых фрагментов документации по ключу
+
+    Ключ строит генератор (например, из пути и хэша содержимого файла),
+    версия кэша включает версии генератора и анализатора, поэтому при их
+    смене все фрагменты сбрасываются.
+
+    Размер кэша ограничен max_rows записями: при превышении удаляются
+    давно не использованные (время использования обновляется при чтении
+    порциями и при записи). Без ограничения кэш долго работающего сервера
+    рос бы без конца.
+    """
+
+    DB_FILENAME = 'fragment_cache.sqlite3'
+    # Версия схемы таблиц (время использования для вытеснения)
+    SCHEMA_VERSION = 'lru'
+    TABLES = {
+        'fragments': 'key TEXT PRIMARY KEY, content TEXT, used INTEGER'
+    }
+    # Наибольшее число записей по умолчанию
+    MAX_ROWS = 20000
+    # Число прочитанных ключей, время использования которых обновляется одной транзакцией
+    TOUCH_BATCH_SIZE = 256
+
+    def __init__(self, cache_dir: str, version: str, max_rows: Optional[int] = None):
+        """
+        Инициализация кэша
+
+        Args:
+            cache_dir: Директория для файла базы данных
+            version: Версия формата фрагментов
+            max_rows: Наибольшее число записей (None - MAX_ROWS)
+        """
+        super().__init__(cache_dir, f'{version}/{self.SCHEMA_VERSION}')
+        self.max_rows = max_rows or self.MAX_ROWS
+        connection = self._connection()
+        with connection:
+            connection.execute('CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)')
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Получение фрагмента
+
+        Args:
+            key: Ключ фрагмента
+
+        Returns:
+            Текст фрагмента или None
+        """
+        row = self._connection().execute(
+            'SELECT content FROM fragments WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        touched = self._touched()
+        touched.add(key)
+        if len(touched) >= self.TOUCH_BATCH_SIZE:
+            connection = self._connection()
+            with connection:
+                self._flush_touched(connection)
+        return row[0]
+
+    def put_many(self, items: Iterable[Tuple[str, str]]):
+        """
+        Сохранение нескольких фрагментов в одной транзакции
+
+        Заодно сохраняется время использования прочитанных фрагментов и,
+        если записей больше max_rows, удаляются давно не использованные.
+
+        Args:
+            items: Пары (ключ, текст фрагмента)
+        """
+        now = int(time.time())
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO fragments (key, content, used) VALUES (?, ?, ?)',
+                ((key, content, now) for key, content in items)
+            )
+            self._flush_touched(connection)
+            self._evict(connection)
+
+    def _touched(self) -> Set[str]:
+        """Прочитанные в текущем потоке ключи, время использования которых еще не сохранено"""
+        touched = getattr(self._local, 'touched', None)
+        if touched is None:
+            touched = self._local.touched = set()
+        return touched
+
+    def _flush_touched(self, connection):
+        touched = self._touched()
+        if touched:
+            now = int(time.time())
+            connection.executemany('UPDATE fragments SET used = ? WHERE key = ?',
+                                   ((now, key) for key in touched))
+            touched.clear()
+
+    def _evict(self, connection):
+        """Удаление давно не использованных записей сверх max_rows (с запасом в 10%)"""
+        count = connection.execute('SELECT COUNT(*) FROM fragments').fetchone()[0]
+        if count > self.max_rows:
+            connection.execute(
+                'DELETE FROM fragments WHERE key IN '
+                '(SELECT key FROM fragments ORDER BY used LIMIT ?)',
+                (count - self.max_rows * 9 // 10,)
+            )
+
+
+class HighlightCache(FragmentCache):
+    """
+    Кэш подсвеченных блоков кода (HTML) по хэшу содержимого блока
+
+    Версия кэша включает версию pygments и стиль подсветки.
+    """
+
+    DB_FILENAME = 'highlight_cache.sqlite3'
+
+
+class DiagramCache(FragmentCache):
+    """Кэш готовых диаграмм (Mermaid, PlantUML) по хэшу входных данных"""
+
+    DB_FILENAME = 'diagram_cache.sqlite3'
@@ -2,11 +2,24 @@
 Основной класс для генерации документов
 """
 
+import io
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union, BinaryIO
 from .word_generator import WordGenerator
 from .pdf_generator import PDFGenerator
 from .excel_generator import ExcelGenerator
+from .zip_bundle import ZipBundleWriter, iter_zip_stream
+
+
+# Расширения файлов по типу документа
+DOCUMENT_EXTENSIONS = {
+    'word': '.docx',
+    'pdf': '.pdf',
+    'excel': '.xlsx'
+}
+
+# Файл со списком ошибок в конце потокового архива
+BUNDLE_ERRORS_NAME = 'ERRORS.txt'
 
 
 class DocumentGenerator:
@@ -106,16 +119,154 @@ class DocumentGenerator:
             data = doc_config.get('data', {})
             output = doc_config.get('output')
             
-            if doc_type == 'word':
-                file_path = self.generate_word(template, data, output)
-            elif doc_type == 'pdf':
-                file_path = self.generate_pdf(template, data, output)
-            elif doc_type == 'excel':
-                file_path = self.generate_excel(template, data, output)
-            else:
-                raise ValueError(f"Неизвестный тип документа: {doc_type}")
-            
+            file_path = self._generate_document(doc_type, template, data, output)
             generated_files.append(file_path)
         
         return generated_files
-
+    
+    def _generate_document(self, doc_type: str, template: Optional[str], data: Dict[str, Any],
+                           output: Optional[Union[str, BinaryIO]]):
+        """Генерация одного документа по его типу"""
+        if doc_type == 'word':
+            return self.generate_word(template, data, output)
+        elif doc_type == 'pdf':
+            return self.generate_pdf(template, data, output)
+        elif doc_type == 'excel':
+            return self.generate_excel(template, data, output)
+        else:
+            raise ValueError(f"Неизвестный тип документа: {doc_type}")
+    
+    def validate_document(self, doc_config: Dict[str, Any]):
+        """
+        Проверка описания документа до генерации
+        
+        Args:
+            doc_config: Описание документа (type, template, data, output)
+            
+        Raises:
+            ValueError: Неизвестный тип документа или поле неверного типа
+        """
+        if not isinstance(doc_config, dict):
+            raise ValueError("Описание документа должно быть объектом")
+        doc_type = doc_config.get('type')
+        if doc_type not in DOCUMENT_EXTENSIONS:
+            raise ValueError(f"Неизвестный тип документа: {doc_type}")
+        if not isinstance(doc_config.get('data', {}), dict):
+            raise ValueError("Поле data должно быть объектом")
+        for key in ('template', 'output'):
+            if doc_config.get(key) is not None and not isinstance(doc_config[key], str):
+                raise ValueError(f"Поле {key} должно быть строкой")
+    
+    def render_document(self, doc_config: Dict[str, Any], index: int = 0) -> Tuple[str, bytes]:
+        """
+        Генерация документа в память без записи на диск
+        
+        Args:
+            doc_config: Описание документа (type, template, data, output)
+            index: Порядковый номер документа (для имени по умолчанию)
+            
+        Returns:
+            Пара (имя файла, содержимое документа)
+        """
+        doc_type = doc_config.get('type')
+        if doc_type not in DOCUMENT_EXTENSIONS:
+            raise ValueError(f"Неизвестный тип документа: {doc_type}")
+        
+        output = doc_config.get('output')
+        if output:
+            filename = os.path.basename(output)
+        else:
+            filename = f"document_{index + 1:05d}{DOCUMENT_EXTENSIONS[doc_type]}"
+        
+        buffer = io.BytesIO()
+        self._generate_document(doc_type, doc_config.get('template'),
+                                doc_config.get('data', {}), buffer)
+        return filename, buffer.getvalue()
+    
+    def iter_documents(self, documents: List[Dict[str, Any]]) -> Iterator[Tuple[str, bytes]]:
+        """
+        Последовательная генерация документов в память
+        
+        Args:
+            documents: Список описаний документов
+            
+        Returns:
+            Итератор пар (имя файла, содержимое)
+        """
+        for index, doc_config in enumerate(documents):
+            yield self.render_document(doc_config, index)
+    
+    def generate_bundle(self, documents: List[Dict[str, Any]],
+                        output: Optional[Union[str, BinaryIO]] = None) -> Union[str, BinaryIO]:
+        """
+        Генерация документов сразу в ZIP архив
+        
+        Каждый документ записывается в архив сразу после генерации,
+        промежуточные файлы на диске не создаются.
+        
+        Args:
+            documents: Список описаний документов (как в конфигурационном файле)
+            output: Путь к архиву или файловый объект (по умолчанию output_dir/documents.zip)
+            
+        Returns:
+            Путь к архиву или переданный файловый объект
+        """
+        if output is None:
+            output = os.path.join(self.output_dir, "documents.zip")
+        
+        with ZipBundleWriter(output) as bundle:
+            for filename, content in self.iter_documents(documents):
+                bundle.add(filename, content)
+        
+        return output
+    
+    def iter_bundle(self, documents: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Потоковая генерация ZIP архива (например, для HTTP ответа)
+        
+        Когда генерируется очередной документ, начало архива уже отдано,
+        поэтому ошибка не обрывает архив: документ пропускается, описания
+        ошибок записываются в конец архива в файл BUNDLE_ERRORS_NAME, и
+        архив закрывается как обычно. Описания документов стоит заранее
+        проверить через validate_document.
+        
+        Args:
+            documents: Список описаний документов
+            
+        Returns:
+            Итератор фрагментов архива
+        """
+        return iter_zip_stream(self._iter_documents_with_errors(documents))
+    
+    def _iter_documents_with_errors(self, documents: List[Dict[str, Any]]
+                                    ) -> Iterator[Tuple[str, bytes]]:
+        """Генерация документов с заменой ошибок файлом BUNDLE_ERRORS_NAME в конце"""
+        errors = []
+        for index, doc_config in enumerate(documents):
+            try:
+                document = self.render_document(doc_config, index)
+            except Exception as e:
+                errors.append(f"Документ {index + 1}: {e}")
+                continue
+            yield document
+        if errors:
+            yield BUNDLE_ERRORS_NAME, ('\n'.join(errors) + '\n').encode('utf-8')
+    
+    def generate_bundle_from_config(self, config_path: str,
+                                    output: Optional[Union[str, BinaryIO]] = None) -> Union[str, BinaryIO]:
+        """
+        Генерация ZIP архива на основе конфигурационного файла
+        
+        Args:
+            config_path: Путь к JSON конфигурационному файлу
+            output: Путь к архиву или файловый объект
+            
+        Returns:
+            Путь к архиву или переданный файловый объект
+        """
+        import json
+        
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        return self.generate_bundle(config.get('documents', []), output)
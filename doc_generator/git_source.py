@@ -0,0 +1,173 @@
+"""
+Чтение файлов из объектов git без checkout
+"""
+
+import subprocess
+import threading
+from typing import List, NamedTuple
+
+
+class GitError(Exception):
+    """Ошибка выполнения команды git"""
+
+
+class GitTreeEntry(NamedTuple):
+    """Файл в дереве коммита"""
+
+    path: str
+    sha: str
+    size: int
+    mode: str
+
+
+def _run_git(repo_path: str, *args: str) -> bytes:
+    """Выполнение команды git с возвратом stdout"""
+    try:
+        completed = subprocess.run(['git', '-C', repo_path, *args], stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, check=False)
+    except OSError as e:
+        raise GitError(f'Не удалось запустить git: {e}')
+    if completed.returncode != 0:
+        raise GitError(completed.stderr.decode('utf-8', 'replace').strip()
+                       or f'git {" ".join(args)} завершился с кодом {completed.returncode}')
+    return completed.stdout
+
+
+def resolve_revision(repo_path: str, revision: str = 'HEAD') -> str:
+    """
+    Полный SHA коммита для ревизии
+
+    Args:
+        repo_path: Путь к репозиторию
+        revision: Ветка, тег или SHA
+
+    Returns:
+        SHA коммита
+    """
+    return _run_git(repo_path, 'rev-parse', '--verify', f'{revision}^{{commit}}').decode().strip()
+
+
+def list_tree(repo_path: str, revision: str = 'HEAD') -> List[GitTreeEntry]:
+    """
+    Список файлов (blob) в дереве коммита
+
+    Args:
+        repo_path: Путь к репозиторию
+        revision: Ветка, тег или SHA
+
+    Returns:
+        Записи в порядке git (по пути); подмодули и символические ссылки не включаются
+    """
+    output = _run_git(repo_path, 'ls-tree', '-r', '-l', '-z', '--full-tree', revision)
+    entries = []
+    for record in output.split(b'\0'):
+        if not record:
+            continue
+        meta, _, path = record.partition(b'\t')
+        mode, object_type, sha, size = meta.split()
+        # 120000 - символическая ссылка, commit - подмодуль
+        if object_type != b'blob' or mode == b'120000':
+            continue
+        entries.append(GitTreeEntry(path.decode('utf-8', 'surrogateescape'), sha.decode(),
+                                    int(size), mode.decode()))
+    return entries
+
+
+class CatFileBatch:
+    """
+    Чтение объектов через один долгоживущий процесс 'git cat-file --batch'
+
+    Объекты запрашиваются по одному и читаются из stdout процесса в память,
+    без распаковки на диск. Экземпляр можно использовать из нескольких
+    потоков: запросы сериализуются блокировкой.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, repo_path: str):
+        """
+        Запуск процесса git
+
+        Args:
+            repo_path: Путь к репозиторию
+        """
+        self.repo_path = repo_path
+        self._lock = threading.Lock()
+        try:
+            self._process = subprocess.Popen(['git', '-C', repo_path, 'cat-file', '--batch'],
+                                             stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+        except OSError as e:
+            raise GitError(f'Не удалось запустить git: {e}')
+
+    def __enter__(self) -> 'CatFileBatch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Завершение процесса git"""
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+        self._process.stdout.close()
+
+    def _request(self, sha: str) -> int:
+        """Запрос объекта; возвращает размер содержимого"""
+        self._process.stdin.write(sha.encode() + b'\n')
+        self._process.stdin.flush()
+        header = self._process.stdout.readline()
+        if not header:
+            raise GitError('Процесс git cat-file неожиданно завершился')
+        parts = header.split()
+        if len(parts) != 3:
+            raise GitError(f'Объект не найден: {sha}')
+        return int(parts[2])
+
+    def read(self, sha: str) -> bytes:
+        """
+        Чтение содержимого объекта в память
+
+        Args:
+            sha: SHA объекта
+
+        Returns:
+            Содержимое объекта
+        """
+        chunks = []
+        self._consume(sha, chunks.append)
+        return b''.join(chunks)
+
+    def count_lines(self, sha: str) -> int:
+        """
+        Подсчет строк объекта без загрузки его в память целиком
+
+        Args:
+            sha: SHA объекта
+
+        Returns:
+            Число строк (как len(text.split('\\n')))
+        """
+        newlines = 0
+
+        def count(chunk: bytes):
+            nonlocal newlines
+            newlines += chunk.count(b'\n')
+
+        self._consume(sha, count)
+        return newlines + 1
+
+    def _consume(self, sha: str, consumer):
+        """Чтение объекта блоками не больше CHUNK_SIZE байт с передачей их consumer"""
+        with self._lock:
+            remaining = self._request(sha)
+            stdout = self._process.stdout
+            while remaining:
+                chunk = stdout.read(min(remaining, self.CHUNK_SIZE))
+                if not chunk:
+                    raise GitError('Процесс git cat-file неожиданно завершился')
+                remaining -= len(chunk)
+                consumer(chunk)
+            # Содержимое объекта завершается переводом строки
+            stdout.read(1)
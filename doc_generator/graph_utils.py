@@ -0,0 +1,361 @@
+"""
+Алгоритмы на графах, заданных массивами ребер
+"""
+
+from array import array
+from typing import Dict, List, Any, Sequence, Tuple
+
+
+class EdgeListGraph:
+    """
+    Ориентированный граф с именованными вершинами и ребрами в массивах
+
+    Вершины нумеруются в порядке добавления, ребра хранятся в двух
+    массивах целых чисел (sources[i] -> targets[i]) без повторов и петель,
+    поэтому граф сразу подходит для алгоритмов этого модуля. Подклассы
+    добавляют только построение графа по результатам анализа.
+    """
+
+    def __init__(self):
+        """Инициализация пустого графа"""
+        self.nodes: List[str] = []
+        self.sources = array('I')
+        self.targets = array('I')
+        self._ids: Dict[str, int] = {}
+        # Ребра в виде упакованных чисел (source << 32 | target) для проверки повторов
+        self._edges = set()
+
+    def node_id(self, name: str) -> int:
+        """Номер вершины (вершина создается при первом обращении)"""
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self.nodes)
+            self.nodes.append(name)
+        return node
+
+    def add_edge(self, source_name: str, target_name: str):
+        """Добавление ребра source_name -> target_name (повторы и петли игнорируются)"""
+        source, target = self.node_id(source_name), self.node_id(target_name)
+        key = (source << 32) | target
+        if source != target and key not in self._edges:
+            self._edges.add(key)
+            self.sources.append(source)
+            self.targets.append(target)
+
+    def component_groups(self, component: Sequence[int], count: int) -> List[List[str]]:
+        """Имена вершин по компонентам (component - номер компоненты каждой вершины)"""
+        groups: List[List[str]] = [[] for _ in range(count)]
+        for node, name in enumerate(self.nodes):
+            groups[component[node]].append(name)
+        return groups
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация в JSON-совместимый словарь"""
+        return {
+            'nodes': list(self.nodes),
+            'sources': self.sources.tolist(),
+            'targets': self.targets.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EdgeListGraph':
+        """Восстановление графа из словаря to_dict()"""
+        graph = cls()
+        for name in data.get('nodes', []):
+            graph.node_id(name)
+        for source, target in zip(data.get('sources', []), data.get('targets', [])):
+            graph.add_edge(graph.nodes[source], graph.nodes[target])
+        return graph
+
+
+def build_adjacency(node_count: int, sources: Sequence[int],
+                    targets: Sequence[int]) -> Tuple[array, array]:
+    """
+    Построение списков смежности в сжатом виде (CSR)
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+
+    Returns:
+        Пара (offsets, neighbors): соседи вершины v - neighbors[offsets[v]:offsets[v + 1]]
+    """
+    offsets = array('I', [0]) * (node_count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for v in range(node_count):
+        offsets[v + 1] += offsets[v]
+
+    neighbors = array('I', [0]) * len(targets)
+    position = array('I', offsets[:-1])
+    for source, target in zip(sources, targets):
+        neighbors[position[source]] = target
+        position[source] += 1
+    return offsets, neighbors
+
+
+def strongly_connected_components(node_count: int, sources: Sequence[int],
+                                  targets: Sequence[int]) -> Tuple[array, int]:
+    """
+    Компоненты сильной связности (алгоритм Тарьяна без рекурсии)
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+
+    Returns:
+        Пара (номер компоненты для каждой вершины, число компонент);
+        компоненты пронумерованы в обратном топологическом порядке
+    """
+    offsets, neighbors = build_adjacency(node_count, sources, targets)
+    unvisited = -1
+    index = array('i', [unvisited]) * node_count
+    lowlink = array('i', [0]) * node_count
+    component = array('i', [unvisited]) * node_count
+    on_stack = bytearray(node_count)
+    stack: List[int] = []
+    counter = 0
+    component_count = 0
+
+    for root in range(node_count):
+        if index[root] != unvisited:
+            continue
+
+        # Кадры обхода: (вершина, позиция следующего соседа)
+        work = [(root, offsets[root])]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        while work:
+            v, position = work[-1]
+            end = offsets[v + 1]
+            while position < end:
+                w = neighbors[position]
+                position += 1
+                if index[w] == unvisited:
+                    work[-1] = (v, position)
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, offsets[w]))
+                    break
+                if on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[v] < lowlink[parent]:
+                        lowlink[parent] = lowlink[v]
+                if lowlink[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = component_count
+                        if w == v:
+                            break
+                    component_count += 1
+
+    return component, component_count
+
+
+def condense(node_count: int, sources: Sequence[int],
+             targets: Sequence[int]) -> Tuple[array, int, array, array]:
+    """
+    Сжатие компонент сильной связности в вершины (граф конденсации)
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+
+    Returns:
+        Кортеж (компонента каждой вершины, число компонент,
+        начала и концы ребер между компонентами без повторов)
+    """
+    component, component_count = strongly_connected_components(node_count, sources, targets)
+    seen = set()
+    condensed_sources = array('I')
+    condensed_targets = array('I')
+    for source, target in zip(sources, targets):
+        a, b = component[source], component[target]
+        if a == b:
+            continue
+        key = a * component_count + b
+        if key in seen:
+            continue
+        seen.add(key)
+        condensed_sources.append(a)
+        condensed_targets.append(b)
+    return component, component_count, condensed_sources, condensed_targets
+
+
+def connected_components(node_count: int, sources: Sequence[int],
+                         targets: Sequence[int]) -> Tuple[array, int]:
+    """
+    Компоненты связности графа без учета направления ребер (система непересекающихся множеств)
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+
+    Returns:
+        Пара (номер компоненты каждой вершины, число компонент); компоненты
+        пронумерованы в порядке первой вершины
+    """
+    parent = array('I', range(node_count))
+
+    def find(v: int) -> int:
+        # Сжатие пути делением пополам
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for source, target in zip(sources, targets):
+        a, b = find(source), find(target)
+        if a != b:
+            # Корнем становится меньшая вершина, чтобы нумерация не зависела от порядка ребер
+            if a < b:
+                parent[b] = a
+            else:
+                parent[a] = b
+
+    component = array('I', [0]) * node_count
+    numbers = {}
+    for v in range(node_count):
+        root = find(v)
+        number = numbers.get(root)
+        if number is None:
+            number = numbers[root] = len(numbers)
+        component[v] = number
+    return component, len(numbers)
+
+
+def transitive_reduction(node_count: int, sources: Sequence[int],
+                         targets: Sequence[int]) -> Tuple[array, array]:
+    """
+    Транзитивное сокращение ациклического графа
+
+    Ребро v -> w удаляется, если w достижима из v другим путем. Вершины
+    обрабатываются в обратном топологическом порядке, множества достижимых
+    вершин хранятся битовыми масками (целыми числами Python), поэтому время
+    O(V + E * V / 64), а память - O(V^2) бит: подходит для графов из
+    тысяч вершин (модули, компоненты), но не из сотен тысяч.
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+
+    Returns:
+        Пара (начала, концы) оставшихся ребер без повторов
+
+    Raises:
+        ValueError: Граф содержит цикл (сначала нужно применить condense)
+    """
+    offsets, neighbors = build_adjacency(node_count, sources, targets)
+
+    # Топологический порядок (алгоритм Кана)
+    in_degree = array('I', [0]) * node_count
+    for target in targets:
+        in_degree[target] += 1
+    order = [v for v in range(node_count) if in_degree[v] == 0]
+    for v in order:
+        for w in neighbors[offsets[v]:offsets[v + 1]]:
+            in_degree[w] -= 1
+            if in_degree[w] == 0:
+                order.append(w)
+    if len(order) != node_count:
+        raise ValueError('Граф содержит цикл')
+    position = array('I', [0]) * node_count
+    for index, v in enumerate(order):
+        position[v] = index
+
+    reach = [0] * node_count
+    reduced_sources = array('I')
+    reduced_targets = array('I')
+    for v in reversed(order):
+        covered = 0
+        # Ближайшие по топологическому порядку соседи первыми: если сосед w
+        # достижим через соседа u, то u обработан раньше w
+        for w in sorted(set(neighbors[offsets[v]:offsets[v + 1]]), key=position.__getitem__):
+            if covered >> w & 1:
+                continue
+            reduced_sources.append(v)
+            reduced_targets.append(w)
+            covered |= reach[w] | (1 << w)
+        reach[v] = covered
+    return reduced_sources, reduced_targets
+
+
+def partition_graph(node_count: int, sources: Sequence[int], targets: Sequence[int],
+                    max_size: int) -> List[List[int]]:
+    """
+    Разбиение графа на части не больше max_size вершин по компонентам связности
+
+    Компоненты связности не разрываются, если помещаются в часть; небольшие
+    компоненты упаковываются в общие части (first-fit по убыванию размера).
+    Компонента крупнее лимита режется на куски по порядку обхода в ширину
+    (без учета направления ребер) от ее первой вершины без входящих ребер,
+    поэтому куски остаются почти связными.
+
+    Args:
+        node_count: Число вершин
+        sources: Начала ребер
+        targets: Концы ребер
+        max_size: Максимальное число вершин в части
+
+    Returns:
+        Списки номеров вершин по частям
+    """
+    component, count = connected_components(node_count, sources, targets)
+    members: List[List[int]] = [[] for _ in range(count)]
+    for node in range(node_count):
+        members[component[node]].append(node)
+
+    pieces: List[List[int]] = []
+    adjacency = None
+    has_incoming = None
+    for nodes in members:
+        if len(nodes) <= max_size:
+            pieces.append(nodes)
+            continue
+        if adjacency is None:
+            # Обход без учета направления: каждое ребро в обе стороны
+            adjacency = build_adjacency(node_count, list(sources) + list(targets),
+                                        list(targets) + list(sources))
+            has_incoming = set(targets)
+        offsets, neighbors = adjacency
+        start = next((node for node in nodes if node not in has_incoming), nodes[0])
+        order = [start]
+        seen = {start}
+        for node in order:
+            for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    order.append(neighbor)
+        pieces.extend(order[begin:begin + max_size] for begin in range(0, len(order), max_size))
+
+    pieces.sort(key=len, reverse=True)
+    parts: List[List[int]] = []
+    # Части, в которые еще можно добавить вершины (заполненные не перебираются)
+    open_parts: List[List[int]] = []
+    for piece in pieces:
+        for part in open_parts:
+            if len(part) + len(piece) <= max_size:
+                part.extend(piece)
+                break
+        else:
+            part = list(piece)
+            parts.append(part)
+            open_parts.append(part)
+        if len(part) >= max_size:
+            open_parts.remove(part)
+    return parts
@@ -2,17 +2,50 @@
 Генератор Markdown документации
 """
 
-from typing import Dict, List, Any, Optional
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Any, Optional, TextIO, Tuple
 from pathlib import Path
+from .clone_detector import CloneIndex
 from .code_analyzer import CodeAnalyzer
+from .fragment_cache import FragmentCache
+from .git_source import resolve_revision
+from .search_index import SearchIndex
+
+
+# Версия формата документации; меняется при любом изменении вывода,
+# чтобы сбросить кэш готовых фрагментов
+MARKDOWN_VERSION = '1'
 
 
 class MarkdownGenerator:
-    """Генератор документации в формате Markdown"""
+    """
+    Генератор документации в формате Markdown
     
-    def __init__(self):
-        """Инициализация генератора"""
-        self.analyzer = CodeAnalyzer()
+    Методы write_* пишут документ по частям в текстовый поток (файл, сокет,
+    ответ HTTP), методы generate_* возвращают его строкой.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Инициализация генератора
+        
+        Args:
+            cache_dir: Директория постоянного кэша анализа кода и готовых
+                       фрагментов документации (опционально)
+        """
+        self.analyzer = CodeAnalyzer(cache_dir=cache_dir)
+        self.fragment_cache = (FragmentCache(cache_dir, f'{MARKDOWN_VERSION}/{self.analyzer.cache_version}')
+                               if cache_dir else None)
+    
+    # Размер документации файлов проекта, после которого она выгружается
+    # из памяти во временный файл
+    SPOOL_MAX_SIZE = 4 * 1024 * 1024
+    # Число новых фрагментов, сохраняемых в кэш одной транзакцией
+    FRAGMENT_BATCH_SIZE = 256
     
     def generate_code_docs(self, code_info: Dict[str, Any], 
                           output_path: Optional[str] = None) -> str:
@@ -26,91 +59,118 @@ class MarkdownGenerator:
         Returns:
             Markdown строка
         """
+        buffer = io.StringIO()
+        self.write_code_docs(code_info, buffer)
+        md = buffer.getvalue()
+        
+        if output_path and 'error' not in code_info:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(md)
+        
+        return md
+    
+    def write_code_docs(self, code_info: Dict[str, Any], out: TextIO):
+        """
+        Запись документации из анализа кода в поток
+        
+        Args:
+            code_info: Информация о коде из CodeAnalyzer
+            out: Текстовый поток для записи
+        """
         # Проверяем наличие ошибки
         if 'error' in code_info:
-            return f"*Ошибка при анализе: {code_info['error']}*\n\n"
+            out.write(f"*Ошибка при анализе: {code_info['error']}*\n\n")
+            return
         
-        md = "# Code Documentation\n\n"
+        out.write("# Code Documentation\n\n")
         
         if code_info.get('file'):
-            md += f"**File:** `{code_info['file']}`\n\n"
+            out.write(f"**File:** `{code_info['file']}`\n\n")
         
         if code_info.get('module_docstring'):
-            md += f"{code_info['module_docstring']}\n\n"
+            out.write(f"{code_info['module_docstring']}\n\n")
         
-        md += f"**Lines of code:** {code_info.get('line_count', 0)}\n\n"
+        out.write(f"**Lines of code:** {code_info.get('line_count', 0)}\n\n")
+        
+        if 'skipped' in code_info:
+            out.write(f"*Файл пропущен: {code_info['skipped']}*\n\n")
+            return
         
         # Импорты
         if code_info.get('imports'):
-            md += "## Imports\n\n"
+            out.write("## Imports\n\n")
             for imp in code_info['imports']:
                 if imp.get('type') == 'import':
-                    md += f"- `import {', '.join(imp['names'])}`\n"
+                    out.write(f"- `import {', '.join(imp['names'])}`\n")
                 elif imp.get('type') == 'from':
-                    md += f"- `from {imp['module']} import {', '.join(imp['names'])}`\n"
-            md += "\n"
+                    out.write(f"- `from {imp['module']} import {', '.join(imp['names'])}`\n")
+            out.write("\n")
         
         # Классы
         if code_info.get('classes'):
-            md += "## Classes\n\n"
+            out.write("## Classes\n\n")
             for cls in code_info['classes']:
-                md += self._generate_class_doc(cls)
-                md += "\n"
+                self._write_class_doc(cls, out)
+                out.write("\n")
         
         # Функции
         if code_info.get('functions'):
-            md += "## Functions\n\n"
+            out.write("## Functions\n\n")
             for func in code_info['functions']:
-                md += self._generate_function_doc(func)
-                md += "\n"
-        
-        if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(md)
-        
-        return md
+                self._write_function_doc(func, out)
+                out.write("\n")
     
     def _generate_class_doc(self, cls: Dict[str, Any]) -> str:
         """Генерация документации для класса"""
-        md = f"### {cls['name']}\n\n"
+        buffer = io.StringIO()
+        self._write_class_doc(cls, buffer)
+        return buffer.getvalue()
+    
+    def _write_class_doc(self, cls: Dict[str, Any], out: TextIO):
+        """Запись документации для класса"""
+        out.write(f"### {cls['name']}\n\n")
         
         if cls.get('docstring'):
-            md += f"{cls['docstring']}\n\n"
+            out.write(f"{cls['docstring']}\n\n")
         
         if cls.get('bases'):
-            md += f"**Inherits from:** {', '.join(cls['bases'])}\n\n"
+            out.write(f"**Inherits from:** {', '.join(cls['bases'])}\n\n")
         
         if cls.get('decorators'):
-            md += f"**Decorators:** {', '.join(cls['decorators'])}\n\n"
+            out.write(f"**Decorators:** {', '.join(cls['decorators'])}\n\n")
         
         if cls.get('attributes'):
-            md += "**Attributes:**\n\n"
+            out.write("**Attributes:**\n\n")
             for attr in cls['attributes']:
-                md += f"- `{attr}`\n"
-            md += "\n"
+                out.write(f"- `{attr}`\n")
+            out.write("\n")
         
         if cls.get('methods'):
-            md += "**Methods:**\n\n"
+            out.write("**Methods:**\n\n")
             for method in cls['methods']:
-                md += f"- `{method['name']}({', '.join([arg['name'] for arg in method.get('args', [])])})`\n"
-            md += "\n"
-        
-        return md
+                out.write(f"- `{method['name']}({', '.join([arg['name'] for arg in method.get('args', [])])})`\n")
+            out.write("\n")
     
     def _generate_function_doc(self, func: Dict[str, Any]) -> str:
         """Генерация документации для функции"""
-        md = f"### {func['name']}\n\n"
+        buffer = io.StringIO()
+        self._write_function_doc(func, buffer)
+        return buffer.getvalue()
+    
+    def _write_function_doc(self, func: Dict[str, Any], out: TextIO):
+        """Запись документации для функции"""
+        out.write(f"### {func['name']}\n\n")
         
         if func.get('docstring'):
             doc_sections = self.analyzer.extract_docstring_sections(func['docstring'])
             
             if doc_sections.get('description'):
-                md += f"{doc_sections['description']}\n\n"
+                out.write(f"{doc_sections['description']}\n\n")
             
             if func.get('args'):
-                md += "**Parameters:**\n\n"
-                md += "| Name | Type | Default | Description |\n"
-                md += "|------|------|---------|-------------|\n"
+                out.write("**Parameters:**\n\n")
+                out.write("| Name | Type | Default | Description |\n")
+                out.write("|------|------|---------|-------------|\n")
                 
                 for arg in func['args']:
                     arg_name = arg['name']
@@ -118,86 +178,324 @@ class MarkdownGenerator:
                     arg_default = arg.get('default', '')
                     arg_desc = doc_sections.get('args', {}).get(arg_name, '')
                     
-                    md += f"| {arg_name} | {arg_type} | {arg_default} | {arg_desc} |\n"
-                md += "\n"
+                    out.write(f"| {arg_name} | {arg_type} | {arg_default} | {arg_desc} |\n")
+                out.write("\n")
             
             if func.get('returns'):
-                md += f"**Returns:** `{func['returns']}`\n\n"
+                out.write(f"**Returns:** `{func['returns']}`\n\n")
                 if doc_sections.get('returns'):
-                    md += f"{doc_sections['returns']}\n\n"
+                    out.write(f"{doc_sections['returns']}\n\n")
             
             if doc_sections.get('raises'):
-                md += "**Raises:**\n\n"
+                out.write("**Raises:**\n\n")
                 for exc, desc in doc_sections['raises'].items():
-                    md += f"- `{exc}`: {desc}\n"
-                md += "\n"
+                    out.write(f"- `{exc}`: {desc}\n")
+                out.write("\n")
             
             if doc_sections.get('examples'):
-                md += "**Example:**\n\n```python\n"
-                md += f"{doc_sections['examples']}\n"
-                md += "```\n\n"
+                out.write("**Example:**\n\n```python\n")
+                out.write(f"{doc_sections['examples']}\n")
+                out.write("```\n\n")
+            
+            for title, text in doc_sections.get('other', {}).items():
+                out.write(f"**{title}:**\n\n{text}\n\n")
         else:
             # Без docstring, просто сигнатура
             args_str = ', '.join([arg['name'] for arg in func.get('args', [])])
-            md += f"```python\ndef {func['name']}({args_str})"
+            out.write(f"```python\ndef {func['name']}({args_str})")
             if func.get('returns'):
-                md += f" -> {func['returns']}"
-            md += ":\n    ...\n```\n\n"
-        
-        return md
+                out.write(f" -> {func['returns']}")
+            out.write(":\n    ...\n```\n\n")
     
-    def generate_project_docs(self, directory: str, output_path: Optional[str] = None) -> str:
+    def generate_project_docs(self, directory: str, output_path: Optional[str] = None,
+                              workers: Optional[int] = None, revision: Optional[str] = None) -> str:
         """
         Генерация документации для всего проекта
         
+        Для больших проектов лучше использовать write_project_docs: документ
+        пишется в поток по частям и не собирается в памяти целиком.
+        
         Args:
             directory: Путь к директории проекта
             output_path: Путь для сохранения
+            workers: Число процессов для параллельного анализа файлов
+            revision: Ревизия git: если задана, документируется коммит репозитория
+                      directory (файлы читаются из объектов git, без checkout)
             
         Returns:
             Markdown строка
         """
-        analysis = self.analyzer.analyze_directory(directory)
+        buffer = io.StringIO()
+        self.write_project_docs(directory, buffer, workers=workers, revision=revision)
+        md = buffer.getvalue()
+        
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(md)
         
-        md = "# Project Documentation\n\n"
-        md += f"**Directory:** `{analysis.get('directory', directory)}`\n\n"
+        return md
+    
+    def write_project_docs(self, directory: str, out: TextIO, workers: Optional[int] = None,
+                           revision: Optional[str] = None,
+                           search_index: Optional[SearchIndex] = None):
+        """
+        Запись документации проекта в поток
         
-        summary = analysis.get('summary', {})
-        md += f"**Summary:**\n"
-        md += f"- Total files: {summary.get('total_files', 0)}\n"
-        md += f"- Total classes: {summary.get('total_classes', 0)}\n"
-        md += f"- Total functions: {summary.get('total_functions', 0)}\n"
-        md += f"- Total lines: {summary.get('total_lines', 0)}\n\n"
+        Анализ потоковый: в памяти одновременно только один файл. Сводка
+        известна только после анализа всех файлов, а выводится в начале
+        документа, поэтому разделы файлов сначала пишутся в промежуточный
+        буфер (до SPOOL_MAX_SIZE в памяти, дальше - во временный файл) и
+        копируются в поток после заголовка.
         
-        md += "---\n\n"
+        При заданном cache_dir разделы файлов берутся из кэша фрагментов по
+        пути и хэшу содержимого файла, заново отрисовываются только
+        изменившиеся файлы.
         
-        files = analysis.get('files', [])
-        if not files:
-            md += "*Файлы не найдены или не удалось проанализировать*\n\n"
+        Args:
+            directory: Путь к директории проекта
+            out: Текстовый поток для записи
+            workers: Число процессов для параллельного анализа файлов
+            revision: Ревизия git (см. generate_project_docs)
+            search_index: Поисковый индекс, в который добавляются определения
+                          файлов по ходу анализа (опционально)
+        """
+        summary = {}
+        clone_index = CloneIndex()
+        if revision is not None:
+            # Заголовок и файлы относятся к одному коммиту, даже если ветка сдвинется
+            revision = resolve_revision(directory, revision)
+            file_infos = self.analyzer.analyze_git_revision_iter(directory, revision)
         else:
-            for file_info in files:
-                try:
-                    if 'error' in file_info:
-                        md += f"## {file_info.get('file', 'unknown')}\n\n"
-                        md += f"*Ошибка при анализе: {file_info.get('error', 'Unknown error')}*\n\n"
-                        md += "---\n\n"
-                        continue
-                    
-                    if not file_info.get('file'):
-                        continue
-                    
-                    md += f"## {file_info['file']}\n\n"
-                    md += self.generate_code_docs(file_info)
-                    md += "\n---\n\n"
-                except Exception as e:
-                    md += f"## {file_info.get('file', 'unknown')}\n\n"
-                    md += f"*Ошибка при генерации документации: {str(e)}*\n\n"
-                    md += "---\n\n"
-                    continue
+            file_infos = self.analyzer.analyze_directory_iter(directory, workers=workers)
+        
+        with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE, mode='w+',
+                                           encoding='utf-8') as sections:
+            new_fragments = []
+            for file_info, summary in file_infos:
+                sections.write(self.file_section(file_info, new_fragments,
+                                                 '' if revision is not None else directory))
+                if search_index is not None:
+                    search_index.add_file(file_info, '' if revision is not None else directory)
+                if len(new_fragments) >= self.FRAGMENT_BATCH_SIZE:
+                    self.fragment_cache.put_many(new_fragments)
+                    new_fragments = []
+                clone_index.add_file(file_info)
+            if new_fragments:
+                self.fragment_cache.put_many(new_fragments)
+            
+            self.write_project_header(directory, summary, clone_index.groups(), out,
+                                      revision=revision)
+            out.write("---\n\n")
+            
+            if not sections.tell():
+                out.write("*Файлы не найдены или не удалось проанализировать*\n\n")
+            else:
+                sections.seek(0)
+                shutil.copyfileobj(sections, out)
+    
+    def write_project_header(self, directory: str, summary: Dict[str, int],
+                             clone_groups: List[Dict[str, Any]], out: TextIO,
+                             revision: Optional[str] = None):
+        """
+        Запись заголовка документации проекта: сводки и раздела о дублирующемся коде
+        
+        Args:
+            directory: Путь к директории проекта
+            summary: Сводная статистика CodeAnalyzer
+            clone_groups: Группы дублирующегося кода (см. CloneIndex.groups)
+            out: Текстовый поток для записи
+            revision: SHA коммита (если документируется коммит git)
+        """
+        out.write("# Project Documentation\n\n")
+        out.write(f"**Directory:** `{directory}`\n\n")
+        if revision is not None:
+            out.write(f"**Revision:** `{revision}`\n\n")
+        
+        out.write("**Summary:**\n\n")
+        out.write(f"- Total files: {summary.get('total_files', 0)}\n")
+        out.write(f"- Total classes: {summary.get('total_classes', 0)}\n")
+        out.write(f"- Total functions: {summary.get('total_functions', 0)}\n")
+        out.write(f"- Total lines: {summary.get('total_lines', 0)}\n")
+        if summary.get('skipped_files'):
+            out.write(f"- Skipped files: {summary['skipped_files']}\n")
+        out.write("\n")
+        
+        self._write_clones_section(clone_groups, out)
+    
+    def _write_clones_section(self, groups: List[Dict[str, Any]], out: TextIO):
+        """Запись раздела о дублирующемся коде"""
+        if not groups:
+            return
+        
+        out.write("## Duplicated Code\n\n")
+        out.write(f"Найдено групп совпадающих фрагментов: {len(groups)}\n\n")
+        for number, group in enumerate(groups, 1):
+            out.write(f"**Группа {number}** ({group['size']} узлов AST, фрагментов: {len(group['fragments'])}):\n\n")
+            for fragment in group['fragments']:
+                out.write(f"- `{fragment['file']}`:{fragment['line_start']}-{fragment['line_end']} "
+                          f"`{fragment['name']}`\n")
+            out.write("\n")
+    
+    # Заголовки групп символов в отчете об изменениях
+    _SYMBOL_KIND_TITLES = (
+        ('module', 'Modules'),
+        ('class', 'Classes'),
+        ('function', 'Functions'),
+        ('method', 'Methods'),
+    )
+    
+    def generate_snapshot_diff(self, diff: Dict[str, Any],
+                               output_path: Optional[str] = None) -> str:
+        """
+        Генерация отчета об изменениях между двумя снимками проекта
+        
+        Args:
+            diff: Результат snapshot.diff_snapshots
+            output_path: Путь для сохранения (опционально)
+            
+        Returns:
+            Markdown строка
+        """
+        buffer = io.StringIO()
+        self.write_snapshot_diff(diff, buffer)
+        md = buffer.getvalue()
         
         if output_path:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(md)
         
         return md
-
+    
+    def write_snapshot_diff(self, diff: Dict[str, Any], out: TextIO):
+        """
+        Запись отчета об изменениях между двумя снимками проекта в поток
+        
+        Args:
+            diff: Результат snapshot.diff_snapshots
+            out: Текстовый поток для записи
+        """
+        out.write("# API Changes\n\n")
+        if diff.get('old_revision') or diff.get('new_revision'):
+            out.write(f"**From:** `{diff.get('old_revision') or '?'}` "
+                      f"**To:** `{diff.get('new_revision') or '?'}`\n\n")
+        
+        out.write("**Summary:**\n\n")
+        out.write(f"- Added: {len(diff['added'])}\n")
+        out.write(f"- Removed: {len(diff['removed'])}\n")
+        out.write(f"- Changed: {len(diff['changed'])}\n\n")
+        
+        if not (diff['added'] or diff['removed'] or diff['changed']):
+            out.write("*Изменений не найдено*\n")
+            return
+        
+        for title, entries in (('Added', diff['added']), ('Removed', diff['removed'])):
+            if not entries:
+                continue
+            out.write(f"## {title}\n\n")
+            for kind, kind_title in self._SYMBOL_KIND_TITLES:
+                group = [entry for entry in entries if entry['kind'] == kind]
+                if not group:
+                    continue
+                out.write(f"### {kind_title}\n\n")
+                for entry in group:
+                    if entry['signature']:
+                        out.write(f"- `{entry['name']}`: `{entry['signature']}` (`{entry['file']}`)\n")
+                    else:
+                        out.write(f"- `{entry['name']}` (`{entry['file']}`)\n")
+                out.write("\n")
+        
+        if diff['changed']:
+            out.write("## Changed\n\n")
+            for entry in diff['changed']:
+                out.write(f"### {entry['name']} ({entry['kind']})\n\n")
+                changes = entry['changes']
+                for field, label in (('kind', 'Kind'), ('signature', 'Signature')):
+                    if field in changes:
+                        old_value, new_value = changes[field]
+                        out.write(f"- {label}: `{old_value}` -> `{new_value}`\n")
+                if 'decorators' in changes:
+                    old_value, new_value = changes['decorators']
+                    out.write(f"- Decorators: `{', '.join(old_value) or '-'}` -> "
+                              f"`{', '.join(new_value) or '-'}`\n")
+                if 'docstring' in changes:
+                    out.write("- Docstring updated\n")
+                if 'file' in changes:
+                    old_value, new_value = changes['file']
+                    out.write(f"- Moved: `{old_value}` -> `{new_value}`\n")
+                out.write("\n")
+    
+    def file_section(self, file_info: Dict[str, Any],
+                     new_fragments: Optional[List[Tuple[str, str]]] = None,
+                     root: str = '') -> str:
+        """
+        Раздел документации проекта для одного файла с учетом кэша фрагментов
+        
+        Ключ раздела в кэше - путь относительно корня проекта и хэш
+        содержимого, а путь файла в тексте раздела хранится заменителем,
+        поэтому тот же проект в другом каталоге (например, заново
+        распакованный архив) использует те же разделы.
+        
+        Args:
+            file_info: Информация о файле из CodeAnalyzer
+            new_fragments: Список, в который добавляются новые фрагменты
+                           (ключ, текст) для сохранения в кэш одной транзакцией;
+                           если не задан, новый фрагмент сохраняется сразу
+            root: Корневая директория проекта
+            
+        Returns:
+            Markdown строка раздела
+        """
+        key = self._fragment_key(file_info, root)
+        file_path = file_info.get('file') or ''
+        section = self.fragment_cache.get(key) if key is not None else None
+        if section is not None:
+            return section.replace(self._PATH_PLACEHOLDER, file_path)
+        
+        section = self._render_file_section(file_info)
+        if key is not None:
+            stored = section.replace(file_path, self._PATH_PLACEHOLDER) if file_path else section
+            if new_fragments is not None:
+                new_fragments.append((key, stored))
+            else:
+                self.fragment_cache.put_many([(key, stored)])
+        return section
+    
+    # Заменитель пути файла в кэшированном разделе (в исходном коде NUL не встречается)
+    _PATH_PLACEHOLDER = '\0'
+    
+    def _fragment_key(self, file_info: Dict[str, Any], root: str = '') -> Optional[str]:
+        """Ключ раздела файла в кэше фрагментов (None - раздел не кэшируется)"""
+        if self.fragment_cache is None or not file_info.get('content_hash'):
+            return None
+        file_path = file_info.get('file') or ''
+        rel_path = os.path.relpath(file_path, root).replace(os.sep, '/') if root else file_path
+        key = f"{rel_path}\0{file_info['content_hash']}"
+        return hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    
+    def _render_file_section(self, file_info: Dict[str, Any]) -> str:
+        """
+        Генерация раздела документации проекта для одного файла
+        
+        Раздел собирается в отдельном буфере, чтобы при ошибке генерации
+        в документ не попал его незаконченный фрагмент.
+        """
+        if 'error' in file_info:
+            md = f"## {file_info.get('file', 'unknown')}\n\n"
+            md += f"*Ошибка при анализе: {file_info.get('error', 'Unknown error')}*\n\n"
+            md += "---\n\n"
+            return md
+        
+        if not file_info.get('file'):
+            return ''
+        
+        buffer = io.StringIO()
+        try:
+            buffer.write(f"## {file_info['file']}\n\n")
+            self.write_code_docs(file_info, buffer)
+            buffer.write("\n---\n\n")
+        except Exception as e:
+            md = f"## {file_info.get('file', 'unknown')}\n\n"
+            md += f"*Ошибка при генерации документации: {str(e)}*\n\n"
+            md += "---\n\n"
+            return md
+        return buffer.getvalue()
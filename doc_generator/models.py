@@ -0,0 +1,331 @@
+"""
+Компактная модель результатов анализа кода
+"""
+
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# __slots__ для dataclass доступны с Python 3.10; на старых версиях
+# модель остается обычными dataclass без экономии памяти
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def intern_name(name: Optional[str]) -> Optional[str]:
+    """Интернирование имени (одинаковые имена хранятся в одном экземпляре)"""
+    return sys.intern(name) if name else name
+
+
+def record_field(record: Any, name: str, default: Any = None) -> Any:
+    """
+    Поле результата анализа в любом из двух представлений
+
+    Args:
+        record: Словарь (формат to_dict) или модель (ModuleInfo, ClassInfo...)
+        name: Имя ключа словаря / атрибута модели
+        default: Значение при отсутствии поля
+
+    Returns:
+        Значение поля без преобразования модели в словарь
+    """
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+
+@lru_cache(maxsize=None)
+def _fields_getter(cls) -> attrgetter:
+    """Функция получения кортежа значений всех полей dataclass"""
+    return attrgetter(*[f.name for f in fields(cls)])
+
+
+class _CompactRecord:
+    """Компактная сериализация pickle: только кортеж значений полей"""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (self.__class__, _fields_getter(self.__class__)(self))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class ArgInfo(_CompactRecord):
+    """Аргумент функции"""
+
+    name: str
+    annotation: Optional[str] = None
+    default: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'name': self.name, 'annotation': self.annotation}
+        if self.default is not None:
+            result['default'] = self.default
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArgInfo':
+        return cls(intern_name(data['name']), data.get('annotation'), data.get('default'))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class FunctionInfo(_CompactRecord):
+    """Функция или метод"""
+
+    name: str
+    docstring: Optional[str] = None
+    args: List[ArgInfo] = field(default_factory=list)
+    returns: Optional[str] = None
+    line_start: int = 0
+    line_end: int = 0
+    decorators: List[str] = field(default_factory=list)
+    is_async: bool = False
+    nested_functions: List['FunctionInfo'] = field(default_factory=list)
+    # Остальные виды параметров; args - только позиционно-именованные. Обычно
+    # их нет, поэтому кортежи: пустой кортеж - общий объект и не занимает памяти
+    posonlyargs: Tuple[ArgInfo, ...] = ()
+    vararg: Optional[ArgInfo] = None
+    kwonlyargs: Tuple[ArgInfo, ...] = ()
+    kwarg: Optional[ArgInfo] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'name': self.name,
+            'docstring': self.docstring,
+            'args': [arg.to_dict() for arg in self.args],
+            'returns': self.returns,
+            'line_start': self.line_start,
+            'line_end': self.line_end,
+            'decorators': list(self.decorators),
+            'is_async': self.is_async,
+            'nested_functions': [func.to_dict() for func in self.nested_functions]
+        }
+        # Редкие виды параметров выводятся только при наличии
+        if self.posonlyargs:
+            result['posonlyargs'] = [arg.to_dict() for arg in self.posonlyargs]
+        if self.vararg is not None:
+            result['vararg'] = self.vararg.to_dict()
+        if self.kwonlyargs:
+            result['kwonlyargs'] = [arg.to_dict() for arg in self.kwonlyargs]
+        if self.kwarg is not None:
+            result['kwarg'] = self.kwarg.to_dict()
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FunctionInfo':
+        return cls(
+            name=intern_name(data['name']),
+            docstring=data.get('docstring'),
+            args=[ArgInfo.from_dict(arg) for arg in data.get('args', [])],
+            returns=data.get('returns'),
+            line_start=data.get('line_start', 0),
+            line_end=data.get('line_end', 0),
+            decorators=[intern_name(d) for d in data.get('decorators', [])],
+            is_async=data.get('is_async', False),
+            nested_functions=[cls.from_dict(f) for f in data.get('nested_functions', [])],
+            posonlyargs=tuple(ArgInfo.from_dict(arg) for arg in data.get('posonlyargs', ())),
+            vararg=ArgInfo.from_dict(data['vararg']) if data.get('vararg') else None,
+            kwonlyargs=tuple(ArgInfo.from_dict(arg) for arg in data.get('kwonlyargs', ())),
+            kwarg=ArgInfo.from_dict(data['kwarg']) if data.get('kwarg') else None
+        )
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class ClassInfo(_CompactRecord):
+    """Класс"""
+
+    name: str
+    qualname: str = ''
+    docstring: Optional[str] = None
+    line_start: int = 0
+    line_end: int = 0
+    methods: List[FunctionInfo] = field(default_factory=list)
+    attributes: List[str] = field(default_factory=list)
+    bases: List[str] = field(default_factory=list)
+    decorators: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'docstring': self.docstring,
+            'line_start': self.line_start,
+            'line_end': self.line_end,
+            'methods': [method.to_dict() for method in self.methods],
+            'attributes': list(self.attributes),
+            'bases': list(self.bases),
+            'decorators': list(self.decorators),
+            'qualname': self.qualname
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ClassInfo':
+        return cls(
+            name=intern_name(data['name']),
+            qualname=intern_name(data.get('qualname', data['name'])),
+            docstring=data.get('docstring'),
+            line_start=data.get('line_start', 0),
+            line_end=data.get('line_end', 0),
+            methods=[FunctionInfo.from_dict(m) for m in data.get('methods', [])],
+            attributes=[intern_name(a) for a in data.get('attributes', [])],
+            bases=[intern_name(b) for b in data.get('bases', [])],
+            decorators=[intern_name(d) for d in data.get('decorators', [])]
+        )
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class ImportInfo(_CompactRecord):
+    """Импорт (import x / from x import y)"""
+
+    type: str
+    names: List[str] = field(default_factory=list)
+    module: Optional[str] = None
+    level: int = 0
+    # Имена после 'as' для каждого из names (None - без псевдонима); пусто, если псевдонимов нет
+    asnames: List[Optional[str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.type == 'import':
+            result = {'type': 'import', 'names': list(self.names)}
+        else:
+            result = {
+                'type': 'from',
+                'module': self.module,
+                'names': list(self.names),
+                'level': self.level
+            }
+        if self.asnames:
+            result['asnames'] = list(self.asnames)
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ImportInfo':
+        return cls(
+            type=data.get('type', 'import'),
+            names=[intern_name(n) for n in data.get('names', [])],
+            module=intern_name(data.get('module')),
+            level=data.get('level', 0),
+            asnames=[intern_name(n) for n in data.get('asnames', [])]
+        )
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class RouteInfo(_CompactRecord):
+    """Маршрут Flask (декоратор route/get/post... или вызов add_url_rule)"""
+
+    rule: str
+    methods: List[str] = field(default_factory=list)
+    # Объект, на котором зарегистрирован маршрут, как записан в коде ('app', 'bp', 'self.app')
+    owner: str = ''
+    # Полное имя функции или класса представления в модуле
+    view: str = ''
+    line: int = 0
+    docstring: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rule': self.rule,
+            'methods': list(self.methods),
+            'owner': self.owner,
+            'view': self.view,
+            'line': self.line,
+            'docstring': self.docstring
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RouteInfo':
+        return cls(
+            rule=data['rule'],
+            methods=list(data.get('methods', [])),
+            owner=intern_name(data.get('owner', '')),
+            view=intern_name(data.get('view', '')),
+            line=data.get('line', 0),
+            docstring=data.get('docstring')
+        )
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class ModuleInfo(_CompactRecord):
+    """Результат анализа одного файла"""
+
+    file: Optional[str]
+    classes: List[ClassInfo] = field(default_factory=list)
+    functions: List[FunctionInfo] = field(default_factory=list)
+    imports: List[ImportInfo] = field(default_factory=list)
+    module_docstring: Optional[str] = None
+    line_count: int = 0
+    error: Optional[str] = None
+    # Причина пропуска файла, превысившего лимиты анализа
+    skipped: Optional[str] = None
+    # Вызовы: полное имя функции в модуле -> имена вызываемых (как записаны в коде)
+    calls: Dict[str, List[str]] = field(default_factory=dict)
+    # Хэши нормализованных фрагментов кода: (хэш, имя, первая строка, последняя строка, число узлов)
+    fragments: List[Tuple[str, str, int, int, int]] = field(default_factory=list)
+    # Хэш содержимого файла (SHA blob git), если результат получен через кэш анализа
+    content_hash: Optional[str] = None
+    # Маршруты Flask, объявленные в файле
+    routes: List[RouteInfo] = field(default_factory=list)
+    # Объекты Blueprint: (имя переменной, url_prefix, строка)
+    blueprints: List[Tuple[str, Optional[str], int]] = field(default_factory=list)
+    # Вызовы register_blueprint: (приложение, blueprint как записан в коде, url_prefix)
+    blueprint_registrations: List[Tuple[str, str, Optional[str]]] = field(default_factory=list)
+
+    def to_dict(self, internal: bool = False) -> Dict[str, Any]:
+        """
+        Представление в виде словаря (формат CodeAnalyzer.analyze_source)
+
+        Args:
+            internal: Добавить служебные поля calls, fragments и content_hash
+                      (для кэша анализа и построения графов проекта)
+        """
+        if self.error is not None:
+            return {'error': self.error, 'file': self.file}
+        if self.skipped is not None:
+            return {'file': self.file, 'skipped': self.skipped, 'line_count': self.line_count}
+        result = {
+            'file': self.file,
+            'classes': [cls.to_dict() for cls in self.classes],
+            'functions': [func.to_dict() for func in self.functions],
+            'imports': [imp.to_dict() for imp in self.imports],
+            'module_docstring': self.module_docstring,
+            'line_count': self.line_count
+        }
+        if internal:
+            result['calls'] = {caller: list(callees) for caller, callees in self.calls.items()}
+            result['fragments'] = [list(fragment) for fragment in self.fragments]
+            if self.content_hash is not None:
+                result['content_hash'] = self.content_hash
+        # Данные Flask есть в немногих файлах и выводятся только при наличии
+        if self.routes:
+            result['routes'] = [route.to_dict() for route in self.routes]
+        if self.blueprints:
+            result['blueprints'] = [list(blueprint) for blueprint in self.blueprints]
+        if self.blueprint_registrations:
+            result['blueprint_registrations'] = [list(registration)
+                                                 for registration in self.blueprint_registrations]
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ModuleInfo':
+        if 'error' in data:
+            return cls(file=data.get('file'), error=data['error'])
+        if 'skipped' in data:
+            return cls(file=data.get('file'), skipped=data['skipped'],
+                       line_count=data.get('line_count', 0))
+        return cls(
+            file=data.get('file'),
+            classes=[ClassInfo.from_dict(c) for c in data.get('classes', [])],
+            functions=[FunctionInfo.from_dict(f) for f in data.get('functions', [])],
+            imports=[ImportInfo.from_dict(i) for i in data.get('imports', [])],
+            module_docstring=data.get('module_docstring'),
+            line_count=data.get('line_count', 0),
+            calls={intern_name(caller): [intern_name(c) for c in callees]
+                   for caller, callees in data.get('calls', {}).items()},
+            fragments=[tuple(fragment) for fragment in data.get('fragments', [])],
+            content_hash=data.get('content_hash'),
+            routes=[RouteInfo.from_dict(r) for r in data.get('routes', [])],
+            blueprints=[tuple(blueprint) for blueprint in data.get('blueprints', [])],
+            blueprint_registrations=[tuple(registration)
+                                     for registration in data.get('blueprint_registrations', [])]
+        )
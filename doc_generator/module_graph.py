@@ -0,0 +1,75 @@
+"""
+Граф зависимостей (импортов) между модулями проекта
+"""
+
+from typing import List, Optional, Tuple
+
+from .graph_utils import EdgeListGraph, condense, strongly_connected_components, transitive_reduction
+from .symbol_index import SymbolIndex
+
+
+class ModuleGraph(EdgeListGraph):
+    """
+    Граф импортов между модулями проекта
+
+    Ребро importer -> imported строится по импортам из SymbolIndex, где
+    относительные импорты уже разрешены по level. Импорт модуля вне
+    проекта не учитывается; импорт отсутствующего подмодуля ('import
+    pkg.sub.missing') относится к ближайшему модулю проекта (pkg.sub).
+    """
+
+    @classmethod
+    def build(cls, symbol_index: SymbolIndex) -> 'ModuleGraph':
+        """
+        Построение графа по индексу символов
+
+        Args:
+            symbol_index: Индекс символов проекта (после finalize())
+
+        Returns:
+            Граф зависимостей модулей
+        """
+        graph = cls()
+        for module in sorted(symbol_index.modules):
+            graph.node_id(module)
+        for module in sorted(symbol_index.modules):
+            for target in sorted(symbol_index.imports_of(module)):
+                imported = cls._project_module(target, symbol_index)
+                if imported is not None and imported != module:
+                    graph.add_edge(module, imported)
+        return graph
+
+    @staticmethod
+    def _project_module(target: str, symbol_index: SymbolIndex) -> Optional[str]:
+        """Ближайший модуль проекта для импортируемого имени"""
+        while target:
+            if target in symbol_index.modules:
+                return target
+            target = target.rpartition('.')[0]
+        return None
+
+    def cycles(self) -> List[List[str]]:
+        """
+        Циклические зависимости: компоненты сильной связности из нескольких модулей
+
+        Returns:
+            Списки имен модулей, каждый список и модули в нем отсортированы
+        """
+        component, count = strongly_connected_components(len(self.nodes), self.sources, self.targets)
+        return sorted(sorted(group) for group in self.component_groups(component, count)
+                      if len(group) > 1)
+
+    def reduced(self) -> Tuple[List[List[str]], List[Tuple[int, int]]]:
+        """
+        Граф для диаграммы: циклы сжаты в вершины, лишние ребра удалены
+
+        После сжатия компонент сильной связности граф ациклический, и к нему
+        применяется транзитивное сокращение: ребро a -> c не выводится, если
+        есть путь a -> b -> c. Достижимость между модулями при этом не меняется.
+
+        Returns:
+            Пара (группы имен модулей, ребра между группами в виде пар номеров)
+        """
+        component, count, sources, targets = condense(len(self.nodes), self.sources, self.targets)
+        sources, targets = transitive_reduction(count, sources, targets)
+        return self.component_groups(component, count), list(zip(sources, targets))
@@ -23,7 +23,7 @@ class PDFGenerator:
         Args:
             template_path: Путь к шаблону (опционально, для будущей поддержки HTML шаблонов)
             data: Данные для документа
-            output_path: Путь для сохранения
+            output_path: Путь (или файловый объект) для сохранения
             
         Returns:
             Путь к сгенерированному файлу
@@ -79,7 +79,8 @@ class PDFGenerator:
             pdf.cell(0, 5, f"Подпись: {data['signature']}", ln=True)
         
         # Сохранение
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        if isinstance(output_path, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         pdf.output(output_path)
         
         return output_path
@@ -0,0 +1,301 @@
+"""
+Инвертированный индекс для поиска по документации проекта
+"""
+
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from .symbol_index import module_name_from_path
+
+
+# Версия формата сохраненного индекса
+INDEX_VERSION = 1
+
+# Поля документа и их вес при ранжировании
+FIELD_WEIGHTS = {
+    'name': 8,
+    'args': 3,
+    'path': 2,
+    'doc': 1,
+}
+
+# Слова без подчеркиваний (латиница, кириллица, цифры)
+_WORD_RE = re.compile(r'[^\W_]+')
+# Части идентификатора в camelCase: 'parseHTTPResponse' -> parse, HTTP, Response
+_CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+|[^\W\d_A-Za-z]+')
+
+# Частые слова docstring, не несущие смысла для поиска
+STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'with', 'this', 'that', 'from', 'are', 'is', 'of', 'to', 'in',
+    'or', 'an', 'be', 'by', 'on', 'as', 'it', 'if', 'not', 'none', 'returns', 'args',
+    'для', 'или', 'при', 'не', 'на', 'по', 'из', 'от', 'до', 'как', 'что', 'это',
+})
+
+# Документ: (полное имя, вид, путь к файлу от корня проекта, строка, страница сайта)
+Document = Tuple[str, str, str, int, Optional[str]]
+
+
+def tokenize_identifier(name: str) -> List[str]:
+    """
+    Термы идентификатора: имя целиком и его части по '_' и camelCase
+
+    Args:
+        name: Идентификатор
+
+    Returns:
+        Термы в нижнем регистре без повторов
+    """
+    tokens = {name.lower()}
+    for word in _WORD_RE.findall(name):
+        tokens.add(word.lower())
+        for part in _CAMEL_RE.findall(word):
+            tokens.add(part.lower())
+    return list(tokens)
+
+
+def tokenize_text(text: str) -> List[str]:
+    """
+    Термы произвольного текста (docstring, поисковый запрос)
+
+    Args:
+        text: Текст
+
+    Returns:
+        Слова в нижнем регистре длиной от двух символов без стоп-слов, без повторов
+    """
+    tokens = set()
+    for word in _WORD_RE.findall(text):
+        for part in [word, *_CAMEL_RE.findall(word)]:
+            part = part.lower()
+            if len(part) > 1 and part not in STOP_WORDS:
+                tokens.add(part)
+    return list(tokens)
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс имен классов, функций, аргументов и docstring
+
+    Кроме собственного имени определения индексируются имена модуля
+    и класса, в которых оно находится (поле 'path'), поэтому запрос
+    'json loads' находит json.loads.
+
+    Для каждого поля и терма хранится возрастающий список номеров
+    документов. Индекс строится один раз при генерации документации по
+    результатам CodeAnalyzer и сохраняется в компактный JSON (номера
+    документов в списках записаны разностями), поиск по нему не требует
+    чтения исходных файлов.
+    """
+
+    def __init__(self):
+        """Инициализация пустого индекса"""
+        self.documents: List[Document] = []
+        # Поле -> терм -> номера документов по возрастанию
+        self._postings: Dict[str, Dict[str, array]] = {field: {} for field in FIELD_WEIGHTS}
+        # Отсортированный список всех термов для поиска по префиксу
+        self._terms: Optional[List[str]] = None
+
+    def add_file(self, file_info: Any, root: str = '', page: Optional[str] = None):
+        """
+        Добавление определений одного файла
+
+        Args:
+            file_info: Результат анализа файла (словарь или ModuleInfo)
+            root: Корневая директория проекта (для имен модулей)
+            page: Страница сайта документации с этим файлом (опционально)
+        """
+        if not isinstance(file_info, dict):
+            file_info = file_info.to_dict()
+        file_path = file_info.get('file')
+        if not file_path or 'error' in file_info or 'skipped' in file_info:
+            return
+
+        module = module_name_from_path(file_path, root)
+        # В индексе путь относительно корня: директория анализа может быть временной
+        file_path = (os.path.relpath(file_path, root) if root else file_path).replace(os.sep, '/')
+        prefix = f"{module}." if module else ''
+        if module:
+            self._add_document((module, 'module', file_path, 1, page),
+                               module.rpartition('.')[2], (), file_info.get('module_docstring'))
+        for cls in file_info.get('classes', []):
+            class_name = prefix + (cls.get('qualname') or cls['name'])
+            self._add_document((class_name, 'class', file_path, cls.get('line_start', 0), page),
+                               cls['name'], (), cls.get('docstring'))
+            for method in cls.get('methods', []):
+                self._add_function(method, f"{class_name}.", 'method', file_path, page)
+        for func in file_info.get('functions', []):
+            self._add_function(func, prefix, 'function', file_path, page)
+
+    def _add_function(self, func: Dict[str, Any], prefix: str, kind: str, file_path: str,
+                      page: Optional[str]):
+        """Добавление функции или метода"""
+        args = [arg['name'] for arg in func.get('args', []) if arg['name'] not in ('self', 'cls')]
+        self._add_document((prefix + func['name'], kind, file_path, func.get('line_start', 0), page),
+                           func['name'], args, func.get('docstring'))
+
+    def _add_document(self, document: Document, name: str, args: Iterable[str],
+                      docstring: Optional[str]):
+        """Добавление документа и его термов по полям"""
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        self._terms = None
+
+        arg_terms = set()
+        for arg in args:
+            arg_terms.update(tokenize_identifier(arg))
+        path_terms = set()
+        for part in document[0].split('.')[:-1]:
+            path_terms.update(tokenize_identifier(part))
+        fields = {
+            'name': tokenize_identifier(name),
+            'args': arg_terms,
+            'path': path_terms,
+            'doc': tokenize_text(docstring) if docstring else (),
+        }
+        for field, terms in fields.items():
+            postings = self._postings[field]
+            for term in terms:
+                doc_ids = postings.get(term)
+                if doc_ids is None:
+                    doc_ids = postings[term] = array('I')
+                doc_ids.append(doc_id)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Поиск документов, содержащих все слова запроса
+
+        Последнее слово запроса ищется и как префикс, поэтому индекс подходит
+        для поиска по мере ввода. Совпадение в имени весит больше, чем
+        в аргументах и docstring, точное совпадение - больше, чем по префиксу.
+
+        Args:
+            query: Строка запроса
+            limit: Максимальное число результатов
+
+        Returns:
+            Список {'name', 'kind', 'file', 'line', 'page', 'score'} по убыванию релевантности
+        """
+        words = [word.lower() for word in _WORD_RE.findall(query)]
+        if not words:
+            return []
+
+        scores: Optional[Dict[int, int]] = None
+        for position, word in enumerate(words):
+            word_scores = self._score_term(word, exact_bonus=2)
+            if position == len(words) - 1 and len(word) > 1:
+                for term in self._prefixed_terms(word):
+                    if term != word:
+                        for doc_id, score in self._score_term(term, exact_bonus=1).items():
+                            if score > word_scores.get(doc_id, 0):
+                                word_scores[doc_id] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {doc_id: score + word_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in word_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.documents[item[0]][0]))
+        results = []
+        for doc_id, score in ranked[:limit]:
+            name, kind, file_path, line, page = self.documents[doc_id]
+            results.append({'name': name, 'kind': kind, 'file': file_path, 'line': line,
+                            'page': page, 'score': score})
+        return results
+
+    def _score_term(self, term: str, exact_bonus: int) -> Dict[int, int]:
+        """Вес документов, содержащих терм, по всем полям"""
+        scores: Dict[int, int] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for doc_id in self._postings[field].get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0) + weight * exact_bonus
+        return scores
+
+    def _term_list(self) -> List[str]:
+        """Отсортированный список всех термов (строится при первом обращении)"""
+        if self._terms is None:
+            terms = set()
+            for postings in self._postings.values():
+                terms.update(postings)
+            self._terms = sorted(terms)
+        return self._terms
+
+    def _prefixed_terms(self, prefix: str) -> List[str]:
+        """Термы индекса, начинающиеся с префикса"""
+        terms = self._term_list()
+        result = []
+        for term in terms[bisect_left(terms, prefix):]:
+            if not term.startswith(prefix):
+                break
+            result.append(term)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация в JSON-совместимый словарь"""
+        postings = {}
+        for field, terms in self._postings.items():
+            encoded = {}
+            for term, doc_ids in terms.items():
+                previous = 0
+                deltas = []
+                for doc_id in doc_ids:
+                    deltas.append(doc_id - previous)
+                    previous = doc_id
+                encoded[term] = deltas
+            postings[field] = encoded
+        return {
+            'version': INDEX_VERSION,
+            'documents': [list(document) for document in self.documents],
+            'postings': postings
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SearchIndex':
+        """Восстановление индекса из словаря to_dict()"""
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Неподдерживаемая версия индекса: {data.get('version')}")
+        index = cls()
+        index.documents = [tuple(document) for document in data.get('documents', [])]
+        for field, terms in data.get('postings', {}).items():
+            if field not in index._postings:
+                continue
+            decoded = index._postings[field]
+            for term, deltas in terms.items():
+                doc_ids = array('I')
+                current = 0
+                for delta in deltas:
+                    current += delta
+                    doc_ids.append(current)
+                decoded[term] = doc_ids
+        # Загруженный индекс используется для поиска: список термов нужен сразу
+        index._term_list()
+        return index
+
+    def save(self, path: str):
+        """
+        Сохранение индекса в JSON файл
+
+        Args:
+            path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        """
+        Загрузка индекса из JSON файла
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            Индекс
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
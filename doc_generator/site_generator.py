@@ -0,0 +1,371 @@
+"""
+Генератор документации проекта в виде многостраничного HTML сайта
+"""
+
+import hashlib
+import html
+import io
+import os
+import re
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import markdown
+import pygments
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
+
+from .cache import LRUCache
+from .clone_detector import CloneIndex
+from .code_analyzer import process_pool_context
+from .fragment_cache import HighlightCache
+from .git_source import resolve_revision
+from .markdown_generator import MarkdownGenerator
+from .search_index import SearchIndex
+from .symbol_index import module_name_from_path
+
+
+# Стиль подсветки кода pygments
+HIGHLIGHT_STYLE = 'default'
+
+# Блок кода Markdown в начале строки: ```язык ... ```
+_FENCED_CODE_RE = re.compile(r'^```([\w+-]*)[ \t]*\n(.*?)^```[ \t]*$', re.M | re.S)
+
+# Страница: (имя файла, заголовок, текст Markdown)
+Page = Tuple[str, str, str]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="style.css">
+</head>
+<body>
+<nav class="sidebar">
+<p><a href="index.html">Оглавление проекта</a></p>
+{toc}
+</nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+SITE_CSS = """body { margin: 0; font-family: sans-serif; line-height: 1.5; display: flex; }
+.sidebar { width: 18em; flex-shrink: 0; padding: 1em; border-right: 1px solid #ddd;
+           position: sticky; top: 0; height: 100vh; overflow-y: auto; box-sizing: border-box; }
+main { padding: 1em 2em; max-width: 60em; min-width: 0; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ddd; padding: 0.25em 0.5em; }
+code { background: #f5f5f5; }
+.highlight pre { padding: 0.5em; overflow-x: auto; }
+"""
+
+
+class CodeHighlighter:
+    """
+    Подсветка блоков кода pygments с кэшем по хэшу содержимого
+
+    Готовый HTML хранится в LRU кэше в памяти и, при заданном cache_dir,
+    в постоянном кэше HighlightCache, общем для всех процессов.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, maxsize: int = 4096):
+        """
+        Инициализация подсветки
+
+        Args:
+            cache_dir: Директория постоянного кэша (опционально)
+            maxsize: Число блоков в кэше в памяти
+        """
+        self.formatter = HtmlFormatter(style=HIGHLIGHT_STYLE)
+        self.memory = LRUCache(maxsize)
+        self.disk = (HighlightCache(cache_dir, f'{pygments.__version__}/{HIGHLIGHT_STYLE}')
+                     if cache_dir else None)
+        # Новые блоки (ключ, HTML), еще не сохраненные в постоянный кэш
+        self._pending: List[Tuple[str, str]] = []
+
+    def highlight(self, code: str, language: str) -> str:
+        """
+        HTML блока кода с подсветкой
+
+        Args:
+            code: Текст блока
+            language: Имя языка (пустая строка - без подсветки)
+
+        Returns:
+            HTML фрагмент <div class="highlight">
+        """
+        key = hashlib.blake2b(f'{language}\0{code}'.encode('utf-8', 'surrogatepass'),
+                              digest_size=16).hexdigest()
+        result = self.memory.get(key)
+        if result is None:
+            result = self.disk.get(key) if self.disk is not None else None
+            if result is None:
+                try:
+                    lexer = get_lexer_by_name(language) if language else TextLexer()
+                except ClassNotFound:
+                    lexer = TextLexer()
+                result = highlight(code, lexer, self.formatter)
+                if self.disk is not None:
+                    self._pending.append((key, result))
+            self.memory.put(key, result)
+        return result
+
+    def flush(self):
+        """Сохранение новых блоков в постоянный кэш одной транзакцией"""
+        if self._pending:
+            self.disk.put_many(self._pending)
+            self._pending = []
+
+    def style_defs(self) -> str:
+        """CSS стиля подсветки"""
+        return self.formatter.get_style_defs('.highlight')
+
+
+class PageRenderer:
+    """Перевод страниц Markdown в HTML и запись их в директорию сайта"""
+
+    def __init__(self, output_dir: str, highlighter: CodeHighlighter):
+        """
+        Инициализация
+
+        Args:
+            output_dir: Директория сайта
+            highlighter: Подсветка блоков кода
+        """
+        self.output_dir = output_dir
+        self.highlighter = highlighter
+        self._markdown = markdown.Markdown(extensions=['tables', 'toc'])
+
+    def render(self, text: str) -> Tuple[str, str]:
+        """
+        Перевод Markdown в HTML
+
+        Блоки кода подсвечиваются отдельно и подставляются в готовый HTML
+        вместо комментариев-меток, поэтому markdown их не разбирает.
+
+        Args:
+            text: Текст Markdown
+
+        Returns:
+            Пара (HTML тела страницы, HTML оглавления страницы)
+        """
+        token = uuid.uuid4().hex
+        blocks = []
+
+        def stash(match):
+            blocks.append(self.highlighter.highlight(match.group(2), match.group(1)))
+            return f'\n<!--code-{token}-{len(blocks) - 1}-->\n'
+
+        text = _FENCED_CODE_RE.sub(stash, text)
+        self._markdown.reset()
+        body = self._markdown.convert(text)
+        if blocks:
+            body = re.sub(f'<!--code-{token}-(\\d+)-->', lambda m: blocks[int(m.group(1))], body)
+        return body, self._markdown.toc
+
+    def write_pages(self, pages: List[Page]):
+        """
+        Запись порции страниц
+
+        Args:
+            pages: Страницы (имя файла, заголовок, текст Markdown)
+        """
+        for filename, title, text in pages:
+            body, toc = self.render(text)
+            with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(PAGE_TEMPLATE.format(title=html.escape(title), toc=toc, body=body))
+        self.highlighter.flush()
+
+
+class SiteGenerator:
+    """
+    Генератор документации проекта в виде многостраничного HTML сайта
+
+    Каждому модулю соответствует своя страница, index.html содержит сводку,
+    раздел о дублирующемся коде и оглавление, search_index.json - поисковый
+    индекс (см. SearchIndex). Текст страниц берется из
+    MarkdownGenerator вместе с его кэшем фрагментов; перевод в HTML
+    с подсветкой кода выполняется порциями в пуле процессов.
+    """
+
+    # Число страниц в одной порции задания для процесса
+    PAGE_BATCH_SIZE = 16
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 markdown_generator: Optional[MarkdownGenerator] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Инициализация генератора
+
+        Args:
+            cache_dir: Директория постоянного кэша анализа, фрагментов
+                       и подсвеченного кода (опционально)
+            markdown_generator: Генератор Markdown (по умолчанию создается
+                                с тем же cache_dir)
+            max_workers: Верхняя граница числа процессов в generate_site
+                         (по умолчанию число процессоров, но не больше 4)
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        self.markdown_generator = markdown_generator or MarkdownGenerator(cache_dir=cache_dir)
+
+    def generate_site(self, directory: str, output_dir: str, workers: Optional[int] = None,
+                      revision: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Генерация сайта документации проекта
+
+        Args:
+            directory: Путь к директории проекта
+            output_dir: Директория для файлов сайта
+            workers: Число процессов для анализа файлов и отрисовки страниц
+                     (не больше max_workers)
+            revision: Ревизия git: если задана, документируется коммит
+                      репозитория directory
+
+        Returns:
+            Словарь с путями к index.html и поисковому индексу (search_index.json),
+            числом страниц и сводкой анализа
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        if workers:
+            workers = min(workers, self.max_workers)
+        analyzer = self.markdown_generator.analyzer
+        if revision is not None:
+            revision = resolve_revision(directory, revision)
+            file_infos = analyzer.analyze_git_revision_iter(directory, revision)
+            root = ''
+        else:
+            file_infos = analyzer.analyze_directory_iter(directory, workers=workers)
+            root = directory
+
+        state = {'summary': {}, 'entries': [], 'clone_index': CloneIndex(),
+                 'search_index': SearchIndex()}
+        batches = self._iter_page_batches(file_infos, root, state)
+        if workers and workers > 1:
+            self._write_pages_parallel(batches, output_dir, workers)
+        else:
+            renderer = PageRenderer(output_dir, CodeHighlighter(self.cache_dir))
+            for batch in batches:
+                renderer.write_pages(batch)
+
+        renderer = PageRenderer(output_dir, CodeHighlighter(self.cache_dir))
+        index = io.StringIO()
+        self.markdown_generator.write_project_header(directory, state['summary'],
+                                                     state['clone_index'].groups(), index,
+                                                     revision=revision)
+        self._write_contents(state['entries'], index)
+        renderer.write_pages([('index.html', 'Project Documentation', index.getvalue())])
+        with open(os.path.join(output_dir, 'style.css'), 'w', encoding='utf-8') as f:
+            f.write(SITE_CSS)
+            f.write(renderer.highlighter.style_defs())
+        search_index_path = os.path.join(output_dir, 'search_index.json')
+        state['search_index'].save(search_index_path)
+
+        return {
+            'index': os.path.join(output_dir, 'index.html'),
+            'search_index': search_index_path,
+            'pages': len(state['entries']),
+            'summary': state['summary']
+        }
+
+    def _iter_page_batches(self, file_infos: Iterator[Tuple[Dict[str, Any], Dict[str, int]]],
+                           root: str, state: Dict[str, Any]) -> Iterator[List[Page]]:
+        """
+        Порции страниц по результатам анализа
+
+        Попутно заполняет state: сводку, записи оглавления, индекс дубликатов
+        и поисковый индекс.
+        """
+        markdown_generator = self.markdown_generator
+        used_names = {'index'}
+        new_fragments = []
+        batch = []
+        for file_info, summary in file_infos:
+            state['summary'] = summary
+            state['clone_index'].add_file(file_info)
+            section = markdown_generator.file_section(file_info, new_fragments, root)
+            if len(new_fragments) >= markdown_generator.FRAGMENT_BATCH_SIZE:
+                markdown_generator.fragment_cache.put_many(new_fragments)
+                new_fragments = []
+            if not section:
+                continue
+
+            file_path = file_info.get('file', 'unknown')
+            module = module_name_from_path(file_path, root) or '__init__'
+            filename = self._page_filename(module, used_names)
+            rel_path = os.path.relpath(file_path, root) if root else file_path
+            state['entries'].append((module, filename, rel_path.replace(os.sep, '/')))
+            state['search_index'].add_file(file_info, root, page=filename)
+            batch.append((filename, module, section))
+            if len(batch) >= self.PAGE_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        if new_fragments:
+            markdown_generator.fragment_cache.put_many(new_fragments)
+
+    def _write_pages_parallel(self, batches: Iterator[List[Page]], output_dir: str, workers: int):
+        """Отрисовка порций страниц в пуле процессов с ограниченным числом порций в работе"""
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context(),
+                                 initializer=_init_site_worker,
+                                 initargs=(output_dir, self.cache_dir)) as executor:
+            pending = deque()
+            for batch in batches:
+                pending.append(executor.submit(_write_pages_worker, batch))
+                if len(pending) >= workers * 2:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+
+    @staticmethod
+    def _page_filename(module: str, used_names: set) -> str:
+        """Уникальное имя файла страницы модуля"""
+        base = re.sub(r'[^\w.-]', '_', module)
+        name = base
+        counter = 1
+        while name.lower() in used_names:
+            counter += 1
+            name = f"{base}-{counter}"
+        used_names.add(name.lower())
+        return f"{name}.html"
+
+    @staticmethod
+    def _write_contents(entries: List[Tuple[str, str, str]], out: io.StringIO):
+        """Запись оглавления: модули, сгруппированные по пакетам"""
+        out.write("## Contents\n\n")
+        if not entries:
+            out.write("*Файлы не найдены или не удалось проанализировать*\n\n")
+            return
+
+        package = None
+        for module, filename, rel_path in sorted(entries):
+            module_package = module.rpartition('.')[0]
+            if module_package != package:
+                package = module_package
+                out.write(f"\n### {package or '(корень проекта)'}\n\n")
+            out.write(f"- [{module}]({filename}) - `{rel_path}`\n")
+        out.write("\n")
+
+
+# Отрисовщик страниц процесса пула
+_worker_renderer: Optional[PageRenderer] = None
+
+
+def _init_site_worker(output_dir: str, cache_dir: Optional[str]):
+    """Инициализация процесса пула: markdown и pygments настраиваются один раз на процесс"""
+    global _worker_renderer
+    _worker_renderer = PageRenderer(output_dir, CodeHighlighter(cache_dir))
+
+
+def _write_pages_worker(pages: List[Page]):
+    """Отрисовка порции страниц в процессе пула"""
+    _worker_renderer.write_pages(pages)
@@ -0,0 +1,244 @@
+"""
+Снимки публичного интерфейса проекта и их сравнение
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Optional
+
+from .symbol_index import module_name_from_path
+
+
+# Версия формата снимка
+SNAPSHOT_VERSION = 1
+
+# Поля записи символа: вид, файл, строка, сигнатура, декораторы, хэш docstring
+_KIND, _FILE, _LINE, _SIGNATURE, _DECORATORS, _DOC = range(6)
+
+# Поля, изменения которых попадают в отчет, и их названия
+COMPARED_FIELDS = {
+    _SIGNATURE: 'signature',
+    _DECORATORS: 'decorators',
+    _DOC: 'docstring',
+    _FILE: 'file',
+}
+
+
+def _format_arg(arg: Dict[str, Any]) -> str:
+    """Параметр функции: 'a', 'a=1', 'a: int = 1'"""
+    text = arg['name']
+    if arg.get('annotation'):
+        text += f": {arg['annotation']}"
+    if arg.get('default') is not None:
+        text += f" = {arg['default']}" if arg.get('annotation') else f"={arg['default']}"
+    return text
+
+
+def format_signature(func: Dict[str, Any]) -> str:
+    """
+    Сигнатура функции в виде строки
+
+    Args:
+        func: Информация о функции из CodeAnalyzer
+
+    Returns:
+        Строка вида 'async def name(a, /, b: int = 1, *args, c, **kw) -> str'
+    """
+    args = [_format_arg(arg) for arg in func.get('posonlyargs', [])]
+    if args:
+        args.append('/')
+    args.extend(_format_arg(arg) for arg in func.get('args', []))
+    if func.get('vararg'):
+        args.append('*' + _format_arg(func['vararg']))
+    elif func.get('kwonlyargs'):
+        args.append('*')
+    args.extend(_format_arg(arg) for arg in func.get('kwonlyargs', []))
+    if func.get('kwarg'):
+        args.append('**' + _format_arg(func['kwarg']))
+    signature = f"def {func['name']}({', '.join(args)})"
+    if func.get('is_async'):
+        signature = 'async ' + signature
+    if func.get('returns'):
+        signature += f" -> {func['returns']}"
+    return signature
+
+
+def _doc_hash(docstring: Optional[str]) -> Optional[str]:
+    """Короткий хэш docstring (снимок не хранит сами тексты)"""
+    if not docstring:
+        return None
+    return hashlib.blake2b(docstring.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+class AnalysisSnapshot:
+    """
+    Снимок определений проекта: модулей, классов, функций и методов
+
+    Символы хранятся в словаре по стабильному ключу - полному имени
+    (pkg.module.Class.method), который не зависит от порядка файлов,
+    номеров строк и директории, в которой выполнялся анализ.
+    """
+
+    def __init__(self, revision: Optional[str] = None):
+        """
+        Инициализация пустого снимка
+
+        Args:
+            revision: Метка версии проекта (тег, SHA коммита; опционально)
+        """
+        self.revision = revision
+        # Полное имя -> [вид, файл, строка, сигнатура, декораторы, хэш docstring]
+        self.symbols: Dict[str, List[Any]] = {}
+
+    @classmethod
+    def from_analysis(cls, analysis: Dict[str, Any]) -> 'AnalysisSnapshot':
+        """
+        Снимок по результату CodeAnalyzer.analyze_directory или analyze_git_revision
+
+        Args:
+            analysis: Результат анализа проекта
+
+        Returns:
+            Снимок
+        """
+        snapshot = cls(analysis.get('revision'))
+        root = '' if 'revision' in analysis else analysis.get('directory', '')
+        for file_info in analysis.get('files', []):
+            snapshot.add_file(file_info, root)
+        return snapshot
+
+    def add_file(self, file_info: Any, root: str = ''):
+        """
+        Добавление определений одного файла
+
+        Args:
+            file_info: Результат анализа файла (словарь или ModuleInfo)
+            root: Корневая директория проекта (для имен модулей)
+        """
+        if not isinstance(file_info, dict):
+            file_info = file_info.to_dict()
+        file_path = file_info.get('file')
+        if not file_path or 'error' in file_info or 'skipped' in file_info:
+            return
+
+        module = module_name_from_path(file_path, root)
+        file_path = (os.path.relpath(file_path, root) if root else file_path).replace(os.sep, '/')
+        prefix = f"{module}." if module else ''
+        if module:
+            self.symbols[module] = ['module', file_path, 1, '', [],
+                                    _doc_hash(file_info.get('module_docstring'))]
+        for cls in file_info.get('classes', []):
+            class_name = prefix + (cls.get('qualname') or cls['name'])
+            bases = cls.get('bases', [])
+            signature = f"class {cls['name']}({', '.join(bases)})" if bases else f"class {cls['name']}"
+            self.symbols[class_name] = ['class', file_path, cls.get('line_start', 0), signature,
+                                        list(cls.get('decorators', [])),
+                                        _doc_hash(cls.get('docstring'))]
+            for method in cls.get('methods', []):
+                self._add_function(f"{class_name}.{method['name']}", 'method', method, file_path)
+        for func in file_info.get('functions', []):
+            self._add_function(prefix + func['name'], 'function', func, file_path)
+
+    def _add_function(self, key: str, kind: str, func: Dict[str, Any], file_path: str):
+        """Добавление функции или метода"""
+        self.symbols[key] = [kind, file_path, func.get('line_start', 0), format_signature(func),
+                             list(func.get('decorators', [])), _doc_hash(func.get('docstring'))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация в JSON-совместимый словарь"""
+        return {
+            'version': SNAPSHOT_VERSION,
+            'revision': self.revision,
+            'symbols': self.symbols
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AnalysisSnapshot':
+        """Восстановление снимка из словаря to_dict()"""
+        if data.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка: {data.get('version')}")
+        snapshot = cls(data.get('revision'))
+        snapshot.symbols = data.get('symbols', {})
+        return snapshot
+
+    def save(self, path: str):
+        """
+        Сохранение снимка в JSON файл
+
+        Args:
+            path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'AnalysisSnapshot':
+        """
+        Загрузка снимка из JSON файла
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            Снимок
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def diff_snapshots(old: AnalysisSnapshot, new: AnalysisSnapshot) -> Dict[str, Any]:
+    """
+    Сравнение двух снимков по полным именам символов
+
+    Каждый символ ищется в словаре другого снимка за O(1), поэтому время
+    линейно по числу символов (плюс сортировка результата).
+
+    Args:
+        old: Снимок предыдущей версии
+        new: Снимок новой версии
+
+    Returns:
+        Словарь {'old_revision', 'new_revision', 'added', 'removed', 'changed'};
+        added/removed - списки {'name', 'kind', 'file', 'line', 'signature'},
+        changed - списки {'name', 'kind', 'file', 'line', 'changes'}, где
+        changes - словарь поле -> (старое значение, новое значение)
+    """
+    old_symbols, new_symbols = old.symbols, new.symbols
+    added, removed, changed = [], [], []
+
+    for name, record in new_symbols.items():
+        previous = old_symbols.get(name)
+        if previous is None:
+            added.append(_symbol_entry(name, record))
+            continue
+        changes = {}
+        for index, field in COMPARED_FIELDS.items():
+            if previous[index] != record[index]:
+                changes[field] = (previous[index], record[index])
+        if previous[_KIND] != record[_KIND]:
+            changes['kind'] = (previous[_KIND], record[_KIND])
+        if changes:
+            entry = _symbol_entry(name, record)
+            del entry['signature']
+            entry['changes'] = changes
+            changed.append(entry)
+
+    for name, record in old_symbols.items():
+        if name not in new_symbols:
+            removed.append(_symbol_entry(name, record))
+
+    for entries in (added, removed, changed):
+        entries.sort(key=lambda entry: entry['name'])
+    return {
+        'old_revision': old.revision,
+        'new_revision': new.revision,
+        'added': added,
+        'removed': removed,
+        'changed': changed
+    }
+
+
+def _symbol_entry(name: str, record: List[Any]) -> Dict[str, Any]:
+    return {'name': name, 'kind': record[_KIND], 'file': record[_FILE], 'line': record[_LINE],
+            'signature': record[_SIGNATURE]}
@@ -0,0 +1,341 @@
+"""
+Индекс символов и импортов проекта
+"""
+
+import builtins
+import os
+from typing import Dict, List, Any, Optional, Set
+
+from .models import record_field
+
+
+def module_name_from_path(file_path: str, root: str) -> str:
+    """
+    Имя модуля по пути к файлу относительно корня проекта
+
+    Args:
+        file_path: Путь к файлу
+        root: Корневая директория проекта
+
+    Returns:
+        Имя модуля через точку ('pkg/sub/__init__.py' -> 'pkg.sub')
+    """
+    rel_path = os.path.relpath(file_path, root) if root else file_path
+    rel_path = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+    parts = [part for part in rel_path.split('/') if part and part != '.']
+    if parts and parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts)
+
+
+def resolve_import_module(module: Optional[str], level: int, current_module: str,
+                          is_package: bool) -> Optional[str]:
+    """
+    Разрешение относительного импорта в абсолютное имя модуля
+
+    Args:
+        module: Имя модуля из 'from X import ...' (None для 'from . import y')
+        level: Число ведущих точек
+        current_module: Имя модуля, в котором находится импорт
+        is_package: Является ли текущий модуль пакетом (__init__.py)
+
+    Returns:
+        Абсолютное имя модуля или None, если импорт выходит за корень проекта
+    """
+    if not level:
+        return module
+
+    parts = current_module.split('.') if current_module else []
+    if not is_package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    if level > 1:
+        parts = parts[:len(parts) - (level - 1)]
+    if module:
+        parts.append(module)
+    return '.'.join(parts)
+
+
+class SymbolIndex:
+    """
+    Индекс определений и импортов по всем файлам проекта
+
+    Все запросы выполняются через словари и множества за O(1):
+    - definitions: полное имя -> описание определения;
+    - names: короткое имя -> множество полных имен;
+    - imports / importers: модуль -> импортируемые им модули / модули, импортирующие его;
+    - bindings: модуль -> {локальное имя -> полное имя}, полученные через импорты.
+    """
+
+    # Наибольшая длина цепочки переэкспортов имени через импорты модулей
+    MAX_REEXPORT_DEPTH = 8
+
+    def __init__(self):
+        """Инициализация пустого индекса"""
+        self.modules: Dict[str, str] = {}
+        self.file_modules: Dict[str, str] = {}
+        self.definitions: Dict[str, Dict[str, Any]] = {}
+        self.names: Dict[str, Set[str]] = {}
+        self.imports: Dict[str, Set[str]] = {}
+        self.importers: Dict[str, Set[str]] = {}
+        self.bindings: Dict[str, Dict[str, str]] = {}
+        # Имя пакета, если корень проекта - сам пакет (есть __init__.py): в его
+        # модулях возможны абсолютные импорты 'pkg.mod' вместо 'mod'
+        self.root_package: Optional[str] = None
+        # Импорты 'from M import x', для которых еще неизвестно, модуль ли M.x
+        self._pending: List[tuple] = []
+
+    @classmethod
+    def build(cls, files: List[Dict[str, Any]], root: str) -> 'SymbolIndex':
+        """
+        Построение индекса по результатам анализа файлов
+
+        Args:
+            files: Результаты CodeAnalyzer.analyze_file
+            root: Корневая директория проекта
+
+        Returns:
+            Готовый индекс
+        """
+        index = cls()
+        for file_info in files:
+            index.add_file(file_info, root)
+        index.finalize()
+        return index
+
+    def add_file(self, file_info: Any, root: str):
+        """
+        Добавление результата анализа одного файла
+
+        После добавления всех файлов нужно вызвать finalize().
+
+        Args:
+            file_info: Результат анализа (словарь или ModuleInfo)
+            root: Корневая директория проекта
+        """
+        file_path = record_field(file_info, 'file')
+        if record_field(file_info, 'error') is not None or not file_path:
+            return
+
+        module = module_name_from_path(file_path, root)
+        if not module and root:
+            self.root_package = os.path.basename(os.path.normpath(os.path.abspath(root)))
+        is_package = os.path.splitext(os.path.basename(file_path))[0] == '__init__'
+        self.modules[module] = file_path
+        self.file_modules[file_path] = module
+        self.imports.setdefault(module, set())
+        bindings = self.bindings.setdefault(module, {})
+
+        for cls in record_field(file_info, 'classes', []):
+            name = record_field(cls, 'name')
+            local_name = record_field(cls, 'qualname') or name
+            qualname = f"{module}.{local_name}" if module else local_name
+            self._define(qualname, name, 'class', module, file_path, record_field(cls, 'line_start'),
+                         bases=record_field(cls, 'bases', []))
+            for method in record_field(cls, 'methods', []):
+                method_name = record_field(method, 'name')
+                self._define(f"{qualname}.{method_name}", method_name, 'method', module,
+                             file_path, record_field(method, 'line_start'))
+
+        for func in record_field(file_info, 'functions', []):
+            name = record_field(func, 'name')
+            qualname = f"{module}.{name}" if module else name
+            self._define(qualname, name, 'function', module, file_path, record_field(func, 'line_start'))
+
+        for imp in record_field(file_info, 'imports', []):
+            names = record_field(imp, 'names', [])
+            asnames = record_field(imp, 'asnames') or [None] * len(names)
+            kind = record_field(imp, 'type')
+            if kind == 'import':
+                for name, asname in zip(names, asnames):
+                    self._add_import(module, name)
+                    if asname:
+                        # 'import pkg.mod as m' связывает m с pkg.mod
+                        bindings[asname] = name
+                    else:
+                        bindings.setdefault(name.split('.')[0], name.split('.')[0])
+            elif kind == 'from':
+                target = resolve_import_module(record_field(imp, 'module'), record_field(imp, 'level', 0),
+                                               module, is_package)
+                if target is None:
+                    continue
+                for name, asname in zip(names, asnames):
+                    if name == '*':
+                        self._add_import(module, target)
+                        continue
+                    qualified = f"{target}.{name}" if target else name
+                    bindings[asname or name] = qualified
+                    self._pending.append((module, target, qualified))
+
+    def finalize(self):
+        """Разрешение импортов 'from M import x' в модуль M.x или в модуль M"""
+        for module, target, qualified in self._pending:
+            if qualified in self.modules:
+                self._add_import(module, qualified)
+            elif target:
+                self._add_import(module, target)
+        self._pending = []
+
+    def _define(self, qualname: str, name: str, kind: str, module: str, file_path: str,
+                line: Optional[int], bases: Optional[List[str]] = None):
+        definition = {
+            'name': name,
+            'kind': kind,
+            'module': module,
+            'file': file_path,
+            'line': line
+        }
+        if bases is not None:
+            definition['bases'] = list(bases)
+        self.definitions[qualname] = definition
+        self.names.setdefault(name, set()).add(qualname)
+
+    def _add_import(self, module: str, target: str):
+        if not target or target == module:
+            return
+        self.imports.setdefault(module, set()).add(target)
+        self.importers.setdefault(target, set()).add(module)
+
+    def where_defined(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Поиск определений по полному или короткому имени
+
+        Args:
+            name: Полное ('pkg.mod.Class') или короткое ('Class') имя
+
+        Returns:
+            Список определений (с ключом 'qualname')
+        """
+        if name in self.definitions:
+            return [dict(self.definitions[name], qualname=name)]
+        return [dict(self.definitions[qualname], qualname=qualname)
+                for qualname in sorted(self.names.get(name, ()))]
+
+    def module_of(self, file_path: str) -> Optional[str]:
+        """Имя модуля для проанализированного файла"""
+        return self.file_modules.get(file_path)
+
+    def imports_of(self, module: str) -> Set[str]:
+        """Модули, которые импортирует модуль"""
+        return self.imports.get(module, set())
+
+    def importers_of(self, module: str) -> Set[str]:
+        """Модули, которые импортируют модуль"""
+        return self.importers.get(module, set())
+
+    def qualify(self, name: str, module: str) -> str:
+        """
+        Полное имя, к которому привязано имя в модуле, без проверки определений
+
+        В отличие от resolve() подходит и для переменных уровня модуля
+        (их нет в definitions): 'bp' -> 'pkg.views.bp', если в модуле есть
+        'from .views import bp', иначе 'module.bp'.
+
+        Args:
+            name: Имя в том виде, как оно записано в коде ('bp', 'views.bp')
+            module: Модуль, в котором используется имя
+
+        Returns:
+            Полное имя
+        """
+        head, _, tail = name.partition('.')
+        bound = self.bindings.get(module, {}).get(head)
+        if bound is None:
+            return f"{module}.{name}" if module else name
+        return f"{bound}.{tail}" if tail else bound
+
+    def resolve(self, name: str, module: str) -> Optional[str]:
+        """
+        Разрешение имени, использованного в модуле, в полное имя определения
+
+        Учитываются определения самого модуля, импорты ('from .base import Base',
+        'import pkg.mod' -> 'pkg.mod.Base') и, в крайнем случае, уникальное
+        короткое имя во всем проекте - только для простого имени, не связанного
+        импортом и не встроенного. Имена из внешних импортов ('json.loads',
+        'Model' из django) и атрибуты переменных ('d.get', 'logger.info')
+        не разрешаются.
+
+        Args:
+            name: Имя в том виде, как оно записано в коде ('Base', 'mod.Base')
+            module: Модуль, в котором используется имя
+
+        Returns:
+            Полное имя определения или None
+        """
+        return self._resolve(name, module, self.MAX_REEXPORT_DEPTH)
+
+    def _resolve(self, name: str, module: str, depth: int) -> Optional[str]:
+        """resolve() с ограничением глубины цепочки переэкспортов"""
+        local = f"{module}.{name}" if module else name
+        if local in self.definitions:
+            return local
+
+        head, _, tail = name.partition('.')
+        bound = self.bindings.get(module, {}).get(head)
+        if bound is not None:
+            bound = self._project_name(bound)
+            if bound is None:
+                return None
+            candidate = '.'.join(part for part in (bound, tail) if part)
+            if candidate in self.definitions:
+                return candidate
+            package, _, short = candidate.rpartition('.')
+            # Переэкспорт: модуль package сам импортирует short ('from .base import Base')
+            if depth and package in self.modules and short in self.bindings.get(package, {}):
+                return self._resolve(short, package, depth - 1)
+            # Переэкспорт из пакета без явного импорта имени ('from .base import *')
+            matches = [q for q in self.names.get(short, ())
+                       if not package or q.startswith(package + '.')]
+            return matches[0] if len(matches) == 1 else None
+
+        if tail or hasattr(builtins, name):
+            return None
+        matches = self.names.get(name, ())
+        if len(matches) == 1:
+            return next(iter(matches))
+        return None
+
+    def _project_name(self, qualname: str) -> Optional[str]:
+        """Имя, привязанное импортом, в пространстве модулей проекта; None - внешнее имя"""
+        if self._in_project(qualname):
+            return qualname
+        head, _, rest = qualname.partition('.')
+        # Абсолютный импорт анализируемого пакета: 'email.utils' при корне email/
+        if head == self.root_package and self._in_project(rest):
+            return rest
+        return None
+
+    def _in_project(self, qualname: str) -> bool:
+        """Относится ли полное имя к модулю проекта (само или через пакет-предок)"""
+        if qualname in self.definitions:
+            return True
+        parts = qualname.split('.')
+        return any('.'.join(parts[:length]) in self.modules for length in range(len(parts), 0, -1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация в JSON-совместимый словарь"""
+        return {
+            'modules': dict(self.modules),
+            'definitions': self.definitions,
+            'imports': {module: sorted(targets) for module, targets in self.imports.items()},
+            'bindings': self.bindings,
+            'root_package': self.root_package
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SymbolIndex':
+        """Восстановление индекса из словаря to_dict()"""
+        index = cls()
+        index.modules = dict(data.get('modules', {}))
+        index.file_modules = {path: module for module, path in index.modules.items()}
+        index.bindings = {module: dict(names) for module, names in data.get('bindings', {}).items()}
+        index.root_package = data.get('root_package')
+        for qualname, definition in data.get('definitions', {}).items():
+            index.definitions[qualname] = dict(definition)
+            index.names.setdefault(definition['name'], set()).add(qualname)
+        for module, targets in data.get('imports', {}).items():
+            index.imports.setdefault(module, set())
+            for target in targets:
+                index._add_import(module, target)
+        return index
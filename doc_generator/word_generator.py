@@ -23,12 +23,12 @@ class WordGenerator:
         Args:
             template_path: Путь к шаблону Word
             data: Словарь с данными для подстановки
-            output_path: Путь для сохранения результата
+            output_path: Путь (или файловый объект) для сохранения результата
             
         Returns:
             Путь к сгенерированному файлу
         """
-        if not os.path.exists(template_path):
+        if not template_path or not os.path.exists(template_path):
             # Создаем новый документ, если шаблон не существует
             doc = Document()
             doc.add_heading('Документ', 0)
@@ -69,7 +69,8 @@ class WordGenerator:
                 self._add_html_content(doc, html_content)
         
         # Сохраняем документ
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        if isinstance(output_path, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         doc.save(output_path)
         
         return output_path
@@ -156,7 +157,7 @@ class WordGenerator:
         
         Args:
             data: Данные для документа
-            output_path: Путь для сохранения
+            output_path: Путь (или файловый объект) для сохранения
             
         Returns:
             Путь к созданному файлу
@@ -194,7 +195,8 @@ class WordGenerator:
                 for i, cell_data in enumerate(row_data):
                     row_cells[i].text = str(cell_data)
         
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        if isinstance(output_path, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
         doc.save(output_path)
         
         return output_path
@@ -0,0 +1,122 @@
+"""
+Потоковая запись сгенерированных документов в ZIP архив
+"""
+
+import os
+import time
+import zipfile
+from typing import Any, BinaryIO, Iterator, List, Union
+
+
+# Форматы, которые уже сжаты внутри (OOXML - это ZIP, PDF со сжатыми потоками),
+# повторное сжатие для них только тратит CPU
+STORED_EXTENSIONS = {'.docx', '.xlsx', '.pptx', '.pdf', '.zip', '.png', '.jpg', '.jpeg', '.gz'}
+
+
+class _ChunkBuffer:
+    """Буфер для записи ZIP в поток без поддержки seek (например, HTTP ответ)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Забрать накопленные данные и очистить буфер"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipBundleWriter:
+    """Запись документов в ZIP архив по мере их генерации"""
+
+    def __init__(self, output: Union[str, BinaryIO]):
+        """
+        Инициализация архива
+
+        Args:
+            output: Путь к ZIP файлу или файловый объект (допускается поток без seek)
+        """
+        if isinstance(output, (str, os.PathLike)):
+            os.makedirs(os.path.dirname(output) if os.path.dirname(output) else '.', exist_ok=True)
+        self.output = output
+        self._zip = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._names = set()
+
+    def add(self, arcname: str, data: bytes) -> str:
+        """
+        Добавление документа в архив
+
+        Args:
+            arcname: Имя файла внутри архива
+            data: Содержимое документа
+
+        Returns:
+            Фактическое имя файла в архиве (с суффиксом при совпадении имен)
+        """
+        arcname = self._unique_name(arcname)
+        extension = os.path.splitext(arcname)[1].lower()
+
+        zip_info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+        zip_info.external_attr = 0o644 << 16
+        if extension in STORED_EXTENSIONS:
+            zip_info.compress_type = zipfile.ZIP_STORED
+        else:
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+
+        self._zip.writestr(zip_info, data)
+        return arcname
+
+    def close(self):
+        """Запись центрального каталога и закрытие архива"""
+        self._zip.close()
+
+    def __enter__(self) -> 'ZipBundleWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _unique_name(self, arcname: str) -> str:
+        """Получение уникального имени файла внутри архива"""
+        arcname = arcname.replace('\\', '/').lstrip('/')
+        candidate = arcname
+        base, extension = os.path.splitext(arcname)
+        counter = 1
+        while candidate in self._names:
+            candidate = f"{base}_{counter}{extension}"
+            counter += 1
+        self._names.add(candidate)
+        return candidate
+
+
+def iter_zip_stream(documents: Iterator[Any]) -> Iterator[bytes]:
+    """
+    Потоковая генерация ZIP архива
+
+    Args:
+        documents: Итератор пар (имя файла в архиве, содержимое)
+
+    Returns:
+        Итератор фрагментов архива; каждый фрагмент отдается сразу
+        после записи очередного документа
+    """
+    buffer = _ChunkBuffer()
+    writer = ZipBundleWriter(buffer)
+    try:
+        for arcname, data in documents:
+            writer.add(arcname, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
@@ -17,12 +17,18 @@ def main():
     parser.add_argument('--template', type=str, help='Путь к шаблону')
     parser.add_argument('--data', '-d', type=str, help='Путь к файлу с данными (JSON)')
     parser.add_argument('--output', '-o', type=str, help='Путь для сохранения результата')
+    parser.add_argument('--zip', '-z', type=str, help='Упаковать документы из конфигурации в ZIP архив')
     
     args = parser.parse_args()
     
     generator = DocumentGenerator()
     
-    if args.config:
+    if args.config and args.zip:
+        # Генерация из конфигурационного файла сразу в ZIP архив
+        print(f"Загрузка конфигурации из {args.config}...")
+        archive_path = generator.generate_bundle_from_config(args.config, args.zip)
+        print(f"Архив создан: {archive_path}")
+    elif args.config:
         # Генерация из конфигурационного файла
         print(f"Загрузка конфигурации из {args.config}...")
         generated_files = generator.generate_from_config(args.config)
@@ -54,6 +60,7 @@ def main():
         parser.print_help()
         print("\nПримеры использования:")
         print("  python main.py --config config/generation_config.json")
+        print("  python main.py --config config/generation_config.json --zip output/documents.zip")
         print("  python main.py --type word --data data/sample_data.json --template templates/contract_template.docx")
         sys.exit(1)
 
@@ -0,0 +1,55 @@
+"""
+Общие фикстуры тестов
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(scope='session')
+def tech_app(tmp_path_factory):
+    """
+    Веб-приложение app_tech в режиме тестирования
+
+    app_tech создает каталоги uploads/output/temp/cache относительно текущей
+    директории, поэтому на время тестов она переключается во временную;
+    пути в конфигурации делаются абсолютными, так как send_file ищет
+    относительные пути от каталога приложения.
+    """
+    work_dir = tmp_path_factory.mktemp('app_tech')
+    previous = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        import app_tech
+        app_tech.app.config['TESTING'] = True
+        for key in ('UPLOAD_FOLDER', 'OUTPUT_FOLDER', 'TEMP_FOLDER', 'CACHE_FOLDER'):
+            app_tech.app.config[key] = str(work_dir / app_tech.app.config[key])
+        yield app_tech
+    finally:
+        os.chdir(previous)
+
+
+@pytest.fixture(scope='session')
+def docs_app(tmp_path_factory):
+    """
+    Веб-приложение генерации документов (app.py) в режиме тестирования
+
+    Каталоги приложения создаются во временной директории при импорте.
+    """
+    work_dir = tmp_path_factory.mktemp('app')
+    previous = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        import app
+    finally:
+        os.chdir(previous)
+    app.app.config['TESTING'] = True
+    for key in ('UPLOAD_FOLDER', 'OUTPUT_FOLDER'):
+        app.app.config[key] = str(work_dir / app.app.config[key])
+    return app
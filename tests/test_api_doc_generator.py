@@ -0,0 +1,88 @@
+"""
+Тесты извлечения маршрутов Flask и API документации
+"""
+
+import textwrap
+
+from doc_generator.api_doc_generator import APIDocGenerator
+from doc_generator.code_analyzer import CodeAnalyzer
+
+
+APP_SOURCE = '''
+from flask import Flask, Blueprint
+from flask.views import MethodView
+
+app = Flask(__name__)
+bp = Blueprint('users', __name__, url_prefix='/users')
+admin = Blueprint('admin', __name__)
+
+
+@app.route('/')
+def index():
+    """Главная страница"""
+
+
+@bp.route(
+    '/<int:user_id>',
+    methods=('GET', 'DELETE'),
+)
+def user(user_id):
+    """Пользователь по id"""
+
+
+@admin.post('/reset')
+def reset():
+    """Сброс"""
+
+
+def health():
+    """Проверка"""
+
+
+class ItemAPI(MethodView):
+    """Товары"""
+
+    def get(self, item_id):
+        pass
+
+    def put(self, item_id):
+        pass
+
+
+app.add_url_rule('/health', 'health', health)
+app.add_url_rule('/items/<uuid:item_id>', view_func=ItemAPI.as_view('items'))
+app.register_blueprint(bp)
+app.register_blueprint(admin, url_prefix='/admin/')
+
+
+def create_app():
+    inner = Flask(__name__)
+
+    @inner.get('/ping')
+    def ping():
+        """Пинг"""
+    cache.get('key')
+    return inner
+'''
+
+
+def _write(path, source):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(source), encoding='utf-8')
+
+
+def test_routes_from_single_file(tmp_path):
+    _write(tmp_path / 'app.py', APP_SOURCE)
+    routes = APIDocGenerator(CodeAnalyzer()).generate_from_flask_app(str(tmp_path / 'app.py'))['routes']
+
+    assert [(route['methods'], route['path'], route['function']) for route in routes] == [
+        (['GET'], '/', 'index'),
+        (['GET', 'DELETE'], '/users/<int:user_id>', 'user'),
+        (['POST'], '/admin/reset', 'reset'),
+        (['GET'], '/health', 'health'),
+        (['GET', 'PUT'], '/items/<uuid:item_id>', 'ItemAPI'),
+        (['GET'], '/ping', 'create_app.ping'),
+    ]
+    assert routes[1]['description'] == 'Пользователь по id'
+    assert routes[1]['parameters'] == [{'name': 'user_id', 'type': 'int', 'in': 'path', 'required': True}]
+    assert routes[4]['description'] == 'Товары'
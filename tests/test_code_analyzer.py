@@ -0,0 +1,103 @@
+"""
+Тесты анализатора кода: кэш и лимиты анализа
+"""
+
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+from doc_generator.code_analyzer import CodeAnalyzer
+
+SOURCE = (
+    'def first(items):\n'
+    '    total = 0\n'
+    '    for item in items:\n'
+    '        if item > 0:\n'
+    '            total += item * 2\n'
+    '    return total\n'
+)
+
+
+def test_cache_is_separated_by_analyzer_settings(tmp_path):
+    source_file = tmp_path / 'module.py'
+    source_file.write_text(SOURCE, encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+
+    with_clones = CodeAnalyzer(cache_dir=cache_dir, clone_min_nodes=5).analyze_file_info(str(source_file))
+    assert with_clones.fragments
+
+    # Тот же кэш с другими настройками не должен вернуть прежний результат
+    without_clones = CodeAnalyzer(cache_dir=cache_dir, clone_min_nodes=None).analyze_file_info(str(source_file))
+    assert without_clones.fragments == []
+
+
+def test_public_result_does_not_depend_on_cache(tmp_path):
+    source_file = tmp_path / 'module.py'
+    source_file.write_text(SOURCE, encoding='utf-8')
+    cached_analyzer = CodeAnalyzer(cache_dir=str(tmp_path / 'cache'))
+
+    uncached = CodeAnalyzer().analyze_file(str(source_file))
+    first = cached_analyzer.analyze_file(str(source_file))
+    second = cached_analyzer.analyze_file(str(source_file))
+
+    assert first == second == uncached
+    assert not {'calls', 'fragments', 'content_hash'} & set(uncached)
+    # Служебные поля нужны только кэшу и графам проекта
+    info = cached_analyzer.analyze_file_info(str(source_file))
+    assert set(info.to_dict(internal=True)) - set(uncached) == {'calls', 'fragments', 'content_hash'}
+
+
+def cached_paths(analyzer):
+    rows = analyzer.cache._connection().execute('SELECT path FROM files').fetchall()
+    return sorted(os.path.basename(path) for path, in rows)
+
+
+def test_cache_forgets_paths_that_are_gone(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    for name in ('first.py', 'second.py'):
+        (project / name).write_text(SOURCE, encoding='utf-8')
+    analyzer = CodeAnalyzer(cache_dir=str(tmp_path / 'cache'))
+
+    analyzer.analyze_directory(str(project))
+    assert cached_paths(analyzer) == ['first.py', 'second.py']
+
+    # Удаленный файл не остается в таблице путей после следующего обхода
+    (project / 'second.py').unlink()
+    analyzer.analyze_directory(str(project))
+    assert cached_paths(analyzer) == ['first.py']
+
+    # Удаление директории целиком (временные каталоги загрузок)
+    analyzer.cache.forget_paths(str(project))
+    assert cached_paths(analyzer) == []
+    # Результат по содержимому остается доступен для других путей
+    other = tmp_path / 'other.py'
+    other.write_text(SOURCE, encoding='utf-8')
+    assert analyzer.analyze_file_info(str(other)).content_hash
+
+
+def test_parse_timeout_applies_outside_main_thread():
+    source = ''.join(f'def f{index}(x):\n    return x + {index}\n' for index in range(20000))
+    analyzer = CodeAnalyzer(parse_timeout=0.01)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slow = executor.submit(analyzer.analyze_source_info, source, 'big.py').result()
+        small = executor.submit(analyzer.analyze_source_info, SOURCE, 'module.py').result()
+
+    assert slow.skipped == 'анализ не уложился в 0.01 с'
+    assert slow.line_count == 40001
+    assert small == analyzer.analyze_source_info(SOURCE, 'module.py')
+    # Процессы пула не создаются fork из многопоточного процесса
+    assert analyzer._pool._mp_context.get_start_method() != 'fork'
+
+
+def test_main_thread_without_setitimer_analyzes_in_process(monkeypatch):
+    monkeypatch.delattr(signal, 'setitimer')
+    analyzer = CodeAnalyzer(parse_timeout=0.01)
+
+    info = analyzer.analyze_source_info(SOURCE, 'module.py')
+
+    # Лимит не применяется, но и пул процессов не запускается
+    assert info.skipped is None
+    assert [function.name for function in info.functions] == ['first']
+    assert analyzer._pool is None
@@ -0,0 +1,151 @@
+"""
+Нагрузочные тесты общих экземпляров app_tech при параллельной обработке запросов
+
+Анализатор, генераторы и их кэши (в памяти и SQLite) создаются один раз
+на процесс и используются всеми потоками обработки запросов. Тесты
+выполняют много одинаковых запросов параллельно и проверяют, что ни
+один не завершился ошибкой и все результаты совпадают с последовательными.
+"""
+
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import pytest
+
+
+THREADS = 8
+REQUESTS = 48
+
+MODULE_SOURCE = '''"""Модуль для нагрузочного теста"""
+
+
+class Base:
+    """Базовый класс"""
+
+    def run(self, value: int = 1) -> int:
+        """Запуск"""
+        return helper(value)
+
+
+class Child(Base):
+    """Наследник"""
+
+    def run(self, value: int = 2) -> int:
+        return super().run(value) * 2
+
+
+def helper(value):
+    """Вспомогательная функция"""
+    return [item for item in range(value) if item % 2]
+'''
+
+# Временные пути и идентификаторы, уникальные для каждого запроса
+_UNIQUE_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{32}')
+_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?|\d{8}_\d{6}')
+
+
+def _normalize(data: bytes) -> str:
+    text = data.decode('utf-8')
+    return _TIMESTAMP_RE.sub('<time>', _UNIQUE_RE.sub('<id>', text))
+
+
+def _project_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('pkg/__init__.py', '')
+        archive.writestr('pkg/core.py', MODULE_SOURCE)
+        archive.writestr('pkg/extra.py', 'from .core import Base\n\n\n'
+                                         'class Extra(Base):\n'
+                                         '    """Расширение"""\n')
+    return buffer.getvalue()
+
+
+def _run_parallel(function, count=REQUESTS):
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(lambda _: function(), range(count)))
+
+
+@pytest.mark.parametrize('output_format', ['markdown', 'json'])
+def test_concurrent_analyze_code(tech_app, output_format):
+    client = tech_app.app.test_client()
+
+    def request():
+        response = client.post('/analyze-code', data={
+            'format': output_format,
+            'code_file': (io.BytesIO(MODULE_SOURCE.encode('utf-8')), 'module.py')
+        }, content_type='multipart/form-data')
+        return response.status_code, _normalize(response.data)
+
+    results = _run_parallel(request)
+
+    assert {status for status, _ in results} == {200}
+    assert len({body for _, body in results}) == 1
+
+
+def test_concurrent_analyze_project(tech_app):
+    client = tech_app.app.test_client()
+    archive = _project_zip()
+
+    def request():
+        response = client.post('/analyze-project', data={
+            'project_zip': (io.BytesIO(archive), 'project.zip')
+        }, content_type='multipart/form-data')
+        return response.status_code, _normalize(response.data)
+
+    results = _run_parallel(request, count=REQUESTS // 2)
+
+    assert {status for status, _ in results} == {200}
+    bodies = {body for _, body in results}
+    assert len(bodies) == 1
+    assert 'Extra' in bodies.pop()
+
+
+def test_process_pools_are_capped_across_requests(tech_app):
+    limit = tech_app.app.config['PARALLEL_REQUESTS']
+    workers = tech_app.app.config['ANALYSIS_WORKERS']
+
+    with ExitStack() as stack:
+        granted = [stack.enter_context(tech_app.request_workers()) for _ in range(limit + 1)]
+    # Запросы сверх лимита выполняются без пула процессов
+    assert granted == [workers] * limit + [None]
+
+    with tech_app.request_workers() as released:
+        assert released == workers
+
+
+def test_shared_generators_under_threads(tech_app, tmp_path):
+    project = tmp_path / 'project' / 'pkg'
+    project.mkdir(parents=True)
+    (project / '__init__.py').write_text('', encoding='utf-8')
+    for number in range(12):
+        (project / f'module_{number}.py').write_text(
+            MODULE_SOURCE.replace('class Child', f'class Child{number}'), encoding='utf-8')
+    directory = str(tmp_path / 'project')
+
+    analysis = tech_app.code_analyzer.analyze_directory(directory)
+    markdown_generator = tech_app.markdown_generator
+    diagram_generator = tech_app.diagram_generator
+
+    def render():
+        out = io.StringIO()
+        markdown_generator.write_project_docs(directory, out)
+        parts = [_normalize(out.getvalue().encode('utf-8'))]
+        for file_info in analysis['files']:
+            parts.append(markdown_generator.generate_code_docs(file_info))
+            parts.append(diagram_generator.generate_class_diagram_mermaid(file_info,
+                                                                          analysis['symbol_index']))
+            parts.append(diagram_generator.generate_plantuml_class_diagram(file_info))
+        parts.extend(diagram_generator.generate_project_class_diagrams_mermaid(analysis['class_graph']))
+        parts.append(diagram_generator.generate_call_graph_mermaid(analysis['call_graph']))
+        parts.append(diagram_generator.generate_module_graph_mermaid(analysis['module_graph']))
+        return parts
+
+    expected = render()
+    # Сброс кэшей в памяти: параллельные потоки заполняют их заново
+    diagram_generator.cache.memory.clear()
+    results = _run_parallel(render)
+
+    assert all(result == expected for result in results)
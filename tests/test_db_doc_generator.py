@@ -0,0 +1,90 @@
+"""
+Тесты генератора документации БД
+"""
+
+import io
+
+from doc_generator.db_doc_generator import DBDocGenerator
+
+
+SCHEMA = """
+CREATE TABLE users (
+  id INT PRIMARY KEY,
+  name VARCHAR(255) NOT NULL
+);
+CREATE TABLE orders (
+  user_id INT,
+  num INT,
+  total DECIMAL(10, 2) DEFAULT 0,
+  PRIMARY KEY (user_id, num),
+  FOREIGN KEY (user_id) REFERENCES users(id)
+);
+CREATE TABLE lines (
+  user_id INT,
+  num INT,
+  CONSTRAINT fk_lines_order FOREIGN KEY (user_id, num) REFERENCES orders(user_id, num)
+);
+"""
+
+
+def _schema_file(tmp_path):
+    path = tmp_path / 'schema.sql'
+    path.write_text(SCHEMA, encoding='utf-8')
+    return str(path)
+
+
+def test_sql_foreign_keys_have_names(tmp_path):
+    db_info = DBDocGenerator().analyze_sql_file(_schema_file(tmp_path))
+    tables = {table['name']: table for table in db_info['tables']}
+
+    assert tables['orders']['foreign_keys'][0]['name'] is None
+    assert tables['lines']['foreign_keys'] == [{
+        'name': 'fk_lines_order',
+        'constrained_columns': ['user_id', 'num'],
+        'referred_table': 'orders',
+        'referred_columns': ['user_id', 'num']
+    }]
+    assert [column['name'] for column in tables['lines']['columns']] == ['user_id', 'num']
+
+
+def test_markdown_with_foreign_keys(tmp_path):
+    generator = DBDocGenerator()
+    md = generator.generate_markdown(generator.analyze_sql_file(_schema_file(tmp_path)))
+
+    assert "- `fk_orders_user_id`: user_id -> users(id)" in md
+    assert "- `fk_lines_order`: user_id, num -> orders(user_id, num)" in md
+
+
+def test_generate_db_docs_markdown_route(tech_app, tmp_path):
+    client = tech_app.app.test_client()
+    response = client.post('/generate-db-docs', data={
+        'db_type': 'sql_file',
+        'format': 'markdown',
+        'sql_file': (io.BytesIO(SCHEMA.encode('utf-8')), 'schema.sql')
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    assert b'fk_lines_order' in response.data
+
+
+def test_er_diagram_parts_cover_all_tables(tmp_path):
+    generator = DBDocGenerator()
+    db_info = generator.analyze_sql_file(_schema_file(tmp_path))
+    whole = generator.generate_er_diagram_mermaid(db_info)
+    parts = generator.generate_er_diagrams_mermaid(db_info, max_tables=50)
+
+    assert parts == [whole]
+    assert 'orders ||--o{ lines : "user_id, num -> user_id, num"' in whole
+
+
+def test_er_diagram_parts_respect_max_tables():
+    tables = [{'name': f't{i}', 'columns': [], 'primary_keys': [],
+               'foreign_keys': [{'constrained_columns': ['p'], 'referred_table': f't{i - 1}',
+                                 'referred_columns': ['id']}] if i % 3 else []}
+              for i in range(30)]
+    parts = DBDocGenerator().generate_er_diagrams_mermaid({'tables': tables}, max_tables=4)
+
+    entities = [line.split()[0] for part in parts for line in part.splitlines()
+                if line.endswith('{')]
+    assert sorted(entities) == sorted(table['name'] for table in tables)
+    assert all(part.count(' {\n') <= 4 for part in parts)
@@ -0,0 +1,50 @@
+"""
+Тесты пакетной генерации документов в ZIP архив
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from doc_generator.generator import BUNDLE_ERRORS_NAME, DocumentGenerator
+
+
+def test_bundle_rejects_invalid_documents_before_streaming(docs_app):
+    client = docs_app.app.test_client()
+    response = client.post('/generate-bundle', json={'documents': [
+        {'type': 'excel', 'data': {}},
+        {'type': 'odt', 'data': {}}
+    ]})
+
+    assert response.status_code == 400
+    assert 'Документ 2' in response.get_json()['error']
+
+
+def test_bundle_failure_mid_stream_keeps_archive_valid(docs_app, monkeypatch):
+    def fail_on_pdf(doc_type, template, data, output):
+        if doc_type == 'pdf':
+            raise RuntimeError('шаблон поврежден')
+        output.write(b'content')
+
+    monkeypatch.setattr(docs_app.generator, '_generate_document', fail_on_pdf)
+    client = docs_app.app.test_client()
+    response = client.post('/generate-bundle', json={'documents': [
+        {'type': 'excel', 'output': 'report.xlsx'},
+        {'type': 'pdf', 'output': 'broken.pdf'},
+        {'type': 'word', 'output': 'letter.docx'}
+    ]})
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ['report.xlsx', 'letter.docx', BUNDLE_ERRORS_NAME]
+        assert archive.read(BUNDLE_ERRORS_NAME).decode('utf-8') == 'Документ 2: шаблон поврежден\n'
+
+
+def test_generate_bundle_still_raises(tmp_path, monkeypatch):
+    generator = DocumentGenerator(output_dir=str(tmp_path))
+    monkeypatch.setattr(generator, '_generate_document', lambda *args: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        generator.generate_bundle([{'type': 'excel'}])
@@ -0,0 +1,20 @@
+"""
+Тесты обхода дерева исходников
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from bench_file_walker import build_tree, rglob_walk, scandir_walk  # noqa: E402
+
+
+def test_vendored_directories_are_pruned(tmp_path):
+    build_tree(tmp_path, project_files=20, venv_files=40)
+    found = scandir_walk(str(tmp_path), ['.py'])
+
+    assert len(found) == 20
+    assert all(Path(path).relative_to(tmp_path).parts[0] == 'src' for path in found)
+    # Прежний обход находит и вендорные файлы, и исключенные .gitignore
+    assert len(rglob_walk(str(tmp_path), ['.py'])) == 20 + 40 + 20 + 10
@@ -0,0 +1,158 @@
+"""
+Тесты графов проекта: вызовы, наследование, импорты модулей
+"""
+
+import pytest
+
+from doc_generator.call_graph import CallGraph
+from doc_generator.class_graph import ClassGraph
+from doc_generator.code_analyzer import CodeAnalyzer
+from doc_generator.graph_utils import EdgeListGraph
+from doc_generator.module_graph import ModuleGraph
+from doc_generator.symbol_index import SymbolIndex
+
+
+@pytest.fixture
+def analysis(tmp_path):
+    package = tmp_path / 'pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('', encoding='utf-8')
+    (package / 'base.py').write_text(
+        'from . import util\n\n\n'
+        'class Base:\n'
+        '    def run(self):\n'
+        '        return util.helper()\n', encoding='utf-8')
+    (package / 'util.py').write_text(
+        'from . import base\n\n\n'
+        'def helper():\n'
+        '    return 1\n', encoding='utf-8')
+    (package / 'child.py').write_text(
+        'from .base import Base as Parent\n\n\n'
+        'class Child(Parent):\n'
+        '    def run(self):\n'
+        '        return self.other()\n\n'
+        '    def other(self):\n'
+        '        return Parent.run(self)\n', encoding='utf-8')
+    return CodeAnalyzer(clone_min_nodes=None).analyze_directory(str(tmp_path), as_models=True)
+
+
+def test_edge_list_graph_ignores_duplicates_and_loops():
+    graph = EdgeListGraph()
+    graph.add_edge('a', 'b')
+    graph.add_edge('a', 'b')
+    graph.add_edge('b', 'b')
+
+    assert graph.nodes == ['a', 'b']
+    assert list(zip(graph.sources, graph.targets)) == [(0, 1)]
+
+
+def test_call_graph(analysis):
+    graph = analysis['call_graph']
+
+    assert isinstance(graph, EdgeListGraph)
+    assert graph.callees_of('pkg.child.Child.run') == ['pkg.child.Child.other']
+    assert 'pkg.base.Base.run' in graph.callees_of('pkg.child.Child.other')
+    assert graph.callees_of('pkg.base.Base.run') == ['pkg.util.helper']
+
+
+def test_class_graph_round_trip(analysis):
+    graph = analysis['class_graph']
+    restored = ClassGraph.from_dict(graph.to_dict())
+
+    assert [(graph.nodes[s], graph.nodes[t]) for s, t in zip(graph.sources, graph.targets)] == \
+        [('pkg.base.Base', 'pkg.child.Child')]
+    assert restored.nodes == graph.nodes
+    assert restored.classes == graph.classes
+    assert list(restored.sources) == list(graph.sources)
+
+
+def test_module_graph_cycles(analysis):
+    graph = analysis['module_graph']
+    restored = ModuleGraph.from_dict(graph.to_dict())
+
+    assert graph.cycles() == [['pkg.base', 'pkg.util']]
+    assert restored.cycles() == graph.cycles()
+    groups, edges = graph.reduced()
+    assert len(groups) == len(graph.nodes) - 1
+    assert CallGraph.from_dict(analysis['call_graph'].to_dict()).nodes == analysis['call_graph'].nodes
+
+
+def test_symbol_index_reads_models_and_dicts_alike(analysis):
+    models = analysis['files']
+    root = analysis['directory']
+    from_models = SymbolIndex.build(models, root)
+    from_dicts = SymbolIndex.build([info.to_dict() for info in models], root)
+
+    assert from_models.to_dict() == from_dicts.to_dict()
+    assert from_models.resolve('Parent', 'pkg.child') == 'pkg.base.Base'
+    assert ClassGraph.build(models, from_models).classes == ClassGraph.build(
+        [info.to_dict() for info in models], from_dicts).classes
+
+
+@pytest.fixture
+def external_names(tmp_path):
+    app = tmp_path / 'app'
+    app.mkdir()
+    (app / '__init__.py').write_text('', encoding='utf-8')
+    (app / 'other.py').write_text(
+        'class Model:\n'
+        '    pass\n\n\n'
+        'def loads(text):\n'
+        '    return text\n\n\n'
+        'def get():\n'
+        '    return 1\n\n\n'
+        'def info(message):\n'
+        '    return message\n', encoding='utf-8')
+    (app / 'svc.py').write_text(
+        'import json\n'
+        'import logging\n'
+        'from django.db.models import Model\n\n'
+        'logger = logging.getLogger(__name__)\n\n\n'
+        'class User(Model):\n'
+        '    def load(self, d):\n'
+        '        logger.info("load")\n'
+        '        self.session.get("/")\n'
+        '        d.get("key")\n'
+        '        return json.loads("1")\n\n\n'
+        'def fetch(x):\n'
+        '    import requests\n'
+        '    requests.get("/")\n'
+        '    x.get()\n'
+        '    return loads("1")\n', encoding='utf-8')
+    return CodeAnalyzer(clone_min_nodes=None).analyze_directory(str(tmp_path))
+
+
+@pytest.mark.parametrize('name', ['json.loads', 'Model', 'd.get', 'self.session.get', 'logger.info', 'len'])
+def test_external_names_are_not_resolved_to_project(external_names, name):
+    assert external_names['symbol_index'].resolve(name, 'app.svc') is None
+
+
+def test_bare_unbound_name_uses_unique_definition(external_names):
+    assert external_names['symbol_index'].resolve('loads', 'app.svc') == 'app.other.loads'
+    assert external_names['class_graph'].to_dict()['sources'] == []
+
+
+def test_absolute_import_of_the_analyzed_package(tmp_path):
+    package = tmp_path / 'mail'
+    package.mkdir()
+    (package / '__init__.py').write_text('', encoding='utf-8')
+    (package / 'base.py').write_text('class Base:\n    pass\n', encoding='utf-8')
+    (package / 'child.py').write_text(
+        'from mail.base import Base\n\n\n'
+        'class Child(Base):\n'
+        '    pass\n', encoding='utf-8')
+    index = CodeAnalyzer(clone_min_nodes=None).analyze_directory(str(package))['symbol_index']
+
+    assert index.resolve('Base', 'child') == 'base.Base'
+    assert SymbolIndex.from_dict(index.to_dict()).resolve('Base', 'child') == 'base.Base'
+
+
+def test_call_graph_has_no_edges_to_external_calls(external_names):
+    graph = external_names['call_graph']
+
+    assert graph.callees_of('app.svc.User.load') == []
+    # x.get() и requests.get() не связаны с app.other.get, loads - единственное определение в проекте
+    assert graph.callees_of('app.svc.fetch') == ['app.other.loads']
+    assert graph.callers_of('app.other.get') == []
+    groups, edges = graph.condensed()
+    assert len(edges) == 1
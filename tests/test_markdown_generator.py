@@ -0,0 +1,63 @@
+"""
+Тесты документации проекта в Markdown
+"""
+
+import subprocess
+import time
+from unittest import mock
+
+import pytest
+
+from doc_generator.fragment_cache import FragmentCache
+from doc_generator.markdown_generator import MarkdownGenerator
+
+
+def _git(repo, *args):
+    return subprocess.run(['git', '-C', str(repo), *args], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'module.py').write_text('def run():\n    return 1\n', encoding='utf-8')
+    _git(tmp_path, 'add', 'module.py')
+    _git(tmp_path, '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+         'commit', '-q', '-m', 'init')
+    return tmp_path
+
+
+def test_project_header_shows_resolved_revision(repo):
+    sha = _git(repo, 'rev-parse', 'HEAD')
+    md = MarkdownGenerator().generate_project_docs(str(repo), revision='HEAD')
+
+    assert f"**Revision:** `{sha}`" in md
+    assert '`HEAD`' not in md
+    assert 'def run' in md
+
+
+def test_fragment_cache_is_shared_between_project_copies(tmp_path, monkeypatch):
+    generator = MarkdownGenerator(cache_dir=str(tmp_path / 'cache'))
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    for project in (first, second):
+        project.mkdir()
+        (project / 'module.py').write_text('def run():\n    return 1\n', encoding='utf-8')
+
+    expected = generator.generate_project_docs(str(first)).replace(str(first), str(second))
+    monkeypatch.setattr(generator, '_render_file_section', lambda file_info: pytest.fail('cache miss'))
+
+    assert generator.generate_project_docs(str(second)) == expected
+    assert str(first) not in expected
+
+
+def test_fragment_cache_evicts_least_recently_used(tmp_path):
+    cache = FragmentCache(str(tmp_path), 'test', max_rows=10)
+    cache.put_many([(f'old{index}', 'x') for index in range(5)])
+    # Прочитанные записи становятся недавно использованными
+    with mock.patch('time.time', return_value=time.time() + 60):
+        assert cache.get('old0') == 'x'
+        cache.put_many([(f'new{index}', 'x') for index in range(8)])
+
+    keys = {row[0] for row in cache._connection().execute('SELECT key FROM fragments')}
+    assert len(keys) == 9
+    assert 'old0' in keys and {f'new{index}' for index in range(8)} <= keys
@@ -0,0 +1,32 @@
+"""
+Тесты компактной модели результатов анализа
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+from doc_generator.code_analyzer import CodeAnalyzer
+from doc_generator.models import ModuleInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+from bench_models import measure, module_source  # noqa: E402
+
+
+def test_module_info_is_smaller_than_dicts():
+    analyzer = CodeAnalyzer()
+    infos = [analyzer.analyze_source_info(module_source(number, 40), f'mod_{number}.py')
+             for number in range(10)]
+    dicts = [info.to_dict(internal=True) for info in infos]
+    models_payload = pickle.dumps(infos, protocol=pickle.HIGHEST_PROTOCOL)
+    dicts_payload = pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL)
+
+    restored = pickle.loads(models_payload)
+    assert [info.to_dict(internal=True) for info in restored] == dicts
+    assert [ModuleInfo.from_dict(data) for data in dicts] == restored
+    assert len(models_payload) < len(dicts_payload)
+
+    models_memory, _ = measure(lambda: pickle.loads(models_payload))
+    dicts_memory, _ = measure(lambda: pickle.loads(dicts_payload))
+    assert models_memory < dicts_memory
@@ -0,0 +1,31 @@
+"""
+Тесты хранения поисковых индексов веб-приложения
+"""
+
+import os
+import time
+
+from doc_generator.search_index import SearchIndex
+
+
+def _index_path(tech_app, index_id):
+    return os.path.join(tech_app.app.config['OUTPUT_FOLDER'], f"search_{index_id}.json")
+
+
+def test_expired_search_index_is_removed(tech_app):
+    client = tech_app.app.test_client()
+    index_id = tech_app.save_search_index(SearchIndex())
+
+    response = client.get(f'/search/{index_id}?q=base')
+    assert response.status_code == 200
+    assert response.get_json()['results'] == []
+
+    # Индекс старше срока хранения не выдается, даже если загружен в память
+    expired = time.time() - tech_app.app.config['SEARCH_INDEX_TTL'] - 60
+    os.utime(_index_path(tech_app, index_id), (expired, expired))
+    assert client.get(f'/search/{index_id}?q=base').status_code == 404
+
+    # и удаляется с диска при сохранении следующего индекса
+    fresh_id = tech_app.save_search_index(SearchIndex())
+    assert not os.path.exists(_index_path(tech_app, index_id))
+    assert os.path.exists(_index_path(tech_app, fresh_id))
@@ -0,0 +1,38 @@
+"""
+Тесты снимков публичного интерфейса и их сравнения
+"""
+
+import pytest
+
+from doc_generator.code_analyzer import CodeAnalyzer
+from doc_generator.snapshot import AnalysisSnapshot, diff_snapshots, format_signature
+
+
+def _snapshot(tmp_path, name, source):
+    project = tmp_path / name
+    project.mkdir()
+    (project / 'api.py').write_text(source, encoding='utf-8')
+    analysis = CodeAnalyzer(clone_min_nodes=None).analyze_directory(str(project))
+    return AnalysisSnapshot.from_analysis(analysis)
+
+
+def test_added_keyword_only_parameter_is_reported(tmp_path):
+    old = _snapshot(tmp_path, 'old', 'def f(a, b=1):\n    pass\n')
+    new = _snapshot(tmp_path, 'new', 'def f(a, b=1, *args, c, **kw):\n    pass\n')
+
+    changed = diff_snapshots(old, new)['changed']
+
+    assert [entry['name'] for entry in changed] == ['api.f']
+    assert changed[0]['changes']['signature'] == ('def f(a, b=1)', 'def f(a, b=1, *args, c, **kw)')
+
+
+@pytest.mark.parametrize('source, signature', [
+    ('def f(a, /, b): pass', 'def f(a, /, b)'),
+    ('def f(a, /, b=2, *, c=3): pass', 'def f(a, /, b=2, *, c=3)'),
+    ('async def f(*args: int, key: str = "x", **kw) -> None: pass',
+     "async def f(*args: int, key: str = 'x', **kw) -> None"),
+])
+def test_format_signature_renders_all_parameter_kinds(source, signature):
+    func = CodeAnalyzer().analyze_source(source)['functions'][0]
+
+    assert format_signature(func) == signature